@@ -3,6 +3,28 @@ ASGI config for hostel_management_system project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Running under uvicorn
+---------------------
+The DRF views run in a thread pool under ASGI; the native async variants of
+the polling endpoints (``/api/async/me/``, ``/api/async/student/bookings/``
+and ``/api/async/owner/rooms/``) run on the event loop. To serve the project
+with uvicorn (already in requirements.txt)::
+
+    python manage.py migrate
+    uvicorn BackEnd.asgi:application --host 0.0.0.0 --port 8000 \\
+        --workers 4 --lifespan off --no-access-log
+
+Use one worker per CPU core and set ``DB_POOL=1`` (or, without psycopg-pool,
+``DB_CONN_MAX_AGE=0``): the async ORM opens connections from worker threads,
+so persistent connections are not shared between requests and would only
+pile up, while pooled connections go back to the pool after each request. On Render, set the start
+command to the uvicorn line above instead of gunicorn.
+``python -m benchmarks.wsgi_vs_asgi`` compares this setup with gunicorn.
+
+``/api/async/events/`` (live room events as server-sent events) only works
+under ASGI: each open stream is one coroutine, where under WSGI it would hold
+a worker thread for its whole life.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
 """
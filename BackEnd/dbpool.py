@@ -0,0 +1,94 @@
+"""Database connection settings shared by the settings modules.
+
+``configure_database(database, conn_max_age)`` applies the ``DB_*``
+environment variables to one ``DATABASES`` entry:
+
+* ``DB_POOL=1`` switches to the connection pool built into Django's
+  PostgreSQL backend (psycopg 3 with ``psycopg-pool``). Each process keeps
+  between ``DB_POOL_MIN_SIZE`` and ``DB_POOL_MAX_SIZE`` open connections;
+  a request waits up to ``DB_POOL_TIMEOUT`` seconds for one before failing.
+  Idle connections above the minimum are closed after ``DB_POOL_MAX_IDLE``
+  seconds and every connection is replaced after ``DB_POOL_MAX_LIFETIME``.
+  A connection is checked before it is handed out, so one dropped by the
+  server or a proxy is replaced instead of failing the request.
+* Otherwise connections live for ``conn_max_age`` seconds (0 opens one per
+  request) and ``DB_CONN_HEALTH_CHECKS`` (on by default) makes Django test a
+  persistent connection before reusing it.
+* SQLite databases start every transaction with ``BEGIN IMMEDIATE``. SQLite
+  ignores ``select_for_update()``, so this is what serializes concurrent
+  bookings there (see ``Booking.lock_for_write``);
+  ``check_transaction_modes`` refuses to start without it.
+
+Size the pool so that ``DB_POOL_MAX_SIZE`` times the number of server
+processes stays below the server's ``max_connections``.
+
+``add_replicas(databases, conn_max_age)`` adds one ``replica_<n>`` entry per
+URL in ``DB_REPLICA_URLS`` (comma-separated), configured the same way; see
+``management/replicas.py`` for how reads are routed to them.
+"""
+
+import os
+
+import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
+
+TRUE_VALUES = {"1", "true", "yes", "on"}
+
+
+def _env_flag(name, default):
+    return os.getenv(name, default).strip().lower() in TRUE_VALUES
+
+
+def pool_options():
+    try:
+        from psycopg_pool import ConnectionPool
+    except ImportError as exc:
+        raise ImproperlyConfigured("DB_POOL=1 needs psycopg 3 with psycopg-pool installed.") from exc
+    return {
+        "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+        "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+        "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+        "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", "300")),
+        "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", "1800")),
+        "check": ConnectionPool.check_connection,
+    }
+
+
+def configure_database(database, conn_max_age=0):
+    """Apply the DB_POOL* / DB_CONN_HEALTH_CHECKS environment to ``database``."""
+    database["CONN_HEALTH_CHECKS"] = _env_flag("DB_CONN_HEALTH_CHECKS", "true")
+    if database.get("ENGINE") == "django.db.backends.sqlite3":
+        database.setdefault("OPTIONS", {}).setdefault("transaction_mode", "IMMEDIATE")
+    if database.get("ENGINE") == "django.db.backends.postgresql" and _env_flag("DB_POOL", "false"):
+        database.setdefault("OPTIONS", {})["pool"] = pool_options()
+        # The pool owns connection reuse; Django refuses persistent
+        # connections on top of it.
+        database["CONN_MAX_AGE"] = 0
+    else:
+        database["CONN_MAX_AGE"] = conn_max_age
+    return database
+
+
+def check_transaction_modes(databases):
+    """Raise ImproperlyConfigured for a SQLite database without IMMEDIATE transactions."""
+    for alias, database in databases.items():
+        if database.get("ENGINE") != "django.db.backends.sqlite3":
+            continue
+        if database.get("OPTIONS", {}).get("transaction_mode") != "IMMEDIATE":
+            raise ImproperlyConfigured(
+                f"DATABASES[{alias!r}] is SQLite: set OPTIONS['transaction_mode'] = 'IMMEDIATE' "
+                "(configure_database() does) so concurrent bookings cannot overlap."
+            )
+
+
+def add_replicas(databases, conn_max_age=0):
+    """Add the DB_REPLICA_URLS databases to ``databases``; return their aliases."""
+    urls = [url.strip() for url in os.getenv("DB_REPLICA_URLS", "").split(",") if url.strip()]
+    aliases = []
+    for index, url in enumerate(urls):
+        alias = f"replica_{index}"
+        databases[alias] = configure_database(dj_database_url.parse(url), conn_max_age)
+        # Tests run against the primary only.
+        databases[alias]["TEST"] = {"MIRROR": "default"}
+        aliases.append(alias)
+    return aliases
@@ -2,6 +2,8 @@ import os
 import dj_database_url
 from .settings import *
 from .settings import BASE_DIR
+from .dbpool import add_replicas, configure_database
+from .sharedcache import cache_is_shared, default_session_engine
 
 # Set debug to False in production
 DEBUG = False
@@ -22,6 +24,9 @@ SECRET_KEY = os.environ.get('SECRET_KEY', 'unsafe-default')
 
 # Middleware for production
 MIDDLEWARE = [
+    'BackEnd.management.middleware.RequestTimingMiddleware',
+    'BackEnd.management.availability.DailyReleaseMiddleware',
+    'BackEnd.management.replicas.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -33,6 +38,9 @@ MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
 ]
 
+# Log every request's timing line in production, not only slow requests.
+LOGGING['loggers']['BackEnd.management.middleware']['level'] = os.environ.get('REQUEST_TIMING_LOG_LEVEL', 'INFO')
+
 # Static files config for WhiteNoise
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
@@ -42,10 +50,34 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 DATABASES = {
     'default': dj_database_url.config(
         default=os.environ.get('DATABASE_URL'),
-        conn_max_age=600,
         # ssl_require=True # important for Render PostgreSQL
     )
 }
+# Set DB_POOL=1 to pool connections (recommended, also under uvicorn), or
+# DB_CONN_MAX_AGE=0 for uvicorn without a pool (see asgi.py and dbpool.py).
+configure_database(DATABASES['default'], int(os.environ.get('DB_CONN_MAX_AGE', 600)))
+DATABASE_REPLICAS = add_replicas(DATABASES, int(os.environ.get('DB_CONN_MAX_AGE', 600)))
+
+# Every worker must see the same cache (see sharedcache.py): Redis when
+# REDIS_URL is set, otherwise the database (build.sh runs createcachetable).
+# CACHE_BACKEND/CACHE_LOCATION override both.
+if not os.environ.get('CACHE_BACKEND'):
+    if os.environ.get('REDIS_URL'):
+        CACHES = {
+            'default': {
+                'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+                'LOCATION': os.environ['REDIS_URL'],
+            }
+        }
+    else:
+        CACHES = {
+            'default': {
+                'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+                'LOCATION': 'django_cache',
+            }
+        }
+CACHE_SHARED = cache_is_shared(CACHES)
+SESSION_ENGINE = os.environ.get('SESSION_ENGINE') or default_session_engine(CACHE_SHARED)
 
 # CORS for React frontend (update to your actual frontend URL)
 CORS_ALLOWED_ORIGINS = [
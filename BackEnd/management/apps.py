@@ -3,3 +3,15 @@ from django.apps import AppConfig
 
 class ManagementConfig(AppConfig):
     name = 'BackEnd.management'
+
+    def ready(self):
+        from django.conf import settings
+
+        from BackEnd.dbpool import check_transaction_modes
+        from BackEnd.sharedcache import check_session_engine
+
+        from . import signals  # noqa: F401
+
+        # Fail at startup rather than serve logged-out sessions from one worker's cache.
+        check_session_engine(settings.SESSION_ENGINE, settings.CACHE_SHARED)
+        check_transaction_modes(settings.DATABASES)
@@ -0,0 +1,306 @@
+"""Native async versions of the polling endpoints for ASGI deployments.
+
+They return the same payloads and status codes as ``current_user``,
+``student_bookings_api`` and ``owner_rooms_api`` in views.py, but run on the
+event loop and use the async ORM and cache APIs, so an ASGI worker can hold
+many polling clients without parking a thread per request. They are served
+under ``/api/async/``; see BackEnd/asgi.py for running them under uvicorn.
+
+``room_events`` streams the changes those endpoints are polled for as
+server-sent events (see events.py), so a client can hold one connection
+instead of polling.
+
+Clients authenticate with a ``Bearer`` JWT or the session cookie; a token
+issued by ``login_user`` also answers the role checks from its claims. Unsafe
+methods on a session-authenticated request are CSRF-checked the same way
+DRF's SessionAuthentication does it.
+"""
+
+import asyncio
+import datetime
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+from rest_framework import status
+from rest_framework.authentication import CSRFCheck
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework_simplejwt.models import TokenUser
+
+from .events import ROOMS_CHANNEL, get_broker, owner_channel
+from .listings import aavailable_hostels
+from .markers import aget_markers
+from .models import Booking, Hostel, Hostel_owner, Student
+from .roles import aeffective_role_for_user
+from .tokens import StatelessTokenAuthentication, has_profile_claims
+from .views import (
+    OWNER_BOOKING_ROWS,
+    OWNER_ROOM_ROWS,
+    STUDENT_BOOKING_ROWS,
+    STUDENT_BOOKINGS_SCOPES,
+    _book_room,
+    _holds_booking,
+    _not_modified,
+    _owner_bookings_queryset,
+    _owner_pages,
+    _owner_rooms_queryset,
+    _owner_rooms_scopes,
+    _owner_summary_aggregates,
+    _owner_summary_payload,
+    _parse_booking_dates,
+    _parse_hostel_id,
+    _room_name_error,
+    _set_validators,
+    _student_booking_payload,
+    _user_payload,
+    _validators_from_markers,
+    _wants_owner_pages,
+    _wants_summary_only,
+    term_start,
+)
+
+
+# How long an EventSource waits before reconnecting.
+EVENT_STREAM_RETRY_MS = 3000
+
+
+def _json(payload, status_code=status.HTTP_200_OK):
+    # Render exactly like the DRF views so both variants are byte-identical.
+    return HttpResponse(JSONRenderer().render(payload), status=status_code, content_type="application/json")
+
+
+async def _authenticate(request):
+    """Return ``(user, via_session, error_response)`` for ``request``."""
+    if request.headers.get("Authorization"):
+        try:
+            # The user comes from the token; only its revocation is looked up.
+            result = await StatelessTokenAuthentication().aauthenticate(request)
+        except AuthenticationFailed as exc:
+            return None, False, _json(exc.detail, exc.status_code)
+        if result is not None:
+            return result[0], False, None
+    return await request.auser(), True, None
+
+
+async def _role_for(user):
+    token = user.token if isinstance(user, TokenUser) else None
+    if has_profile_claims(token):
+        return token["role"]
+    return await aeffective_role_for_user(user)
+
+
+def _csrf_error(request):
+    check = CSRFCheck(lambda request: None)
+    check.process_request(request)
+    reason = check.process_view(request, None, (), {})
+    if reason:
+        return _json({"detail": f"CSRF Failed: {reason}"}, status.HTTP_403_FORBIDDEN)
+    return None
+
+
+def _request_data(request):
+    if request.content_type == "application/json":
+        try:
+            data = json.loads(request.body or b"{}")
+        except ValueError:
+            data = None
+        return data if isinstance(data, dict) else {}
+    return request.POST
+
+
+async def _profile_for(request, role, model, forbidden_message, missing_message):
+    """Authenticate and role-gate ``request``; return ``(profile, via_session, error_response)``."""
+    user, via_session, error = await _authenticate(request)
+    if error:
+        return None, via_session, error
+    if not user.is_authenticated:
+        return None, via_session, _json({"message": "Authentication required"}, status.HTTP_401_UNAUTHORIZED)
+    if await _role_for(user) != role:
+        return None, via_session, _json({"message": forbidden_message}, status.HTTP_403_FORBIDDEN)
+    profile = await model.objects.filter(user_id=user.id).afirst()
+    if not profile:
+        return None, via_session, _json({"message": missing_message}, status.HTTP_404_NOT_FOUND)
+    return profile, via_session, None
+
+
+@csrf_exempt
+@require_http_methods(["GET"])
+async def current_user(request):
+    user, _, error = await _authenticate(request)
+    if error:
+        return error
+    if not user.is_authenticated:
+        return _json({"message": "Authentication required"}, status.HTTP_401_UNAUTHORIZED)
+
+    if isinstance(user, TokenUser) and not has_profile_claims(user.token):
+        user = await User.objects.aget(pk=user.id)
+    return _json(_user_payload(user, await _role_for(user)))
+
+
+@csrf_exempt
+@require_http_methods(["GET", "POST"])
+async def student_bookings_api(request):
+    student, via_session, error = await _profile_for(
+        request, "student", Student, "Only students can access this endpoint", "Student profile not found"
+    )
+    if error:
+        return error
+
+    if request.method == "GET":
+        markers = await aget_markers(STUDENT_BOOKINGS_SCOPES)
+        today = datetime.date.today()
+        etag, last_modified = _validators_from_markers(
+            request, markers, STUDENT_BOOKINGS_SCOPES, [student.id, today]
+        )
+        not_modified = _not_modified(request, etag, last_modified, private=True)
+        if not_modified is not None:
+            return not_modified
+
+        bookings = [
+            row async for row in STUDENT_BOOKING_ROWS.values(Booking.objects.filter(name=student).order_by("-id"))
+        ]
+        hostels = []
+        if not _holds_booking(bookings, today):
+            hostels = await aavailable_hostels(markers)
+        payload = {
+            "student": {"id": student.id, "name": student.name},
+            "hostels": hostels,
+            "bookings": STUDENT_BOOKING_ROWS.rows(bookings),
+        }
+        return _set_validators(_json(payload), etag, last_modified, private=True)
+
+    if via_session:
+        error = _csrf_error(request)
+        if error:
+            return error
+
+    data = _request_data(request)
+    hostel_id, message = _parse_hostel_id(data.get("hostel_id"))
+    if message:
+        return _json({"message": message}, status.HTTP_400_BAD_REQUEST)
+    dates, message = _parse_booking_dates(data)
+    if message:
+        return _json({"message": message}, status.HTTP_400_BAD_REQUEST)
+
+    hostel = await Hostel.objects.filter(id=hostel_id).only("id", "name").afirst()
+    if not hostel:
+        return _json({"message": "Hostel not found"}, status.HTTP_404_NOT_FOUND)
+
+    booking, message = await sync_to_async(_book_room)(student, hostel, *dates)
+    if message:
+        return _json({"message": message}, status.HTTP_400_BAD_REQUEST)
+    return _json(
+        {"message": "Booking created successfully", "booking": _student_booking_payload(booking)},
+        status.HTTP_201_CREATED,
+    )
+
+
+@csrf_exempt
+@require_http_methods(["GET", "POST"])
+async def owner_rooms_api(request):
+    owner, via_session, error = await _profile_for(
+        request,
+        "hostel_owner",
+        Hostel_owner,
+        "Only hostel owners can access this endpoint",
+        "Hostel owner profile not found",
+    )
+    if error:
+        return error
+
+    if request.method == "GET":
+        scopes = _owner_rooms_scopes(owner)
+        start = term_start()
+        markers = await aget_markers(scopes)
+        etag, last_modified = _validators_from_markers(request, markers, scopes, [owner.id, start])
+        not_modified = _not_modified(request, etag, last_modified, private=True)
+        if not_modified is not None:
+            return not_modified
+
+        totals = await Hostel.objects.filter(hostel_owner=owner).aaggregate(**_owner_summary_aggregates(start))
+        payload = {"owner": {"id": owner.id, "name": owner.name}, "summary": _owner_summary_payload(totals, start)}
+        if not _wants_summary_only(request):
+            if _wants_owner_pages(request):
+                # DRF's paginators are synchronous.
+                payload.update(await sync_to_async(_owner_pages)(Request(request), owner))
+            else:
+                payload["rooms"] = OWNER_ROOM_ROWS.rows([row async for row in _owner_rooms_queryset(owner)])
+                payload["bookings"] = OWNER_BOOKING_ROWS.rows([row async for row in _owner_bookings_queryset(owner)])
+        return _set_validators(_json(payload), etag, last_modified, private=True)
+
+    if via_session:
+        error = _csrf_error(request)
+        if error:
+            return error
+
+    room_name = str(_request_data(request).get("room_name", "")).strip()
+    message = _room_name_error(room_name)
+    if message:
+        return _json({"message": message}, status.HTTP_400_BAD_REQUEST)
+
+    room = await Hostel.objects.acreate(name=room_name, hostel_owner=owner)
+    return _json(
+        {"message": "Room posted successfully", "room": {"id": room.id, "name": room.name}},
+        status.HTTP_201_CREATED,
+    )
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode()
+
+
+async def _event_stream(channel):
+    subscription = get_broker().subscribe(channel)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.EVENT_STREAM_MAX_SECONDS
+    try:
+        # Clients load the current state once they see "ready"; every later
+        # change reaches them as an event.
+        yield f"retry: {EVENT_STREAM_RETRY_MS}\n".encode() + _sse("ready", {"channel": channel})
+        while (remaining := deadline - loop.time()) > 0:
+            event = await subscription.get(min(settings.EVENT_STREAM_HEARTBEAT_SECONDS, remaining))
+            if event is None:
+                # Keeps proxies from timing the connection out.
+                yield b": keep-alive\n\n"
+            else:
+                yield _sse(event["type"], event)
+    finally:
+        subscription.close()
+
+
+@csrf_exempt
+@require_http_methods(["GET"])
+async def room_events(request):
+    """Server-sent events for every room, or one owner's rooms with ``?owner_id=<id>``.
+
+    Streams ``availability`` and ``booking`` events, plus ``resync`` when a
+    slow client missed some. Connections end after EVENT_STREAM_MAX_SECONDS
+    and the browser reconnects.
+    """
+    user, _via_session, error = await _authenticate(request)
+    if error:
+        return error
+    if not user.is_authenticated:
+        return _json({"message": "Authentication required"}, status.HTTP_401_UNAUTHORIZED)
+
+    channel = ROOMS_CHANNEL
+    if "owner_id" in request.GET:
+        try:
+            owner_id = int(request.GET["owner_id"])
+        except ValueError:
+            return _json({"message": "owner_id must be a valid number"}, status.HTTP_400_BAD_REQUEST)
+        if not await Hostel_owner.objects.filter(pk=owner_id).aexists():
+            return _json({"message": "Hostel owner not found"}, status.HTTP_404_NOT_FOUND)
+        channel = owner_channel(owner_id)
+
+    response = StreamingHttpResponse(_event_stream(channel), content_type="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    # Stop nginx from buffering the stream.
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,56 @@
+"""Authentication backend that keeps session users in the default cache.
+
+``AuthenticationMiddleware`` loads ``request.user`` from ``auth_user`` on
+every session-authenticated request. ``CachedModelBackend`` serves that
+lookup from the cache instead; the signal handlers drop a user's entry
+whenever the row is saved or deleted, so a password change (which also
+changes the session auth hash), deactivation or rename is seen on the next
+request. Passwords are still checked by ``ModelBackend.authenticate``.
+
+The entries are only dropped from the cache the signal handler writes to,
+so without a shared cache (``settings.CACHE_SHARED``) users are loaded from
+``auth_user`` as ``ModelBackend`` does.
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+UserModel = get_user_model()
+
+
+def user_cache_key(user_id):
+    return f"auth_user:{user_id}"
+
+
+def forget_users(*user_ids):
+    cache.delete_many([user_cache_key(user_id) for user_id in user_ids if user_id])
+
+
+class CachedModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        if not settings.CACHE_SHARED:
+            return super().get_user(user_id)
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            try:
+                user = UserModel._default_manager.get(pk=user_id)
+            except UserModel.DoesNotExist:
+                return None
+            cache.set(key, user, settings.AUTH_USER_CACHE_SECONDS)
+        return user if self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        if not settings.CACHE_SHARED:
+            return await super().aget_user(user_id)
+        key = user_cache_key(user_id)
+        user = await cache.aget(key)
+        if user is None:
+            try:
+                user = await UserModel._default_manager.aget(pk=user_id)
+            except UserModel.DoesNotExist:
+                return None
+            await cache.aset(key, user, settings.AUTH_USER_CACHE_SECONDS)
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,57 @@
+"""Release rooms whose stays have ended, once a day, without a scheduler.
+
+``Hostel.is_available`` only changes on writes, but a stay ends by the date
+alone. ``DailyReleaseMiddleware`` therefore runs ``release_ended_bookings``
+from the first request of each day: every process remembers the last day it
+checked, and ``cache.add`` lets one of them do the work when the cache is
+shared (with a per-process cache each process releases once, which is
+harmless). ``manage.py refresh_availability`` does the same on demand.
+"""
+
+import datetime
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.core.cache import cache
+
+from .signals import release_ended_bookings
+
+# Kept past midnight so a slow clock on another process cannot release twice.
+RELEASED_KEY_SECONDS = 2 * 24 * 3600
+
+_released_on = None
+
+
+def released_key(day):
+    return f"rooms_released:{day.isoformat()}"
+
+
+def release_due_rooms(today=None):
+    """Run ``release_ended_bookings`` unless it already ran today."""
+    global _released_on
+    today = today or datetime.date.today()
+    if _released_on == today:
+        return
+    if cache.add(released_key(today), True, RELEASED_KEY_SECONDS):
+        release_ended_bookings(today)
+    _released_on = today
+
+
+class DailyReleaseMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        release_due_rooms()
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        if _released_on != datetime.date.today():
+            await sync_to_async(release_due_rooms)()
+        return await self.get_response(request)
@@ -0,0 +1,172 @@
+"""Live room events for the server-sent events stream.
+
+Writes that change a room's availability or a booking publish small JSON
+events through a broker: every event goes to the ``rooms`` channel and to
+the channel of the room's owner (``owner_channel(owner_id)``). The ASGI view
+``async_views.room_events`` subscribes one channel per connection and writes
+the events out as ``text/event-stream``, so a client holds one connection
+instead of polling the dashboards.
+
+The broker class is ``settings.EVENT_BROKER``. ``LocalBroker`` fans out
+in-process, which is enough for a single worker and for tests; several
+workers need a broker that relays events between processes (e.g. over
+Redis pub/sub) behind the same two methods.
+"""
+
+import abc
+import asyncio
+import threading
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+ROOMS_CHANNEL = "rooms"
+# Sent instead of the events a slow subscriber missed; clients refetch.
+RESYNC = {"type": "resync"}
+
+
+def owner_channel(owner_id):
+    return f"owner:{owner_id}"
+
+
+class Broker(abc.ABC):
+    """Interface of an event broker."""
+
+    @abc.abstractmethod
+    def publish(self, channel, event):
+        """Deliver ``event`` (a JSON-serializable dict) to ``channel``'s subscribers.
+
+        Called from request threads and the event loop alike; must not block.
+        """
+
+    @abc.abstractmethod
+    def subscribe(self, channel):
+        """Return a :class:`Subscription` to ``channel`` for the running event loop."""
+
+
+class Subscription(abc.ABC):
+    @abc.abstractmethod
+    async def get(self, timeout):
+        """Return the next event, or None if none arrives within ``timeout`` seconds."""
+
+    @abc.abstractmethod
+    def close(self):
+        """Stop receiving events."""
+
+
+class LocalSubscription(Subscription):
+    def __init__(self, broker, channel, queue_size):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=queue_size)
+
+    def put(self, event):
+        # Runs on the subscriber's loop.
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # The client is not keeping up; drop its backlog and tell it so.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    async def get(self, timeout):
+        if not self.queue.empty():
+            # Skip wait_for()'s task and timer when an event is already queued.
+            return self.queue.get_nowait()
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker._unsubscribe(self)
+
+
+class LocalBroker(Broker):
+    """In-process fan-out to the subscribers of this worker."""
+
+    def __init__(self, queue_size=None):
+        self.queue_size = queue_size or settings.EVENT_QUEUE_SIZE
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)
+
+    def publish(self, channel, event):
+        by_loop = defaultdict(list)
+        with self._lock:
+            for subscription in self._subscriptions.get(channel, ()):
+                by_loop[subscription.loop].append(subscription)
+        # One wake-up per event loop, not per subscriber.
+        for loop, subscriptions in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(_put_all, subscriptions, event)
+            except RuntimeError:
+                # The subscribers' loop has shut down.
+                for subscription in subscriptions:
+                    subscription.close()
+
+    def subscribe(self, channel):
+        subscription = LocalSubscription(self, channel, self.queue_size)
+        with self._lock:
+            self._subscriptions[channel].add(subscription)
+        return subscription
+
+    def subscriber_count(self, channel=None):
+        with self._lock:
+            if channel is not None:
+                return len(self._subscriptions.get(channel, ()))
+            return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    def _unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.channel]
+
+
+def _put_all(subscriptions, event):
+    for subscription in subscriptions:
+        subscription.put(event)
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    return import_string(settings.EVENT_BROKER)()
+
+
+@receiver(setting_changed)
+def _reset_broker(setting, **kwargs):
+    if setting in ("EVENT_BROKER", "EVENT_QUEUE_SIZE"):
+        get_broker.cache_clear()
+
+
+def publish_room_events(events):
+    """Publish ``(owner_id, event)`` pairs to the rooms and owner channels."""
+    broker = get_broker()
+    for owner_id, event in events:
+        broker.publish(ROOMS_CHANNEL, event)
+        if owner_id:
+            broker.publish(owner_channel(owner_id), event)
+
+
+def availability_event(room_id, owner_id, is_available):
+    return {"type": "availability", "room_id": room_id, "owner_id": owner_id, "is_available": is_available}
+
+
+def booking_event(booking, owner_id):
+    # No student details: the rooms channel is open to every signed-in user.
+    return {
+        "type": "booking",
+        "id": booking.pk,
+        "room_id": booking.room_id,
+        "owner_id": owner_id,
+        "start_date": booking.start_date.isoformat() if booking.start_date else None,
+        "end_date": booking.end_date.isoformat() if booking.end_date else None,
+    }
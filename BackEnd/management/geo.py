@@ -0,0 +1,85 @@
+"""Spatial keys for "rooms near a point" without PostGIS.
+
+A point is stored as its geohash in binary: longitude and latitude are each
+cut into 2**26 slices and the two slice numbers are bit-interleaved
+(longitude first, as in geohash) into one integer. Points that share the top
+``2k`` bits lie in the same geohash cell of ``k`` bits per axis, and every
+such cell is one contiguous range of keys, so "all points in these cells"
+is a handful of B-tree range scans on any database.
+
+``covering_ranges(lat, lon, radius_km)`` picks the finest cell size that is
+still at least ``radius_km`` across and returns the key ranges of the
+point's cell and its eight neighbours, which together contain the whole
+circle. Callers then only run ``distance_km`` on the rows in those ranges.
+"""
+
+import math
+
+AXIS_BITS = 26
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def _slice(value, low, high, bits):
+    index = int((value - low) / (high - low) * (1 << bits))
+    return min(max(index, 0), (1 << bits) - 1)
+
+
+def _interleave(x, y, bits):
+    key = 0
+    for bit in range(bits - 1, -1, -1):
+        key = (key << 2) | (((x >> bit) & 1) << 1) | ((y >> bit) & 1)
+    return key
+
+
+def geocell(latitude, longitude):
+    """Return the spatial key of a point, or None when a coordinate is missing."""
+    if latitude is None or longitude is None:
+        return None
+    return _interleave(_slice(longitude, -180, 180, AXIS_BITS), _slice(latitude, -90, 90, AXIS_BITS), AXIS_BITS)
+
+
+def _cell_bits(latitude, radius_km):
+    # The circle is widest in longitude at its edge nearest the pole.
+    edge = min(90.0, abs(latitude) + radius_km / KM_PER_DEGREE)
+    for bits in range(AXIS_BITS, 0, -1):
+        height_km = 180 / (1 << bits) * KM_PER_DEGREE
+        width_km = 360 / (1 << bits) * KM_PER_DEGREE * math.cos(math.radians(edge))
+        if height_km >= radius_km and width_km >= radius_km:
+            return bits
+    return 0
+
+
+def covering_ranges(latitude, longitude, radius_km):
+    """Return sorted, merged ``(low, high)`` half-open key ranges covering the circle."""
+    bits = _cell_bits(latitude, radius_km)
+    if bits == 0:
+        return [(0, 1 << (2 * AXIS_BITS))]
+    cells = 1 << bits
+    x = _slice(longitude, -180, 180, bits)
+    y = _slice(latitude, -90, 90, bits)
+    shift = 2 * (AXIS_BITS - bits)
+    # Longitude wraps around the antimeridian; latitude stops at the poles.
+    prefixes = {
+        _interleave((x + dx) % cells, y + dy, bits)
+        for dx in (-1, 0, 1)
+        for dy in (-1, 0, 1)
+        if 0 <= y + dy < cells
+    }
+    ranges = sorted((prefix << shift, (prefix + 1) << shift) for prefix in prefixes)
+    merged = [ranges[0]]
+    for low, high in ranges[1:]:
+        if low == merged[-1][1]:
+            merged[-1] = (merged[-1][0], high)
+        else:
+            merged.append((low, high))
+    return merged
+
+
+def distance_km(latitude1, longitude1, latitude2, longitude2):
+    """Great-circle (haversine) distance between two points."""
+    phi1, phi2 = math.radians(latitude1), math.radians(latitude2)
+    half_dphi = (phi2 - phi1) / 2
+    half_dlambda = math.radians(longitude2 - longitude1) / 2
+    a = math.sin(half_dphi) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(half_dlambda) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
@@ -0,0 +1,247 @@
+"""Bulk account import for onboarding a whole intake at once.
+
+``import_accounts`` reads CSV or NDJSON rows lazily from any iterable of
+byte lines (a file, an upload, a request body), validates each row with the
+same rules as ``register_user``, hashes the passwords of a batch across a
+pool of workers and inserts the batch's users, Registers rows and profiles with
+``bulk_create`` in one transaction. Rows that fail are reported by row
+number and never stop the rest of the import.
+
+The ``import_users`` command hashes in a process pool sized by
+``USER_IMPORT_WORKERS``; the HTTP endpoint runs inside a web worker and uses
+at most ``USER_IMPORT_THREADS`` threads instead (PBKDF2 releases the GIL).
+"""
+
+import codecs
+import csv
+import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DataError, IntegrityError, connection, transaction
+
+from .models import Hostel_owner, Registers, Student
+from .registration import account_rows, clean_registration, create_account
+from .signals import rows_changed
+
+FORMATS = ("csv", "ndjson")
+# The report lists at most this many failed rows; "failed" still counts all.
+MAX_REPORTED_ERRORS = 1000
+
+
+class ImportReport:
+    def __init__(self):
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def fail(self, row, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "errors": errors})
+
+    def as_dict(self):
+        return {"created": self.created, "failed": self.failed, "errors": self.errors}
+
+
+def format_for(name="", content_type=""):
+    """Guess the import format from a file name or content type, or return None."""
+    if name.endswith(".csv") or content_type in ("text/csv", "application/csv"):
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")) or content_type in ("application/x-ndjson", "application/jsonl"):
+        return "ndjson"
+    return None
+
+
+def read_rows(lines, fmt):
+    """Yield ``(row_number, data, error)`` for each record in ``lines`` (bytes)."""
+    text = codecs.iterdecode(lines, "utf-8-sig")
+    if fmt == "csv":
+        for row_number, data in enumerate(csv.DictReader(text), start=1):
+            yield row_number, data, None
+        return
+    row_number = 0
+    for line in text:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            data = json.loads(line)
+        except ValueError:
+            yield row_number, None, {"row": "Invalid JSON"}
+            continue
+        if isinstance(data, dict):
+            yield row_number, data, None
+        else:
+            yield row_number, None, {"row": "Each line must be a JSON object"}
+
+
+def _setup_worker():
+    # Worker processes started with spawn/forkserver need Django configured
+    # before make_password can read PASSWORD_HASHERS.
+    import django
+
+    django.setup()
+
+
+class PasswordHasherPool:
+    """Hash passwords across worker processes, or threads with ``threads=True``.
+
+    ``workers=0`` hashes inline.
+    """
+
+    def __init__(self, workers=None, threads=False):
+        if workers is None:
+            workers = settings.USER_IMPORT_THREADS if threads else settings.USER_IMPORT_WORKERS
+        self.workers = workers
+        self.executor = None
+        if self.workers and threads:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers)
+        elif self.workers:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_setup_worker)
+
+    def hash(self, passwords):
+        if self.executor is None:
+            return [make_password(password) for password in passwords]
+        chunksize = max(1, len(passwords) // (self.workers * 4))
+        return list(self.executor.map(make_password, passwords, chunksize=chunksize))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.executor is not None:
+            self.executor.shutdown()
+
+
+def _new_user(account, password_hash):
+    # Mirrors the normalisation create_user() applies.
+    return User(
+        username=User.normalize_username(account["username"]),
+        email=User.objects.normalize_email(account["email"]),
+        password=password_hash,
+        first_name=account["first_name"],
+        last_name=account["last_name"],
+    )
+
+
+def _insert_batch(accounts, hashes):
+    users = User.objects.bulk_create([_new_user(account, password) for account, password in zip(accounts, hashes)])
+    registers, students, owners = [], [], []
+    for account, user in zip(accounts, users):
+        register, profile = account_rows(account, user)
+        registers.append(register)
+        (students if isinstance(profile, Student) else owners).append(profile)
+    Registers.objects.bulk_create(registers)
+    Student.objects.bulk_create(students)
+    Hostel_owner.objects.bulk_create(owners)
+    return registers, students, owners
+
+
+def _insert_one(account, password_hash):
+    # password=None skips hashing in create_user(); the pool already did it.
+    user = create_account(dict(account, password=None))
+    user.password = password_hash
+    user.save(update_fields=["password"])
+
+
+def check_database():
+    """Raise ImproperlyConfigured unless bulk inserts return primary keys.
+
+    The profiles of a batch point at users created by the same bulk_create().
+    """
+    if not connection.features.can_return_rows_from_bulk_insert:
+        raise ImproperlyConfigured(f"Bulk account import is not supported on {connection.vendor}.")
+
+
+class AccountImporter:
+    def __init__(self, batch_size=None, workers=None, threads=False):
+        self.batch_size = batch_size or settings.USER_IMPORT_BATCH_SIZE
+        self.workers = workers
+        self.threads = threads
+        self.report = ImportReport()
+        # Usernames and emails claimed earlier in this import.
+        self.seen_usernames = set()
+        self.seen_emails = set()
+
+    def run(self, lines, fmt):
+        with PasswordHasherPool(self.workers, self.threads) as hasher:
+            rows = read_rows(lines, fmt)
+            while batch := list(islice(rows, self.batch_size)):
+                accounts = self._valid_accounts(batch)
+                if accounts:
+                    hashes = hasher.hash([account["password"] for _, account in accounts])
+                    self._insert(accounts, hashes)
+        return self.report.as_dict()
+
+    def _valid_accounts(self, batch):
+        accounts = []
+        for row_number, data, error in batch:
+            if error:
+                self.report.fail(row_number, error)
+                continue
+            # Import files rarely repeat the password; accept a missing confirmation.
+            if not data.get("confirm_password"):
+                data = dict(data, confirm_password=data.get("password", ""))
+            account, errors = clean_registration(data)
+            if errors:
+                self.report.fail(row_number, errors)
+                continue
+            accounts.append((row_number, account))
+
+        taken_usernames = set(
+            User.objects.filter(username__in=[account["username"] for _, account in accounts]).values_list("username", flat=True)
+        )
+        emails = [User.objects.normalize_email(account["email"]) for _, account in accounts]
+        taken_emails = set(User.objects.filter(email__in=emails).values_list("email", flat=True))
+        valid = []
+        for (row_number, account), email in zip(accounts, emails):
+            errors = {}
+            if account["username"] in taken_usernames or account["username"] in self.seen_usernames:
+                errors["username"] = "Username already exists"
+            if email in taken_emails or email in self.seen_emails:
+                errors["email"] = "Email already registered"
+            if errors:
+                self.report.fail(row_number, errors)
+                continue
+            self.seen_usernames.add(account["username"])
+            self.seen_emails.add(email)
+            valid.append((row_number, account))
+        return valid
+
+    def _insert(self, accounts, hashes):
+        try:
+            with transaction.atomic():
+                registers, students, owners = _insert_batch([account for _, account in accounts], hashes)
+        except (DataError, IntegrityError):
+            # Something in the batch (an over-long value, a concurrent signup)
+            # broke it; retry row by row so only the bad rows are reported.
+            for (row_number, account), password_hash in zip(accounts, hashes):
+                try:
+                    with transaction.atomic():
+                        _insert_one(account, password_hash)
+                except (DataError, IntegrityError):
+                    self.report.fail(row_number, {"row": "Invalid registration details"})
+                else:
+                    self.report.created += 1
+            return
+        self.report.created += len(accounts)
+        # bulk_create() skips post_save.
+        rows_changed(Registers, registers)
+        rows_changed(Student, students)
+        rows_changed(Hostel_owner, owners)
+
+
+def import_accounts(lines, fmt, batch_size=None, workers=None, threads=False):
+    """Import accounts from CSV/NDJSON byte lines and return the report dict.
+
+    Hashes passwords in ``workers`` processes, or threads with ``threads=True``.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown import format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    check_database()
+    return AccountImporter(batch_size, workers, threads).run(lines, fmt)
@@ -0,0 +1,102 @@
+"""Shared cache of the available-rooms listing.
+
+Every student without a booking polls the same list of available rooms, so
+it is built once and kept in the default cache under a key versioned by the
+change markers of the tables it reads. Any Hostel, Booking or Hostel_owner
+write bumps one of those markers, which moves readers to a new key; old
+versions simply expire.
+
+Each lookup reports ``listing;desc="hit age=1.234s"`` (or ``miss``) through
+the request timing middleware, and this process's totals are available from
+``listing_stats()``.
+"""
+
+import hashlib
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef
+
+from .markers import table_scope
+from .middleware import add_server_timing
+from .models import Booking, Hostel, Hostel_owner
+from .rows import RowMapper
+
+KEY_PREFIX = "available_hostels:"
+AVAILABLE_HOSTELS_SCOPES = [table_scope(Hostel), table_scope(Booking), table_scope(Hostel_owner)]
+AVAILABLE_HOSTEL_ROWS = RowMapper(
+    {"id": "id", "name": "name", "owner_name": "hostel_owner__name", "owner_id": "hostel_owner_id"}
+)
+
+_stats = Counter()
+
+
+def available_hostels_queryset():
+    return AVAILABLE_HOSTEL_ROWS.values(Hostel.objects.filter(is_available=True))
+
+
+def free_hostels_queryset(start, end):
+    """Rooms with no booking overlapping ``[start, end)``.
+
+    Each room costs one probe of the ``(room, end_date)`` booking index.
+    """
+    overlapping = Booking.objects.overlapping(start, end).filter(room=OuterRef("pk"))
+    return AVAILABLE_HOSTEL_ROWS.values(Hostel.objects.filter(~Exists(overlapping)))
+
+
+def _cache_key(markers):
+    version = "|".join(f"{scope}={markers[scope]!r}" for scope in AVAILABLE_HOSTELS_SCOPES)
+    return KEY_PREFIX + hashlib.sha1(version.encode()).hexdigest()
+
+
+def _record(entry):
+    if entry is None:
+        _stats["misses"] += 1
+        add_server_timing("listing", "miss")
+    else:
+        _stats["hits"] += 1
+        add_server_timing("listing", f"hit age={time.time() - entry['built_at']:.3f}s")
+
+
+def _entry(rows):
+    return {"rows": rows, "built_at": time.time()}
+
+
+def available_hostels(markers):
+    """Return the available-rooms payload rows for the given marker versions."""
+    if not settings.CACHE_SHARED:
+        # Another worker's writes would not move this worker to a new key.
+        return AVAILABLE_HOSTEL_ROWS.rows(available_hostels_queryset().order_by("id"))
+    key = _cache_key(markers)
+    entry = cache.get(key)
+    _record(entry)
+    if entry is None:
+        entry = _entry(AVAILABLE_HOSTEL_ROWS.rows(available_hostels_queryset().order_by("id")))
+        cache.set(key, entry, settings.AVAILABLE_HOSTELS_CACHE_SECONDS)
+    return entry["rows"]
+
+
+async def aavailable_hostels(markers):
+    """Async counterpart of :func:`available_hostels` for the ASGI views."""
+    if not settings.CACHE_SHARED:
+        return AVAILABLE_HOSTEL_ROWS.rows([row async for row in available_hostels_queryset().order_by("id")])
+    key = _cache_key(markers)
+    entry = await cache.aget(key)
+    _record(entry)
+    if entry is None:
+        rows = [row async for row in available_hostels_queryset().order_by("id")]
+        entry = _entry(AVAILABLE_HOSTEL_ROWS.rows(rows))
+        await cache.aset(key, entry, settings.AVAILABLE_HOSTELS_CACHE_SECONDS)
+    return entry["rows"]
+
+
+def listing_stats():
+    """Return this process's listing cache hits, misses and hit rate."""
+    lookups = _stats["hits"] + _stats["misses"]
+    return {
+        "hits": _stats["hits"],
+        "misses": _stats["misses"],
+        "hit_rate": round(_stats["hits"] / lookups, 4) if lookups else None,
+    }
@@ -0,0 +1,242 @@
+import datetime
+import random
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from BackEnd.management.markers import bump_markers, table_scope
+from BackEnd.management.models import Booking, Hostel, Hostel_owner, Registers, Student, months_after
+
+# Town centres (latitude, longitude); owners are placed within a few km.
+TOWN_CENTRES = {
+    "Dodoma": (-6.163, 35.752),
+    "Arusha": (-3.387, 36.683),
+    "Mwanza": (-2.516, 32.918),
+    "Mbeya": (-8.909, 33.461),
+    "Morogoro": (-6.828, 37.659),
+    "Tanga": (-5.069, 39.099),
+    "Moshi": (-3.335, 37.340),
+    "Iringa": (-7.770, 35.690),
+    "Zanzibar": (-6.166, 39.203),
+    "Kigoma": (-4.877, 29.627),
+}
+TOWNS = list(TOWN_CENTRES)
+# Standard deviation of an owner's offset from the town centre, in degrees (~5 km).
+TOWN_SPREAD_DEGREES = 0.045
+GENDERS = ["Male", "Female"]
+
+
+def _bulk_insert(model, objects, batch_size):
+    """bulk_create ``objects`` and make sure they come back with primary keys."""
+    created = model.objects.bulk_create(objects, batch_size=batch_size)
+    if created and created[0].pk is None:
+        raise CommandError(
+            f"{connection.vendor} did not return primary keys from bulk inserts; "
+            "use PostgreSQL or SQLite 3.35+."
+        )
+    return created
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-load synthetic users, students, hostel owners, rooms and bookings for scale testing. "
+        "Output is deterministic for a given --seed and --prefix."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=1000)
+        parser.add_argument("--owners", type=int, default=100)
+        parser.add_argument("--rooms", type=int, default=2000)
+        parser.add_argument(
+            "--bookings",
+            type=int,
+            default=None,
+            help="number of bookings; defaults to half of min(students, rooms)",
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--prefix", default="synthetic", help="username prefix; change it to load a second set")
+        parser.add_argument("--password", default="synthetic-pass", help="password shared by every generated user")
+
+    def handle(self, *args, **options):
+        students = options["students"]
+        owners = options["owners"]
+        rooms = options["rooms"]
+        bookings = options["bookings"]
+        if bookings is None:
+            bookings = min(students, rooms) // 2
+        if min(students, owners, rooms, bookings) < 0:
+            raise CommandError("Counts must not be negative.")
+        if rooms and not owners:
+            raise CommandError("Rooms need at least one owner.")
+        if bookings > min(students, rooms):
+            raise CommandError("Bookings all start today, so each student and room can hold only one; lower --bookings.")
+        if User.objects.filter(username__startswith=f"{options['prefix']}_").exists():
+            raise CommandError(f"Users with prefix '{options['prefix']}' already exist; pass another --prefix.")
+
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.prefix = options["prefix"]
+        # Hashing is the slowest part of creating a user; every generated
+        # account shares one precomputed hash.
+        self.password_hash = make_password(options["password"])
+
+        started = time.perf_counter()
+        student_ids = self._timed("students", students, self._create_students)
+        owner_ids = self._timed("owners", owners, self._create_owners)
+
+        booked_room_indexes = set(self.rng.sample(range(rooms), bookings))
+        room_ids = self._timed("rooms", rooms, self._create_rooms, owner_ids, booked_room_indexes)
+        self._timed(
+            "bookings",
+            bookings,
+            self._create_bookings,
+            self.rng.sample(student_ids, bookings),
+            [room_ids[index] for index in sorted(booked_room_indexes)],
+        )
+
+        # Bulk inserts skip post_save; invalidate the change markers by hand.
+        bump_markers(*(table_scope(model) for model in (User, Registers, Student, Hostel_owner, Hostel, Booking)))
+        self.stdout.write(self.style.SUCCESS(f"Done in {time.perf_counter() - started:.1f}s"))
+
+    def _timed(self, label, count, create, *args):
+        started = time.perf_counter()
+        result = create(count, *args)
+        elapsed = time.perf_counter() - started
+        rate = count / elapsed if elapsed else 0
+        self.stdout.write(f"{label}: {count} rows in {elapsed:.1f}s ({rate:,.0f}/s)")
+        return result
+
+    def _batches(self, count):
+        for start in range(0, count, self.batch_size):
+            yield range(start, min(start + self.batch_size, count))
+
+    def _create_users(self, kind, indexes, role):
+        users = _bulk_insert(
+            User,
+            [
+                User(
+                    username=f"{self.prefix}_{kind}_{index}",
+                    email=f"{self.prefix}_{kind}_{index}@example.com",
+                    password=self.password_hash,
+                    first_name=kind.title(),
+                    last_name=str(index),
+                )
+                for index in indexes
+            ],
+            self.batch_size,
+        )
+        _bulk_insert(
+            Registers,
+            [
+                Registers(
+                    user=user,
+                    first_name=user.first_name,
+                    Last_name=user.last_name,
+                    email_address=user.email,
+                    role=role,
+                )
+                for user in users
+            ],
+            self.batch_size,
+        )
+        return users
+
+    def _create_students(self, count):
+        student_ids = []
+        for indexes in self._batches(count):
+            with transaction.atomic():
+                users = self._create_users("student", indexes, "student")
+                created = _bulk_insert(
+                    Student,
+                    [
+                        Student(
+                            user=user,
+                            name=f"Student {index}"[:30],
+                            age=self.rng.randint(18, 30),
+                            address=self.rng.choice(TOWNS),
+                            duration=self.rng.choice([3, 6, 9, 12]),
+                            gender=self.rng.choice(GENDERS),
+                        )
+                        for index, user in zip(indexes, users)
+                    ],
+                    self.batch_size,
+                )
+            student_ids.extend(student.pk for student in created)
+        return student_ids
+
+    def _create_owners(self, count):
+        owner_ids = []
+        for indexes in self._batches(count):
+            with transaction.atomic():
+                users = self._create_users("owner", indexes, "hostel_owner")
+                created = _bulk_insert(
+                    Hostel_owner,
+                    [self._owner(index, user) for index, user in zip(indexes, users)],
+                    self.batch_size,
+                )
+            owner_ids.extend(owner.pk for owner in created)
+        return owner_ids
+
+    def _owner(self, index, user):
+        location = self.rng.choice(TOWNS)
+        latitude, longitude = TOWN_CENTRES[location]
+        owner = Hostel_owner(
+            user=user,
+            name=f"Owner {index}",
+            address=self.rng.choice(TOWNS),
+            phone=f"07{index:08d}"[:20],
+            location=location,
+            latitude=round(latitude + self.rng.gauss(0, TOWN_SPREAD_DEGREES), 6),
+            longitude=round(longitude + self.rng.gauss(0, TOWN_SPREAD_DEGREES), 6),
+        )
+        # bulk_create() skips save(), which would otherwise derive this.
+        owner.refresh_geocell()
+        return owner
+
+    def _create_rooms(self, count, owner_ids, booked_room_indexes):
+        room_ids = []
+        for indexes in self._batches(count):
+            with transaction.atomic():
+                created = _bulk_insert(
+                    Hostel,
+                    [
+                        Hostel(
+                            name=f"Room {index}",
+                            hostel_owner_id=self.rng.choice(owner_ids),
+                            # Bookings are decided up front so availability is
+                            # written once instead of updated afterwards.
+                            is_available=index not in booked_room_indexes,
+                        )
+                        for index in indexes
+                    ],
+                    self.batch_size,
+                )
+            room_ids.extend(room.pk for room in created)
+        return room_ids
+
+    def _create_bookings(self, count, student_ids, room_ids):
+        pairs = list(zip(student_ids, room_ids))
+        today = datetime.date.today()
+        for indexes in self._batches(count):
+            durations = dict(
+                Student.objects.filter(pk__in=[pairs[index][0] for index in indexes]).values_list("pk", "duration")
+            )
+            with transaction.atomic():
+                _bulk_insert(
+                    Booking,
+                    [
+                        # bulk_create() skips save(), which would otherwise fill end_date.
+                        Booking(
+                            name_id=pairs[index][0],
+                            room_id=pairs[index][1],
+                            start_date=today,
+                            end_date=months_after(today, durations[pairs[index][0]]),
+                        )
+                        for index in indexes
+                    ],
+                    self.batch_size,
+                )
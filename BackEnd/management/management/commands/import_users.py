@@ -0,0 +1,46 @@
+import json
+import sys
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from BackEnd.management.importer import FORMATS, check_database, format_for, import_accounts
+
+
+class Command(BaseCommand):
+    help = (
+        "Import student and hostel owner accounts from a CSV or NDJSON file using the register_user "
+        "fields (first_name, last_name, email, username, role, password, ...). Prints a JSON report "
+        "with the failed rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="file to import, or - for stdin")
+        parser.add_argument("--format", choices=FORMATS, help="defaults to the file extension")
+        parser.add_argument("--batch-size", type=int, default=None, help="rows per transaction (USER_IMPORT_BATCH_SIZE)")
+        parser.add_argument("--workers", type=int, default=None, help="password hashing processes (USER_IMPORT_WORKERS)")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or format_for(name=path)
+        if fmt is None:
+            raise CommandError("Cannot tell the format from the file name; pass --format.")
+        try:
+            check_database()
+        except ImproperlyConfigured as exc:
+            raise CommandError(str(exc))
+
+        started = time.perf_counter()
+        if path == "-":
+            report = import_accounts(sys.stdin.buffer, fmt, options["batch_size"], options["workers"])
+        else:
+            try:
+                with open(path, "rb") as lines:
+                    report = import_accounts(lines, fmt, options["batch_size"], options["workers"])
+            except OSError as exc:
+                raise CommandError(f"Cannot read {path}: {exc}")
+        report["elapsed_s"] = round(time.perf_counter() - started, 3)
+        self.stdout.write(json.dumps(report, indent=2))
+        if report["failed"]:
+            self.stderr.write(f"{report['failed']} row(s) failed; see the report above.")
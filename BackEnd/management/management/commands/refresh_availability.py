@@ -0,0 +1,21 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from BackEnd.management.signals import release_ended_bookings
+
+
+class Command(BaseCommand):
+    help = (
+        "Mark rooms whose bookings have all ended as available again. DailyReleaseMiddleware does this "
+        "on the first request of each day; run it by hand to release rooms straight away."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date", type=datetime.date.fromisoformat, default=None, help="treat this day (YYYY-MM-DD) as today"
+        )
+
+    def handle(self, *args, **options):
+        released = release_ended_bookings(options["date"])
+        self.stdout.write(f"Released {released} room(s).")
@@ -0,0 +1,54 @@
+"""Cheap change markers backing the API's HTTP validators.
+
+A marker is a timestamp stored in the default cache under a scope such as a
+table (``"management.booking"``) or an owner (``"owner:12"``). Signal handlers
+bump the marker whenever a row in that scope changes, so a view can tell
+whether its payload may have changed with a single cache round trip instead
+of re-running its queries.
+
+Other workers only see a bump through a shared cache; with a per-process
+cache (``settings.CACHE_SHARED`` false) the views send no validators.
+"""
+
+import time
+
+from django.core.cache import cache
+
+KEY_PREFIX = "marker:"
+
+
+def table_scope(model):
+    return model._meta.label_lower
+
+
+def owner_scope(owner_id):
+    return f"owner:{owner_id}"
+
+
+def get_markers(scopes):
+    """Return ``{scope: timestamp}`` for ``scopes``, seeding any that are unknown."""
+    keys = {f"{KEY_PREFIX}{scope}": scope for scope in scopes}
+    found = cache.get_many(keys)
+    missing = {key: time.time() for key in keys if key not in found}
+    if missing:
+        # An evicted or never-written marker is treated as "changed now", which
+        # only ever costs a full response, never a stale 304.
+        cache.set_many(missing, timeout=None)
+        found.update(missing)
+    return {keys[key]: value for key, value in found.items()}
+
+
+async def aget_markers(scopes):
+    """Async counterpart of :func:`get_markers` for the ASGI views."""
+    keys = {f"{KEY_PREFIX}{scope}": scope for scope in scopes}
+    found = await cache.aget_many(keys)
+    missing = {key: time.time() for key in keys if key not in found}
+    if missing:
+        await cache.aset_many(missing, timeout=None)
+        found.update(missing)
+    return {keys[key]: value for key, value in found.items()}
+
+
+def bump_markers(*scopes):
+    now = time.time()
+    cache.set_many({f"{KEY_PREFIX}{scope}": now for scope in scopes}, timeout=None)
@@ -0,0 +1,178 @@
+"""Per-request query and timing instrumentation.
+
+``RequestTimingMiddleware`` measures the SQL query count and time, the view
+time, the response render (serialization) time and the total time of every
+request. It reports them as a ``Server-Timing`` header and as one JSON log
+line on the ``BackEnd.management.middleware`` logger, tagged with the view
+that served the request (generic_api views carry their model in the tag).
+Views can add their own entries with ``add_server_timing()``.
+Requests slower than ``REQUEST_TIMING_SLOW_MS`` are logged at WARNING with
+the SQL they ran.
+"""
+
+import json
+import logging
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+MAX_CAPTURED_QUERIES = 100
+
+_current = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view = ""
+        self.view_started = None
+        self.render_started = None
+        self.queries = 0
+        self.db_ms = 0.0
+        self.sql = []
+        self.metrics = {}
+
+    def record_query(self, sql, duration_ms):
+        self.queries += 1
+        self.db_ms += duration_ms
+        if len(self.sql) < MAX_CAPTURED_QUERIES:
+            self.sql.append({"sql": sql, "ms": round(duration_ms, 3)})
+
+
+def _record_query(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.record_query(sql, (time.perf_counter() - started) * 1000)
+
+
+def add_server_timing(name, description):
+    """Attach an extra ``Server-Timing`` entry (and log field) to the current request."""
+    timings = _current.get()
+    if timings is not None:
+        timings.metrics[name] = description
+
+
+def _instrument(connection):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def _instrument_new_connection(sender, connection, **kwargs):
+    _instrument(connection)
+
+
+connection_created.connect(_instrument_new_connection, dispatch_uid="request_timing_instrument")
+
+
+def view_tag(view_func):
+    tag = getattr(view_func, "timing_tag", None)
+    if tag:
+        return tag
+    # @api_view and as_view() return a closure named "view"; the class they
+    # wrap carries the view's own module and name.
+    target = getattr(view_func, "cls", None) or getattr(view_func, "view_class", None) or view_func
+    return f"{target.__module__}.{target.__name__}"
+
+
+class RequestTimingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = self._start()
+        try:
+            response = self.get_response(request)
+        finally:
+            timings = _current.get()
+            _current.reset(token)
+        return self._finish(request, response, timings)
+
+    async def __acall__(self, request):
+        token = self._start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            timings = _current.get()
+            _current.reset(token)
+        return self._finish(request, response, timings)
+
+    def _start(self):
+        # Connections opened before this module was imported predate the
+        # connection_created hook.
+        for connection in connections.all(initialized_only=True):
+            _instrument(connection)
+        return _current.set(RequestTimings())
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timings = _current.get()
+        if timings is not None:
+            timings.view = view_tag(view_func)
+            timings.view_started = time.perf_counter()
+        return None
+
+    def process_template_response(self, request, response):
+        # Template and DRF responses are rendered right after this hook, so
+        # everything from here until the middleware regains control is
+        # serialization.
+        timings = _current.get()
+        if timings is not None:
+            timings.render_started = time.perf_counter()
+        return response
+
+    def _finish(self, request, response, timings):
+        finished = time.perf_counter()
+        total_ms = (finished - timings.started) * 1000
+        view_end = timings.render_started or finished
+        view_ms = (view_end - timings.view_started) * 1000 if timings.view_started else 0.0
+        render_ms = (finished - timings.render_started) * 1000 if timings.render_started else 0.0
+
+        response.headers["Server-Timing"] = ", ".join(
+            [
+                f'db;dur={timings.db_ms:.3f};desc="{timings.queries} queries"',
+                f"view;dur={view_ms:.3f}",
+                f"render;dur={render_ms:.3f}",
+                f"total;dur={total_ms:.3f}",
+            ]
+            + [f'{name};desc="{description}"' for name, description in timings.metrics.items()]
+        )
+
+        record = {
+            "event": "request_timing",
+            "method": request.method,
+            "path": request.path,
+            "view": timings.view,
+            "status": response.status_code,
+            "queries": timings.queries,
+            "db_ms": round(timings.db_ms, 3),
+            "view_ms": round(view_ms, 3),
+            "render_ms": round(render_ms, 3),
+            "total_ms": round(total_ms, 3),
+        }
+        record.update(timings.metrics)
+        if response.streaming:
+            # The body (and its queries) is produced after this point.
+            record["streaming"] = True
+        if total_ms >= settings.REQUEST_TIMING_SLOW_MS:
+            record["sql"] = timings.sql
+            logger.warning(json.dumps(record))
+        else:
+            logger.info(json.dumps(record))
+        return response
@@ -0,0 +1,29 @@
+# Generated by Django 6.0.2 on 2026-10-18 17:49
+
+from django.db import migrations, models
+
+
+def mark_booked_rooms(apps, schema_editor):
+    Hostel = apps.get_model('management', 'Hostel')
+    Booking = apps.get_model('management', 'Booking')
+    Hostel.objects.filter(pk__in=Booking.objects.values('room_id')).update(is_available=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0011_hostel_owner_user_registers_user_student_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hostel',
+            name='is_available',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.RunPython(mark_booked_rooms, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='hostel',
+            index=models.Index(condition=models.Q(('is_available', True)), fields=['id'], name='hostel_available_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 6.0.2 on 2026-10-18 17:50
+
+from django.db import migrations, models
+from django.db.models import Count
+
+# At most this many conflicting bookings are listed in the error.
+MAX_LISTED = 50
+
+
+def check_duplicate_bookings(apps, schema_editor):
+    # The constraints below cannot be added while a student or a room holds
+    # more than one booking. Which one to keep is the operator's call, so
+    # stop with the conflicting bookings listed instead of deleting any.
+    Booking = apps.get_model('management', 'Booking')
+    students = Booking.objects.values('name_id').annotate(n=Count('id')).filter(n__gt=1).values('name_id')
+    rooms = Booking.objects.values('room_id').annotate(n=Count('id')).filter(n__gt=1).values('room_id')
+    conflicts = Booking.objects.filter(
+        models.Q(name_id__in=students) | models.Q(room_id__in=rooms)
+    ).order_by('room_id', 'name_id', 'id')
+    total = conflicts.count()
+    if not total:
+        return
+    lines = [
+        f"  booking {booking['id']}: student {booking['name_id']}, room {booking['room_id']}, made {booking['booking_date']}"
+        for booking in conflicts.values('id', 'name_id', 'room_id', 'booking_date')[:MAX_LISTED]
+    ]
+    if total > MAX_LISTED:
+        lines.append(f"  ... and {total - MAX_LISTED} more")
+    raise RuntimeError(
+        f"{total} bookings share a student or a room; a student and a room may hold one booking each. "
+        "Delete or reassign the ones to drop, then run migrate again:\n" + "\n".join(lines)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0012_hostel_is_available'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_bookings, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='booking',
+            constraint=models.UniqueConstraint(fields=('name',), name='booking_one_per_student', violation_error_message='A student can only make one booking.'),
+        ),
+        migrations.AddConstraint(
+            model_name='booking',
+            constraint=models.UniqueConstraint(fields=('room',), name='booking_one_per_room', violation_error_message='This room is already booked.'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 6.0.2 on 2026-10-18 18:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0013_booking_unique_constraints'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['name', '-id'], name='booking_student_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['room', '-id'], name='booking_room_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hostel',
+            index=models.Index(fields=['hostel_owner', '-id'], name='hostel_owner_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='registers',
+            index=models.Index(fields=['user', 'role'], name='registers_user_role_idx'),
+        ),
+        # register_user checks for an existing account by email; auth.User is
+        # not ours to add Meta.indexes to.
+        migrations.RunSQL(
+            sql='CREATE INDEX IF NOT EXISTS auth_user_email_idx ON auth_user (email)',
+            reverse_sql='DROP INDEX IF EXISTS auth_user_email_idx',
+        ),
+    ]
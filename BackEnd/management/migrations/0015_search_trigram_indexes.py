@@ -0,0 +1,40 @@
+# Generated by Django 6.0.2 on 2026-10-18 19:05
+
+from django.db import migrations
+
+# icontains/istartswith compile to UPPER(col) LIKE UPPER(...) on PostgreSQL,
+# so the trigram indexes are built on UPPER(col).
+TRIGRAM_INDEXES = [
+    ('hostel_name_trgm_idx', 'management_hostel', 'name'),
+    ('hostel_owner_name_trgm_idx', 'management_hostel_owner', 'name'),
+    ('hostel_owner_location_trgm_idx', 'management_hostel_owner', 'location'),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # Room search (management/search.py) runs unindexed elsewhere.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ((UPPER({column}::text)) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _table, _column in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0014_query_pattern_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
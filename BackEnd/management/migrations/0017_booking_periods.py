@@ -0,0 +1,113 @@
+# Generated by Django 6.0.2 on 2026-10-18 20:15
+
+import calendar
+import datetime
+
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef
+
+# Only PostgreSQL can enforce "no overlapping stays" itself; other databases
+# rely on the indexed range checks in Booking.clean() and the booking view.
+EXCLUSION_CONSTRAINTS = [
+    ('booking_room_no_overlap', 'room_id'),
+    ('booking_student_no_overlap', 'name_id'),
+]
+
+
+def _months_after(day, months):
+    month = day.month - 1 + months
+    year = day.year + month // 12
+    month = month % 12 + 1
+    return day.replace(year=year, month=month, day=min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def fill_booking_periods(apps, schema_editor):
+    # Existing bookings start on the day they were made and last the
+    # student's duration (at least a day).
+    Booking = apps.get_model('management', 'Booking')
+    bookings = list(Booking.objects.select_related('name').only('booking_date', 'name__duration'))
+    for booking in bookings:
+        booking.start_date = booking.booking_date
+        booking.end_date = _months_after(booking.booking_date, booking.name.duration)
+        if booking.end_date <= booking.start_date:
+            booking.end_date = booking.start_date + datetime.timedelta(days=1)
+    Booking.objects.bulk_update(bookings, ['start_date', 'end_date'], batch_size=1000)
+
+
+def refresh_room_availability(apps, schema_editor):
+    # Rooms whose bookings have all ended before today are free again.
+    Booking = apps.get_model('management', 'Booking')
+    Hostel = apps.get_model('management', 'Hostel')
+    current = Booking.objects.filter(room=OuterRef('pk'), end_date__gt=datetime.date.today())
+    Hostel.objects.update(is_available=~Exists(current))
+
+
+def create_exclusion_constraints(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    for name, column in EXCLUSION_CONSTRAINTS:
+        schema_editor.execute(
+            f'ALTER TABLE management_booking ADD CONSTRAINT {name} EXCLUDE USING gist '
+            f"({column} WITH =, daterange(start_date, end_date, '[)') WITH &&)"
+        )
+
+
+def drop_exclusion_constraints(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _column in EXCLUSION_CONSTRAINTS:
+        schema_editor.execute(f'ALTER TABLE management_booking DROP CONSTRAINT IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0016_hostel_owner_coordinates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='start_date',
+            field=models.DateField(null=True),
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='end_date',
+            field=models.DateField(null=True),
+        ),
+        migrations.RunPython(fill_booking_periods, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='booking',
+            name='start_date',
+            field=models.DateField(default=datetime.date.today),
+        ),
+        migrations.AlterField(
+            model_name='booking',
+            name='end_date',
+            field=models.DateField(blank=True),
+        ),
+        migrations.RunPython(refresh_room_availability, migrations.RunPython.noop),
+        migrations.RemoveConstraint(
+            model_name='booking',
+            name='booking_one_per_student',
+        ),
+        migrations.RemoveConstraint(
+            model_name='booking',
+            name='booking_one_per_room',
+        ),
+        migrations.AddConstraint(
+            model_name='booking',
+            constraint=models.CheckConstraint(condition=models.Q(('end_date__gt', models.F('start_date'))), name='booking_ends_after_start', violation_error_message='A booking must end after it starts.'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['room', 'end_date'], name='booking_room_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['name', 'end_date'], name='booking_student_end_idx'),
+        ),
+        migrations.RunPython(create_exclusion_constraints, drop_exclusion_constraints),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 6.0.2 on 2026-10-18 21:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0017_booking_periods'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='booking',
+            name='name',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='management.student'),
+        ),
+        migrations.AlterField(
+            model_name='booking',
+            name='room',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='management.hostel'),
+        ),
+        migrations.AlterField(
+            model_name='hostel',
+            name='hostel_owner',
+            field=models.ForeignKey(db_index=False, default=True, on_delete=django.db.models.deletion.CASCADE, to='management.hostel_owner'),
+        ),
+    ]
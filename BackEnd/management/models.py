@@ -1,8 +1,15 @@
 
-from django.db import models
+import calendar
+import datetime
+from collections import defaultdict
+
+from django.db import connection, models
+from django.db.models import F, Q
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 
+from .geo import geocell
+
 class Student(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, null=True, blank=True)
     name = models.CharField(max_length = 30)
@@ -20,6 +27,38 @@ class Hostel_owner(models.Model):
     address = models.CharField(max_length =200)
     phone = models.CharField(max_length = 20)
     location = models.CharField(max_length =200)
+    latitude = models.FloatField(null = True, blank = True)
+    longitude = models.FloatField(null = True, blank = True)
+    # Binary geohash of (latitude, longitude), see geo.py. Kept in step by
+    # clean() and save(); nearby-room searches scan ranges of it.
+    geocell = models.BigIntegerField(null = True, blank = True, editable = False)
+
+    # Columns derived from others; bulk_update() must write them as well.
+    DERIVED_FIELDS = {"latitude": "geocell", "longitude": "geocell"}
+
+    class Meta:
+        indexes = [
+            models.Index(fields = ["geocell"], name = "hostel_owner_geocell_idx"),
+        ]
+
+    def refresh_geocell(self):
+        self.geocell = geocell(self.latitude, self.longitude)
+
+    def clean(self):
+        if (self.latitude is None) != (self.longitude is None):
+            raise ValidationError("Give both latitude and longitude, or neither.")
+        if self.latitude is not None and not -90 <= self.latitude <= 90:
+            raise ValidationError({"latitude": "Latitude must be between -90 and 90."})
+        if self.longitude is not None and not -180 <= self.longitude <= 180:
+            raise ValidationError({"longitude": "Longitude must be between -180 and 180."})
+        self.refresh_geocell()
+
+    def save(self, *args, **kwargs):
+        self.refresh_geocell()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"latitude", "longitude"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "geocell"}
+        return super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name       
@@ -45,8 +84,19 @@ class Administrator(models.Model):
 class Hostel(models.Model):
     name = models.CharField(max_length =200)
     #student = models.ForeignKey(Student, on_delete = models.CASCADE, default = True)
-    hostel_owner = models.ForeignKey(Hostel_owner, on_delete = models.CASCADE, default = True)
-    
+    # hostel_owner_recent_idx leads with this column, so the FK needs no index of its own.
+    hostel_owner = models.ForeignKey(Hostel_owner, on_delete = models.CASCADE, default = True, db_index = False)
+    # Denormalized "no booking holds this room", kept in step by the Booking
+    # signal handlers so the available-rooms listing is an index range scan.
+    is_available = models.BooleanField(default = True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields = ["id"], condition = Q(is_available = True), name = "hostel_available_idx"),
+            # Owner dashboard: an owner's rooms, newest first.
+            models.Index(fields = ["hostel_owner", "-id"], name = "hostel_owner_recent_idx"),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -57,32 +107,148 @@ class Registers(models.Model):
     email_address = models.EmailField(max_length = 100)
     role = models.CharField(max_length = 100)
 
+    class Meta:
+        indexes = [
+            # Role checks look a user up together with the role they claim.
+            models.Index(fields = ["user", "role"], name = "registers_user_role_idx"),
+        ]
+
     def __str__(self):
         return f"{self.first_name} {self.Last_name} ({self.role})"
 
 
 
 
+def months_after(day, months):
+    """Return ``day`` moved ``months`` calendar months on, clamped to the month's end."""
+    month = day.month - 1 + months
+    year = day.year + month // 12
+    month = month % 12 + 1
+    return day.replace(year = year, month = month, day = min(day.day, calendar.monthrange(year, month)[1]))
+
+
+class BookingQuerySet(models.QuerySet):
+    def overlapping(self, start, end):
+        """Bookings whose stay shares at least one night with ``[start, end)``."""
+        return self.filter(start_date__lt = end, end_date__gt = start)
+
+    def current(self, day = None):
+        """Bookings not over by ``day`` (default today): running now or still to start."""
+        return self.filter(end_date__gt = day or datetime.date.today())
+
+
+ROOM_TAKEN = "This room is already booked."
+STUDENT_TAKEN = "A student can only make one booking at a time."
+
+
 class Booking(models.Model):
-    room = models.ForeignKey(Hostel, on_delete = models.CASCADE)
-    name = models.ForeignKey(Student, on_delete = models.CASCADE)
+    # The composite indexes in Meta lead with room and name, so neither FK
+    # needs an index of its own.
+    room = models.ForeignKey(Hostel, on_delete = models.CASCADE, db_index = False)
+    name = models.ForeignKey(Student, on_delete = models.CASCADE, db_index = False)
     booking_date = models.DateField(auto_now_add = True)
+    # The stay is the half-open interval [start_date, end_date): end_date is
+    # the first night the room is free again. Left blank, it is filled from
+    # the student's duration in months.
+    start_date = models.DateField(default = datetime.date.today)
+    end_date = models.DateField(blank = True)
+
+    objects = BookingQuerySet.as_manager()
+
+    class Meta:
+        # A room and a student may each hold one booking at a time. On
+        # PostgreSQL migration 0017 adds exclusion constraints over the date
+        # ranges so concurrent bookings cannot overlap; clean() and the
+        # booking view check the same rule with indexed range queries.
+        constraints = [
+            models.CheckConstraint(
+                condition = Q(end_date__gt = F("start_date")),
+                name = "booking_ends_after_start",
+                violation_error_message = "A booking must end after it starts.",
+            ),
+        ]
+        indexes = [
+            # A student's bookings and an owner's bookings, newest first.
+            models.Index(fields = ["name", "-id"], name = "booking_student_recent_idx"),
+            models.Index(fields = ["room", "-id"], name = "booking_room_recent_idx"),
+            # Overlap checks: a room's (or student's) bookings ending after a date.
+            models.Index(fields = ["room", "end_date"], name = "booking_room_end_idx"),
+            models.Index(fields = ["name", "end_date"], name = "booking_student_end_idx"),
+        ]
+
+    @staticmethod
+    def lock_for_write(bookings):
+        """Serialize writes of ``bookings`` with concurrent ones for the same rooms or students.
+
+        Call inside transaction.atomic(), before checking for overlaps. On
+        PostgreSQL the exclusion constraints of migration 0017 reject overlaps
+        themselves and nothing is locked. Elsewhere the students' and rooms'
+        rows are locked in primary key order; SQLite ignores SELECT ... FOR
+        UPDATE, but its transactions start IMMEDIATE (see BackEnd/dbpool.py)
+        and already hold the database's write lock.
+        """
+        if connection.vendor == "postgresql":
+            return
+        student_ids = sorted({booking.name_id for booking in bookings if booking.name_id})
+        room_ids = sorted({booking.room_id for booking in bookings if booking.room_id})
+        list(Student.objects.select_for_update().filter(pk__in = student_ids).order_by("pk").values_list("pk"))
+        list(Hostel.objects.select_for_update().filter(pk__in = room_ids).order_by("pk").values_list("pk"))
+
+    def fill_period(self):
+        if self.start_date is None:
+            self.start_date = datetime.date.today()
+        if self.end_date is None and self.name_id is not None:
+            self.end_date = months_after(self.start_date, self.name.duration)
+
+    def conflict(self):
+        """Return the message for an existing booking this one overlaps, or None."""
+        others = Booking.objects.overlapping(self.start_date, self.end_date)
+        if self.pk is not None:
+            others = others.exclude(pk = self.pk)
+        if others.filter(room_id = self.room_id).exists():
+            return ROOM_TAKEN
+        if others.filter(name_id = self.name_id).exists():
+            return STUDENT_TAKEN
+        return None
+
+    @staticmethod
+    def batch_conflicts(bookings):
+        """Return ``{position: message}`` for bookings overlapping another one in ``bookings``.
+
+        conflict() only sees saved rows; this covers a bulk write whose own
+        rows overlap. Call after clean() has filled the periods.
+        """
+        conflicts = {}
+        for field, message in (("room_id", ROOM_TAKEN), ("name_id", STUDENT_TAKEN)):
+            groups = defaultdict(list)
+            for position, booking in enumerate(bookings):
+                groups[getattr(booking, field)].append(position)
+            for positions in groups.values():
+                positions.sort(key = lambda position: bookings[position].start_date)
+                last_end = None
+                for position in positions:
+                    booking = bookings[position]
+                    if last_end is not None and booking.start_date < last_end:
+                        conflicts.setdefault(position, message)
+                    last_end = booking.end_date if last_end is None else max(last_end, booking.end_date)
+        return conflicts
 
     def clean(self):
-        # One student can only have one active booking.
-        existing_for_student = Booking.objects.filter(name=self.name)
-        # One room can only be booked by one student.
-        existing_for_room = Booking.objects.filter(room=self.room)
-        if self.pk:
-            existing_for_student = existing_for_student.exclude(pk=self.pk)
-            existing_for_room = existing_for_room.exclude(pk=self.pk)
-        if existing_for_student.exists():
-            raise ValidationError("A student can only make one booking.")
-        if existing_for_room.exists():
-            raise ValidationError("This room is already booked.")
+        self.fill_period()
+        if self.room_id is None or self.name_id is None or self.end_date is None:
+            return
+        if self.end_date <= self.start_date:
+            raise ValidationError({"end_date": "A booking must end after it starts."})
+        message = self.conflict()
+        if message:
+            raise ValidationError(message)
 
-    def save(self, *args, **kwargs):
-        self.full_clean()
+    def save(self, *args, validate = True, **kwargs):
+        # validate=False skips the full_clean() round trips and leaves the
+        # constraints to the database; callers must handle IntegrityError.
+        self.fill_period()
+        if validate:
+            self.full_clean()
         return super().save(*args, **kwargs)
 
     def __str__(self):
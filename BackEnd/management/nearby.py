@@ -0,0 +1,64 @@
+"""Nearest available rooms to a point.
+
+Candidate owners come from the geocell key ranges covering the search
+circle (see geo.py), which is a few index range scans; only those owners get
+the exact haversine distance. Rooms are then read for the closest owners
+first, in batches that start at ``limit`` owners and double, until
+``limit`` rooms are found, so a crowded area never loads every room in it.
+"""
+
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+
+from .geo import covering_ranges, distance_km
+from .middleware import add_server_timing
+from .models import Hostel, Hostel_owner
+from .rows import RowMapper
+
+DEFAULT_RADIUS_KM = 5.0
+MAX_RADIUS_KM = 100.0
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+NEARBY_ROOM_ROWS = RowMapper({"id": "id", "name": "name", "owner_id": "hostel_owner_id"})
+
+
+def owners_within(latitude, longitude, radius_km):
+    """Return ``[(distance_km, owner_row), ...]`` for owners in the circle, nearest first."""
+    ranges = covering_ranges(latitude, longitude, radius_km)
+    in_cells = reduce(or_, (Q(geocell__gte=low, geocell__lt=high) for low, high in ranges))
+    candidates = list(
+        Hostel_owner.objects.filter(in_cells).values("id", "name", "location", "latitude", "longitude")
+    )
+    within = []
+    for owner in candidates:
+        distance = distance_km(latitude, longitude, owner["latitude"], owner["longitude"])
+        if distance <= radius_km:
+            within.append((distance, owner))
+    within.sort(key=lambda item: (item[0], item[1]["id"]))
+    add_server_timing("nearby", f"ranges={len(ranges)} candidates={len(candidates)} within={len(within)}")
+    return within
+
+
+def nearest_available_rooms(latitude, longitude, radius_km=DEFAULT_RADIUS_KM, limit=DEFAULT_LIMIT):
+    """Return up to ``limit`` available rooms within ``radius_km``, nearest first."""
+    owners = owners_within(latitude, longitude, radius_km)
+    results = []
+    start, batch_size = 0, limit
+    while start < len(owners) and len(results) < limit:
+        batch = owners[start : start + batch_size]
+        position = {owner["id"]: index for index, (_, owner) in enumerate(batch)}
+        rooms = NEARBY_ROOM_ROWS.rows(
+            NEARBY_ROOM_ROWS.values(Hostel.objects.filter(is_available=True, hostel_owner_id__in=list(position)))
+        )
+        rooms.sort(key=lambda room: (position[room["owner_id"]], room["id"]))
+        for room in rooms[: limit - len(results)]:
+            distance, owner = batch[position[room["owner_id"]]]
+            room.update(owner_name=owner["name"], location=owner["location"], distance_km=round(distance, 3))
+            results.append(room)
+        # Owners with no free rooms push the search outwards; widen the
+        # next batch so a sparse area costs a few queries, not one per owner.
+        start += batch_size
+        batch_size *= 2
+    return results
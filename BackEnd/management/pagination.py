@@ -0,0 +1,88 @@
+from rest_framework.pagination import BasePagination, CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class IdCursorPagination(CursorPagination):
+    """Keyset pagination over the primary key.
+
+    Each page is fetched with ``WHERE id > <cursor> ORDER BY id LIMIT n`` so
+    the database seeks straight to the cursor on the primary key index and
+    page 500 costs the same as page 1. The cursor handed back to clients is
+    DRF's opaque base64 token.
+    """
+
+    ordering = "id"
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+
+class NewestFirstCursorPagination(CursorPagination):
+    """Keyset pagination over the primary key, newest rows first."""
+
+    ordering = "-id"
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+
+class OwnerRoomsPagination(NewestFirstCursorPagination):
+    # The owner dashboard pages rooms and bookings independently, so each
+    # list gets its own cursor parameter.
+    cursor_query_param = "rooms_cursor"
+
+
+class OwnerBookingsPagination(NewestFirstCursorPagination):
+    cursor_query_param = "bookings_cursor"
+
+
+class RankedPagination(BasePagination):
+    """Page-number pagination for result lists ordered by relevance.
+
+    A ranked order has no keyset to seek on, so pages are offsets. The page
+    is fetched with one extra row to tell whether there is a next page,
+    which avoids the ``COUNT(*)`` ``PageNumberPagination`` would run over
+    every match.
+    """
+
+    page_query_param = "page"
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    # Deep offsets get slower; nobody reads page 50 of a search.
+    max_page = 50
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page = _positive_int(request.query_params.get(self.page_query_param), 1, self.max_page)
+        self.page_size = _positive_int(
+            request.query_params.get(self.page_size_query_param), self.page_size, self.max_page_size
+        )
+        offset = (self.page - 1) * self.page_size
+        rows = list(queryset[offset : offset + self.page_size + 1])
+        self.has_next = len(rows) > self.page_size and self.page < self.max_page
+        return rows[: self.page_size]
+
+    def _link(self, page):
+        url = self.request.build_absolute_uri()
+        if page == 1:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, page)
+
+    def get_next_link(self):
+        return self._link(self.page + 1) if self.has_next else None
+
+    def get_previous_link(self):
+        return self._link(self.page - 1) if self.page > 1 else None
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "previous": self.get_previous_link(), "results": data})
+
+
+def _positive_int(value, default, maximum):
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return default
+    return min(number, maximum) if number > 0 else default
@@ -0,0 +1,144 @@
+"""Account registration rules shared by ``register_user`` and the bulk importer."""
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+
+from .models import Hostel_owner, Registers, Student
+
+ROLES = ("student", "hostel_owner")
+
+
+def _text(data, key, default=""):
+    return str(data.get(key, default)).strip()
+
+
+def clean_registration(data):
+    """Validate a registration payload without touching the database.
+
+    Returns ``(account, errors)``. ``errors`` uses the field keys the
+    frontend expects; ``account`` holds the cleaned values and is only
+    meaningful when ``errors`` is empty.
+    """
+    first_name = _text(data, "first_name")
+    last_name = _text(data, "last_name")
+    email = _text(data, "email")
+    username = _text(data, "username")
+    role = _text(data, "role")
+    password = str(data.get("password", ""))
+    confirm_password = str(data.get("confirm_password", ""))
+    full_name = f"{first_name} {last_name}".strip()
+
+    errors = {}
+
+    if not first_name:
+        errors["firstName"] = "First name is required"
+    if not last_name:
+        errors["lastName"] = "Last name is required"
+    if not email:
+        errors["email"] = "Email is required"
+    else:
+        try:
+            validate_email(email)
+        except ValidationError:
+            errors["email"] = "Invalid email address"
+    if not username:
+        errors["username"] = "Username is required"
+    if not role:
+        errors["role"] = "Please select a role"
+    elif role not in ROLES:
+        errors["role"] = "Role must be student or hostel_owner"
+    if not password:
+        errors["password"] = "Password is required"
+    if password != confirm_password:
+        errors["confirmPassword"] = "Passwords do not match"
+
+    profile = {"name": full_name, "address": _text(data, "address", "Not provided") or "Not provided"}
+    if role == "student":
+        if len(full_name) > 30:
+            errors["firstName"] = "First and last name are too long for a student profile"
+        # Student.gender has max_length=10.
+        profile["gender"] = _text(data, "gender", "Not set") or "Not set"
+        if len(profile["gender"]) > 10:
+            errors["gender"] = "Gender must be 10 characters or fewer"
+        try:
+            profile["age"] = int(data.get("age", 18) or 18)
+            if profile["age"] < 1:
+                raise ValueError
+        except (TypeError, ValueError):
+            errors["age"] = "Age must be a positive number"
+        try:
+            profile["duration"] = int(data.get("duration", 1) or 1)
+            if profile["duration"] < 1:
+                raise ValueError
+        except (TypeError, ValueError):
+            errors["duration"] = "Duration must be a positive number"
+    elif role == "hostel_owner":
+        profile["phone"] = _text(data, "phone", "Not provided") or "Not provided"
+        profile["location"] = _text(data, "location", "Not provided") or "Not provided"
+        # Optional map position; nearby-room searches only find owners that have one.
+        for key, low, high in (("latitude", -90, 90), ("longitude", -180, 180)):
+            value = data.get(key)
+            if value in (None, ""):
+                continue
+            try:
+                profile[key] = float(value)
+                if not low <= profile[key] <= high:
+                    raise ValueError
+            except (TypeError, ValueError):
+                errors[key] = f"{key.title()} must be a number between {low} and {high}"
+        if ("latitude" in profile) != ("longitude" in profile) and not {"latitude", "longitude"} & set(errors):
+            errors["location"] = "Give both latitude and longitude, or neither"
+
+    account = {
+        "first_name": first_name,
+        "last_name": last_name,
+        "email": email,
+        "username": username,
+        "role": role,
+        "password": password,
+        "profile": profile,
+    }
+    return account, errors
+
+
+def taken_errors(account):
+    """Return errors for a username or email that already has an account."""
+    errors = {}
+    if User.objects.filter(username=account["username"]).exists():
+        errors["username"] = "Username already exists"
+    if User.objects.filter(email=account["email"]).exists():
+        errors["email"] = "Email already registered"
+    return errors
+
+
+def account_rows(account, user):
+    """Return the unsaved Registers row and role profile for ``user``."""
+    register = Registers(
+        user=user,
+        first_name=account["first_name"],
+        Last_name=account["last_name"],
+        email_address=account["email"],
+        role=account["role"],
+    )
+    if account["role"] == "student":
+        return register, Student(user=user, **account["profile"])
+    owner = Hostel_owner(user=user, **account["profile"])
+    # bulk_create() skips save(), which would otherwise derive this.
+    owner.refresh_geocell()
+    return register, owner
+
+
+def create_account(account):
+    """Create the user, its Registers row and its role profile. Run inside a transaction."""
+    user = User.objects.create_user(
+        username=account["username"],
+        email=account["email"],
+        password=account["password"],
+        first_name=account["first_name"],
+        last_name=account["last_name"],
+    )
+    register, profile = account_rows(account, user)
+    register.save()
+    profile.save()
+    return user
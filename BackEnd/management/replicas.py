@@ -0,0 +1,152 @@
+"""Send reads to read replicas, writes and recent writers to the primary.
+
+``ReplicaRoutingMiddleware`` decides per request where ``ReplicaRouter``
+sends reads:
+
+* safe-method requests (GET, HEAD, OPTIONS) read from one of
+  ``DATABASE_REPLICAS``, picked once per request;
+* unsafe requests, and any request once it has written, read from
+  ``default``, as do reads outside a request (commands, the shell);
+* a client that wrote recently keeps reading from ``default`` for
+  ``REPLICA_STICKY_SECONDS`` so it sees its own booking, room or
+  registration despite replication lag. The window is carried in a cookie
+  and, for authenticated users, in the cache under the user id, which
+  covers token clients that drop cookies.
+
+Writes always go to ``default``, and so do DatabaseCache entries (app label
+``django_cache``): markers, cached roles, token revocations and the sticky
+window itself must not be read from a lagging replica, and the cache
+writes a GET makes are not writes of the client's. With no replicas configured every query
+goes to ``default`` as before. Locally, two SQLite files stand in for a
+primary and a replica::
+
+    cp db.sqlite3 replica.sqlite3
+    DB_REPLICA_URLS=sqlite:///replica.sqlite3 python manage.py runserver
+"""
+
+import random
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.functional import SimpleLazyObject, empty
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+STICKY_COOKIE = "db_primary"
+# DatabaseCache's cache table model.
+CACHE_APP_LABEL = "django_cache"
+
+_routing = ContextVar("replica_routing", default=None)
+
+
+def sticky_key(user_id):
+    return f"db_primary:{user_id}"
+
+
+def _known_user_id(request):
+    # Only a user that authentication already loaded; resolving one here
+    # would itself query auth_user through this router.
+    user = request.__dict__.get("user")
+    if isinstance(user, SimpleLazyObject):
+        user = None if user._wrapped is empty else user._wrapped
+    if user is None or not user.is_authenticated:
+        return None
+    return user.id
+
+
+class RequestRouting:
+    def __init__(self, request, replica, primary):
+        self.request = request
+        self.replica = replica
+        self.primary = primary
+        self.wrote = False
+        self.user_checked = False
+
+    def read_alias(self):
+        if not self.primary and not self.user_checked:
+            user_id = _known_user_id(self.request)
+            if user_id is not None:
+                self.user_checked = True
+                self.primary = cache.get(sticky_key(user_id), 0) > time.time()
+        return DEFAULT_DB_ALIAS if self.primary else self.replica
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        routing = _routing.get()
+        if routing is None or model._meta.app_label == CACHE_APP_LABEL:
+            return DEFAULT_DB_ALIAS
+        return routing.read_alias()
+
+    def db_for_write(self, model, **hints):
+        routing = _routing.get()
+        if routing is not None and model._meta.app_label != CACHE_APP_LABEL:
+            # Later reads in this request must see the write.
+            routing.wrote = routing.primary = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema from the primary.
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _routing.set(self._routing_for(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            routing = _routing.get()
+            _routing.reset(token)
+        sticky = self._finish(request, response, routing)
+        if sticky:
+            cache.set(*sticky)
+        return response
+
+    async def __acall__(self, request):
+        token = _routing.set(self._routing_for(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            routing = _routing.get()
+            _routing.reset(token)
+        sticky = self._finish(request, response, routing)
+        if sticky:
+            await cache.aset(*sticky)
+        return response
+
+    def _routing_for(self, request):
+        replicas = settings.DATABASE_REPLICAS
+        primary = not replicas or request.method not in SAFE_METHODS or STICKY_COOKIE in request.COOKIES
+        return RequestRouting(request, random.choice(replicas) if replicas else DEFAULT_DB_ALIAS, primary)
+
+    def _finish(self, request, response, routing):
+        """Set the sticky cookie after a write; return the cache entry to set, if any."""
+        if routing.wrote and settings.DATABASE_REPLICAS:
+            seconds = settings.REPLICA_STICKY_SECONDS
+            response.set_cookie(STICKY_COOKIE, "1", max_age=seconds, httponly=True, samesite="Lax")
+            user_id = _known_user_id(request)
+            if user_id is not None:
+                return sticky_key(user_id), time.time() + seconds, seconds
+        return None
@@ -0,0 +1,82 @@
+"""Effective role resolution with a per-user cache entry.
+
+The role is derived from ``Registers`` with a fallback to the profile tables,
+which costs up to three queries. It is resolved once per user and kept in the
+default cache; the signal handlers drop the entry whenever a ``Registers``,
+``Student`` or ``Hostel_owner`` row for that user changes. Only ``user.id`` is
+used, so a stateless ``TokenUser`` works as well as a ``User``.
+
+Invalidation must reach every worker, so roles are only cached when the
+cache is shared (``settings.CACHE_SHARED``); otherwise every check resolves
+the role from the database.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Hostel_owner, Registers, Student
+
+ROLE_CACHE_TIMEOUT = 60 * 60
+
+
+def normalized_role(value):
+    role = str(value or "").strip().lower()
+    if role in {"hostel owner", "owner"}:
+        return "hostel_owner"
+    if role in {"student"}:
+        return "student"
+    return role
+
+
+def role_cache_key(user_id):
+    return f"role:{user_id}"
+
+
+def _resolve_role(user):
+    register = Registers.objects.filter(user_id=user.id).first()
+    role = normalized_role(register.role if register else "")
+    if role in {"student", "hostel_owner"}:
+        return role
+    if Hostel_owner.objects.filter(user_id=user.id).exists():
+        return "hostel_owner"
+    if Student.objects.filter(user_id=user.id).exists():
+        return "student"
+    return ""
+
+
+async def _aresolve_role(user):
+    register = await Registers.objects.filter(user_id=user.id).afirst()
+    role = normalized_role(register.role if register else "")
+    if role in {"student", "hostel_owner"}:
+        return role
+    if await Hostel_owner.objects.filter(user_id=user.id).aexists():
+        return "hostel_owner"
+    if await Student.objects.filter(user_id=user.id).aexists():
+        return "student"
+    return ""
+
+
+def effective_role_for_user(user):
+    if not settings.CACHE_SHARED:
+        return _resolve_role(user)
+    key = role_cache_key(user.id)
+    role = cache.get(key)
+    if role is None:
+        role = _resolve_role(user)
+        cache.set(key, role, ROLE_CACHE_TIMEOUT)
+    return role
+
+
+async def aeffective_role_for_user(user):
+    if not settings.CACHE_SHARED:
+        return await _aresolve_role(user)
+    key = role_cache_key(user.id)
+    role = await cache.aget(key)
+    if role is None:
+        role = await _aresolve_role(user)
+        await cache.aset(key, role, ROLE_CACHE_TIMEOUT)
+    return role
+
+
+def forget_roles(*user_ids):
+    cache.delete_many([role_cache_key(user_id) for user_id in user_ids if user_id])
@@ -0,0 +1,89 @@
+"""Build list payloads straight from ``values()`` rows.
+
+Turning every row into a model instance and then walking it through DRF's
+field machinery dominates the CPU time of large list responses. A
+``RowMapper`` is compiled once from an output-key -> column mapping (or from
+a serializer's read fields) and then only renames keys and converts the few
+values whose JSON form differs from what the database driver returns, so the
+rendered output stays byte-identical to the serializer path.
+"""
+
+from functools import lru_cache
+from operator import itemgetter
+
+from rest_framework import fields, relations
+
+# Serializer fields whose to_representation() is a no-op on the values the
+# database driver already returns (int for ints and keys, str for text, bool
+# for booleans).
+PASSTHROUGH_FIELDS = (fields.IntegerField, fields.CharField, fields.BooleanField)
+
+
+def _converter(field):
+    """Return the callable turning a column value into ``field``'s output, or None."""
+    if isinstance(field, relations.PrimaryKeyRelatedField) and field.pk_field is None:
+        return None
+    if isinstance(field, PASSTHROUGH_FIELDS) and not isinstance(field, fields.ChoiceField):
+        return None
+    return field.to_representation
+
+
+class RowMapper:
+    """Map ``values()`` dicts to output dicts.
+
+    ``mapping`` is an ordered ``{output_key: column}`` dict; ``converters``
+    optionally maps output keys to callables applied to non-null values.
+    """
+
+    def __init__(self, mapping, converters=None):
+        self.keys = tuple(mapping)
+        self.columns = tuple(dict.fromkeys(mapping.values()))
+        sources = tuple(mapping.values())
+        if len(sources) == 1:
+            self._get = lambda row, column=sources[0]: (row[column],)
+        else:
+            self._get = itemgetter(*sources)
+        self._converters = tuple((converters or {}).items())
+
+    @classmethod
+    def for_serializer(cls, serializer_class, field_names=None):
+        """Compile the read fields of a plain ``ModelSerializer``."""
+        return _serializer_mapper(serializer_class, tuple(field_names) if field_names is not None else None)
+
+    def values(self, queryset, *extra_columns):
+        """Return ``queryset.values()`` over the mapped columns plus ``extra_columns``."""
+        return queryset.values(*dict.fromkeys(self.columns + extra_columns))
+
+    def row(self, row):
+        item = dict(zip(self.keys, self._get(row)))
+        for key, convert in self._converters:
+            value = item[key]
+            if value is not None:
+                item[key] = convert(value)
+        return item
+
+    def rows(self, rows):
+        keys = self.keys
+        get = self._get
+        converters = self._converters
+        if not converters:
+            return [dict(zip(keys, get(row))) for row in rows]
+        return [self.row(row) for row in rows]
+
+
+@lru_cache(maxsize=256)
+def _serializer_mapper(serializer_class, field_names):
+    serializer = serializer_class(fields=field_names)
+    opts = serializer.Meta.model._meta
+    mapping = {}
+    converters = {}
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if field.source == "*" or "." in field.source:
+            raise ValueError(f"{serializer_class.__name__}.{name} is not a plain model column")
+        mapping[name] = opts.get_field(field.source).attname
+        converter = _converter(field)
+        if converter is not None:
+            converters[name] = converter
+    return RowMapper(mapping, converters)
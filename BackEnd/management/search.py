@@ -0,0 +1,87 @@
+"""Room search over the room name, the owner's name and the owner's location.
+
+A term matches a room when it occurs anywhere in one of the three fields,
+case-insensitively. Results are ranked:
+
+* 4: the room name is the term,
+* 3: the room name starts with the term,
+* 2: the owner's name or location starts with the term,
+* 1: the term occurs inside one of the fields,
+
+and within a rank on PostgreSQL by trigram word similarity, then by id.
+
+On PostgreSQL the ``icontains``/``istartswith`` filters compile to
+``UPPER(col) LIKE UPPER(...)``, which migration 0015's ``pg_trgm`` GIN
+indexes on ``UPPER(col)`` answer without scanning the table; terms shorter
+than three characters have no trigram to look up and are rejected. Owners
+are matched in a subquery feeding the room filter, so the room side is an
+OR of the name index and ``hostel_owner_recent_idx`` instead of an OR across
+a join, and no id list is shipped through Python however many owners match.
+Other databases run the same queries unindexed.
+"""
+
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.functions import Greatest
+
+from .models import Hostel, Hostel_owner
+from .rows import RowMapper
+
+# pg_trgm indexes trigrams; a shorter term would scan the table.
+MIN_TERM_LENGTH = 3
+MAX_TERM_LENGTH = 100
+SEARCH_ROWS = RowMapper(
+    {
+        "id": "id",
+        "name": "name",
+        "owner_id": "hostel_owner_id",
+        "owner_name": "hostel_owner__name",
+        "location": "hostel_owner__location",
+        "is_available": "is_available",
+    }
+)
+
+
+def clean_term(value):
+    """Return ``(term, error)`` for the ``q`` query parameter."""
+    term = " ".join(str(value or "").split())
+    if len(term) < MIN_TERM_LENGTH:
+        return None, f"Search term must be at least {MIN_TERM_LENGTH} characters"
+    if len(term) > MAX_TERM_LENGTH:
+        return None, f"Search term must be {MAX_TERM_LENGTH} characters or fewer"
+    return term, None
+
+
+def _matching_owner_ids(term):
+    return Hostel_owner.objects.filter(Q(name__icontains=term) | Q(location__icontains=term)).values("id")
+
+
+def search_hostels_queryset(term, available_only=False):
+    """Return the ranked ``values()`` queryset of rooms matching ``term``."""
+    matches = Q(name__icontains=term) | Q(hostel_owner_id__in=_matching_owner_ids(term))
+    queryset = Hostel.objects.filter(matches)
+    if available_only:
+        queryset = queryset.filter(is_available=True)
+
+    queryset = queryset.annotate(
+        rank=Case(
+            When(name__iexact=term, then=Value(4)),
+            When(name__istartswith=term, then=Value(3)),
+            When(Q(hostel_owner__name__istartswith=term) | Q(hostel_owner__location__istartswith=term), then=Value(2)),
+            default=Value(1),
+            output_field=IntegerField(),
+        )
+    )
+    ordering = ["-rank"]
+    if connection.vendor == "postgresql":
+        from django.contrib.postgres.search import TrigramWordSimilarity
+
+        queryset = queryset.annotate(
+            similarity=Greatest(
+                TrigramWordSimilarity(term, "name"),
+                TrigramWordSimilarity(term, "hostel_owner__name"),
+                TrigramWordSimilarity(term, "hostel_owner__location"),
+            )
+        )
+        ordering.append("-similarity")
+    return SEARCH_ROWS.values(queryset.order_by(*ordering, "id"))
@@ -3,40 +3,60 @@ from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
 from .models import *
 
-class StudentSerializer(serializers.ModelSerializer):
+
+class DynamicFieldsModelSerializer(serializers.ModelSerializer):
+    """ModelSerializer that can be narrowed to a subset of its fields.
+
+    Pass ``fields=("id", "name")`` to drop every other field from the output.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
+
+class StudentSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Student
         fields = '__all__'
 
 
 
-class Hostel_ownerSerializer(serializers.ModelSerializer):
+class Hostel_ownerSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Hostel_owner
         fields = '__all__'
+        extra_kwargs = {
+            'latitude': {'min_value': -90, 'max_value': 90},
+            'longitude': {'min_value': -180, 'max_value': 180},
+        }
 
-class AdministratorSerializer(serializers.ModelSerializer):
+class AdministratorSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Administrator
         fields = '__all__'
 
-class BookingSerializer(serializers.ModelSerializer):
+class BookingSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Booking        
         fields = '__all__'
 
 
-class HostelSerializer(serializers.ModelSerializer):
+class HostelSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Hostel        
-        fields = '__all__'   
+        fields = '__all__'
+        read_only_fields = ('is_available',)
 
-class RoleSerializer(serializers.ModelSerializer):
+class RoleSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Role
         fields = '__all__'
 
-class RegistersSerializer(serializers.ModelSerializer):
+class RegistersSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Registers
         fields = '__all__'        
@@ -0,0 +1,148 @@
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .auth_backends import forget_users
+from .events import availability_event, booking_event, publish_room_events
+from .markers import bump_markers, owner_scope, table_scope
+from .models import Administrator, Booking, Hostel, Hostel_owner, Registers, Role, Student
+from .roles import forget_roles
+from .tokens import revoke_tokens
+
+
+TRACKED_MODELS = (Administrator, Booking, Hostel, Hostel_owner, Registers, Role, Student)
+# Rows that feed a user's effective role.
+ROLE_MODELS = (Registers, Student, Hostel_owner)
+
+
+def _room_states(room_ids):
+    """Return ``{room_id: (owner_id, is_available)}`` for the rooms that still exist."""
+    return {
+        room_id: (owner_id, is_available)
+        for room_id, owner_id, is_available in Hostel.objects.filter(
+            pk__in=[room_id for room_id in room_ids if room_id]
+        ).values_list("pk", "hostel_owner_id", "is_available")
+    }
+
+
+@receiver(post_init, sender=Hostel)
+def remember_loaded_owner(sender, instance, **kwargs):
+    # Lets a save that moves a room to another owner invalidate both owners.
+    instance._loaded_owner_id = instance.__dict__.get("hostel_owner_id")
+
+
+@receiver(post_init, sender=Booking)
+def remember_loaded_room(sender, instance, **kwargs):
+    instance._loaded_room_id = instance.__dict__.get("room_id")
+
+
+def refresh_availability(room_ids):
+    """Recompute ``Hostel.is_available`` for ``room_ids`` in one UPDATE.
+
+    A room is available while no booking of it is running or still to start.
+    """
+    room_ids = [room_id for room_id in room_ids if room_id]
+    if room_ids:
+        Hostel.objects.filter(pk__in=room_ids).update(
+            is_available=~Exists(Booking.objects.current().filter(room=OuterRef("pk")))
+        )
+
+
+def release_ended_bookings(today=None):
+    """Mark rooms whose last booking ended before ``today`` available again.
+
+    No write happens when a stay ends, so this runs once a day (see the
+    ``refresh_availability`` command). Returns the number of rooms released.
+    """
+    rooms = list(
+        Hostel.objects.filter(is_available=False)
+        .exclude(Exists(Booking.objects.current(today).filter(room=OuterRef("pk"))))
+        .values_list("pk", "hostel_owner_id")
+    )
+    if rooms:
+        Hostel.objects.filter(pk__in=[room_id for room_id, _ in rooms]).update(is_available=True)
+        bump_markers(table_scope(Hostel), *{owner_scope(owner_id) for _, owner_id in rooms})
+        publish_room_events([(owner_id, availability_event(room_id, owner_id, True)) for room_id, owner_id in rooms])
+    return len(rooms)
+
+
+def remember_loaded_user(sender, instance, **kwargs):
+    instance._loaded_user_id = instance.__dict__.get("user_id")
+
+
+def rows_changed(model, instances):
+    """Bring denormalized state in line after ``instances`` of ``model`` changed.
+
+    Bumps the change markers, drops cached roles, refreshes room
+    availability and publishes room events (see events.py) as needed.
+
+    Called by the signal handlers below and directly by bulk writes, which do
+    not send ``post_save``.
+    """
+    if model in ROLE_MODELS:
+        user_ids = set()
+        for instance in instances:
+            user_ids.update((instance.user_id, getattr(instance, "_loaded_user_id", None)))
+        forget_roles(*user_ids)
+
+    scopes = {table_scope(model)}
+    events = []
+    if model is Hostel:
+        for instance in instances:
+            scopes.update(
+                owner_scope(owner_id)
+                for owner_id in (instance.hostel_owner_id, getattr(instance, "_loaded_owner_id", None))
+                if owner_id
+            )
+            owner_id = instance.hostel_owner_id
+            events.append((owner_id, availability_event(instance.pk, owner_id, instance.is_available)))
+    elif model is Booking:
+        room_ids = set()
+        for instance in instances:
+            room_ids.update((instance.room_id, getattr(instance, "_loaded_room_id", None)))
+        refresh_availability(room_ids)
+        rooms = _room_states(room_ids)
+        scopes.update(owner_scope(owner_id) for owner_id, _ in rooms.values())
+        events.extend(
+            (rooms[instance.room_id][0], booking_event(instance, rooms[instance.room_id][0]))
+            for instance in instances
+            if instance.room_id in rooms
+        )
+        events.extend(
+            (owner_id, availability_event(room_id, owner_id, is_available))
+            for room_id, (owner_id, is_available) in rooms.items()
+        )
+    bump_markers(*scopes)
+    if connection.in_atomic_block:
+        # A reader may see the first bump before the transaction commits and
+        # cache the old rows under the new marker; bump again once the new
+        # rows are visible.
+        transaction.on_commit(partial(bump_markers, *scopes))
+    if events:
+        # Subscribers refetch on some events, so only announce committed rows.
+        transaction.on_commit(partial(publish_room_events, events))
+
+
+def _on_change(sender, instance, **kwargs):
+    rows_changed(sender, [instance])
+
+
+for _model in TRACKED_MODELS:
+    post_save.connect(_on_change, sender=_model, dispatch_uid=f"rows_changed_save_{_model.__name__}")
+    post_delete.connect(_on_change, sender=_model, dispatch_uid=f"rows_changed_delete_{_model.__name__}")
+
+for _model in ROLE_MODELS:
+    post_init.connect(remember_loaded_user, sender=_model, dispatch_uid=f"remember_user_{_model.__name__}")
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def forget_cached_user(sender, instance, **kwargs):
+    # CachedModelBackend serves session users from the cache.
+    forget_users(instance.pk)
+    if kwargs["signal"] is post_delete or not instance.is_active:
+        revoke_tokens(instance.pk)
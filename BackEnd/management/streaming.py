@@ -0,0 +1,76 @@
+"""Stream JSON list payloads instead of building them in memory.
+
+``stream_json(request, payload)`` renders ``payload`` incrementally: any
+``Rows`` in it (the whole payload or values of a top-level dict) is read
+with ``QuerySet.iterator(chunk_size=...)``, which uses a server-side cursor
+on PostgreSQL, and written out one chunk of rows at a time. Worker memory
+stays at one chunk whatever the result size, and the first bytes go out
+before the last row is read. The bytes are the same ones DRF's JSONRenderer
+produces for the equivalent in-memory payload.
+"""
+
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+
+STREAM_VALUES = ("1", "true", "yes")
+
+
+def wants_stream(request):
+    return request.GET.get("stream", "").lower() in STREAM_VALUES
+
+
+class Rows:
+    """A ``values()`` queryset rendered as a JSON array through a RowMapper."""
+
+    def __init__(self, queryset, mapper):
+        self.queryset = queryset
+        self.mapper = mapper
+
+    def chunks(self, renderer, chunk_size):
+        rows = self.queryset.iterator(chunk_size=chunk_size)
+        separator = b""
+        yield b"["
+        while True:
+            chunk = self.mapper.rows(islice(rows, chunk_size))
+            if not chunk:
+                break
+            # Render the chunk as an array and drop its brackets.
+            yield separator + renderer.render(chunk)[1:-1]
+            separator = b","
+        yield b"]"
+
+
+def _chunks(payload, renderer, chunk_size):
+    if isinstance(payload, Rows):
+        yield from payload.chunks(renderer, chunk_size)
+        return
+    if not isinstance(payload, dict):
+        yield renderer.render(payload)
+        return
+    separator = b"{"
+    for key, value in payload.items():
+        yield separator + renderer.render(key) + b":"
+        yield from _chunks(value, renderer, chunk_size)
+        separator = b","
+    yield b"}" if payload else b"{}"
+
+
+async def _aiterate(iterator):
+    # The rows belong to the request thread's database connection, so every
+    # chunk is produced on that same thread.
+    next_chunk = sync_to_async(next, thread_sensitive=True)
+    while (chunk := await next_chunk(iterator, None)) is not None:
+        yield chunk
+
+
+def stream_json(request, payload, status=200):
+    content = _chunks(payload, JSONRenderer(), settings.API_STREAM_CHUNK_SIZE)
+    if isinstance(request, ASGIRequest) or isinstance(getattr(request, "_request", None), ASGIRequest):
+        # ASGI would otherwise drain a synchronous iterator into a list first.
+        content = _aiterate(content)
+    return StreamingHttpResponse(content, status=status, content_type="application/json")
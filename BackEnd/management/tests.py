@@ -1,7 +1,56 @@
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import random
+import re
+import tempfile
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.core.management import CommandError, call_command
+from django.db import DEFAULT_DB_ALIAS, connection, connections, router
+from django.http import JsonResponse
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework import status
-from rest_framework.test import APITestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from BackEnd.dbpool import check_transaction_modes, configure_database
+from BackEnd.sharedcache import cache_is_shared, check_session_engine, default_session_engine
+
+from . import availability
+from .events import RESYNC, Broker, LocalBroker, Subscription, availability_event, get_broker
+from .geo import covering_ranges, distance_km, geocell
+from .models import Booking, Hostel, Hostel_owner, Registers, Student, months_after
+from .replicas import STICKY_COOKIE, ReplicaRoutingMiddleware, sticky_key
+from .roles import role_cache_key
+from .serializer import BookingSerializer, HostelSerializer, StudentSerializer
+from .signals import rows_changed
+
+
+TIMING_LOGGER = logging.getLogger("BackEnd.management.middleware")
+_timing_log_level = TIMING_LOGGER.level
 
-from .models import Hostel, Registers, Student
+
+def setUpModule():
+    # Test requests hash passwords and often cross REQUEST_TIMING_SLOW_MS;
+    # keep their warnings out of the test output. assertLogs() still sees them.
+    TIMING_LOGGER.setLevel(logging.ERROR)
+
+
+def tearDownModule():
+    TIMING_LOGGER.setLevel(_timing_log_level)
 
 
 class StudentApiTests(APITestCase):
@@ -199,6 +248,29 @@ class BookingAndOwnerFlowTests(APITestCase):
         owner_booking_access = self.client.get(self.student_bookings_url, format="json")
         self.assertEqual(owner_booking_access.status_code, status.HTTP_403_FORBIDDEN)
 
+    def test_session_writes_need_a_csrf_token_but_bearer_writes_do_not(self):
+        self._register(self.owner_payload)
+        self.client = APIClient(enforce_csrf_checks=True)
+        tokens = self._login("owner_one")
+
+        without_token = self.client.post(self.owner_rooms_url, {"room_name": "C-301"}, format="json")
+        self.assertEqual(without_token.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertIn("CSRF", str(without_token.data["detail"]))
+
+        self.client.get("/api/csrf/")
+        with_token = self.client.post(
+            self.owner_rooms_url,
+            {"room_name": "C-301"},
+            format="json",
+            HTTP_X_CSRFTOKEN=self.client.cookies["csrftoken"].value,
+        )
+        self.assertEqual(with_token.status_code, status.HTTP_201_CREATED)
+
+        bearer = APIClient(enforce_csrf_checks=True)
+        bearer.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        response = bearer.post(self.owner_rooms_url, {"room_name": "C-302"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
     def test_owner_room_name_too_long_returns_400(self):
         self._register(self.owner_payload)
         self._login("owner_one")
@@ -276,3 +348,1415 @@ class BookingAndOwnerFlowTests(APITestCase):
         second_booking = self.client.post(self.student_bookings_url, {"hostel_id": room2_id}, format="json")
         self.assertEqual(second_booking.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(second_booking.data["message"], "You already have a booking")
+
+
+class GenericListPaginationTests(APITestCase):
+    def setUp(self):
+        self.list_url = "/api/students/"
+        for index in range(5):
+            Student.objects.create(name=f"Student {index}", age=20, address="Campus", duration=6, gender="Male")
+
+    def test_list_is_paginated_by_id_with_next_cursor(self):
+        response = self.client.get(self.list_url, {"page_size": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIsNone(response.data["previous"])
+        self.assertIsNotNone(response.data["next"])
+
+        seen = []
+        url = f"{self.list_url}?page_size=2"
+        while url:
+            page = self.client.get(url)
+            self.assertEqual(page.status_code, status.HTTP_200_OK)
+            seen.extend(item["id"] for item in page.data["results"])
+            url = page.data["next"]
+        self.assertEqual(seen, list(Student.objects.order_by("id").values_list("id", flat=True)))
+
+    def test_page_size_is_capped(self):
+        response = self.client.get(self.list_url, {"page_size": 100000})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 5)
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(self.list_url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class SparseFieldsetTests(APITestCase):
+    def setUp(self):
+        self.student = Student.objects.create(name="Sparse", age=20, address="Campus", duration=6, gender="Male")
+
+    def test_list_returns_only_requested_fields(self):
+        response = self.client.get("/api/students/", {"fields": "id,name"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"], [{"id": self.student.id, "name": "Sparse"}])
+
+    def test_sparse_fieldset_narrows_sql_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(f"/api/students/{self.student.id}/", {"fields": "name"})
+        sql = queries.captured_queries[-1]["sql"]
+        self.assertIn('"name"', sql)
+        self.assertNotIn('"address"', sql)
+
+    def test_unknown_field_returns_400(self):
+        response = self.client.get("/api/students/", {"fields": "id,password"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["message"], "Unknown fields: password")
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = Student.objects.create(name="Etag", age=20, address="Campus", duration=6, gender="Male")
+
+    def test_list_returns_304_until_table_changes(self):
+        first = self.client.get("/api/students/")
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        etag = first["ETag"]
+        self.assertTrue(first.has_header("Last-Modified"))
+
+        with CaptureQueriesContext(connection) as queries:
+            cached = self.client.get("/api/students/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(cached["ETag"], etag)
+        self.assertEqual(len(queries), 0)
+
+        Student.objects.create(name="Other", age=21, address="Campus", duration=6, gender="Male")
+        changed = self.client.get("/api/students/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(changed["ETag"], etag)
+
+    def test_student_bookings_poll_returns_304_until_a_room_is_posted(self):
+        user = User.objects.create_user(username="etag_student", password="pass12345")
+        Registers.objects.create(user=user, first_name="E", Last_name="S", email_address="e@example.com", role="student")
+        Student.objects.create(user=user, name="E S", age=20, address="Campus", duration=6, gender="Male")
+        owner = Hostel_owner.objects.create(name="Owner", address="Town", phone="1", location="Town")
+        self.client.force_authenticate(user)
+
+        first = self.client.get("/api/student/bookings/")
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        cached = self.client.get("/api/student/bookings/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Hostel.objects.create(name="E-1", hostel_owner=owner)
+        changed = self.client.get("/api/student/bookings/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertEqual([room["name"] for room in changed.data["hostels"]], ["E-1"])
+
+    @override_settings(CACHE_SHARED=False)
+    def test_per_process_cache_sends_no_validators(self):
+        first = self.client.get("/api/students/")
+        self.assertFalse(first.has_header("ETag"))
+        self.assertFalse(first.has_header("Last-Modified"))
+        # A marker bumped in another worker would never reach this one.
+        cache.clear()
+        again = self.client.get("/api/students/", HTTP_IF_NONE_MATCH='"anything"')
+        self.assertEqual(again.status_code, status.HTTP_200_OK)
+
+    def test_cache_is_shared_only_for_cross_process_backends(self):
+        locmem = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+        redis = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache"}}
+        self.assertFalse(cache_is_shared(locmem))
+        self.assertTrue(cache_is_shared(locmem, single_process=True))
+        self.assertTrue(cache_is_shared(redis))
+
+
+class BulkGenericApiTests(APITestCase):
+    def setUp(self):
+        self.list_url = "/api/students/"
+        self.student_payload = {"age": 20, "address": "Campus", "duration": 6, "gender": "Male"}
+        self.client.force_authenticate(User.objects.create_user(username="bulk_staff", password="x", is_staff=True))
+
+    def test_bulk_requests_are_staff_only(self):
+        student = Student.objects.create(name="Kept", **self.student_payload)
+        user = User.objects.create_user(username="bulk_student", password="x")
+        Registers.objects.create(user=user, first_name="B", Last_name="S", role="student")
+        requests = [
+            ("post", [dict(self.student_payload, name="New")]),
+            ("patch", [{"id": student.id, "name": "Changed"}]),
+            ("delete", {"ids": [student.id]}),
+        ]
+        for caller, expected in ((None, status.HTTP_401_UNAUTHORIZED), (user, status.HTTP_403_FORBIDDEN)):
+            self.client.force_authenticate(caller)
+            for method, payload in requests:
+                response = getattr(self.client, method)(self.list_url, payload, format="json")
+                self.assertEqual(response.status_code, expected, method)
+        self.assertEqual(list(Student.objects.values_list("name", flat=True)), ["Kept"])
+
+    def test_bulk_create_inserts_all_items(self):
+        payload = [dict(self.student_payload, name=f"Bulk {index}") for index in range(3)]
+        response = self.client.post(self.list_url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([item["name"] for item in response.data], ["Bulk 0", "Bulk 1", "Bulk 2"])
+        self.assertEqual(Student.objects.count(), 3)
+
+    def test_bulk_create_reports_per_item_errors_and_creates_nothing(self):
+        payload = [dict(self.student_payload, name="Good"), {"name": "Missing fields"}]
+        response = self.client.post(self.list_url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["errors"][0]["index"], 1)
+        self.assertIn("age", response.data["errors"][0]["errors"])
+        self.assertEqual(Student.objects.count(), 0)
+
+    @override_settings(API_BULK_MAX_ITEMS=2)
+    def test_bulk_request_over_max_batch_size_is_rejected(self):
+        payload = [dict(self.student_payload, name=f"Bulk {index}") for index in range(3)]
+        response = self.client.post(self.list_url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["message"], "A bulk request can contain at most 2 items")
+
+    def test_bulk_patch_updates_in_one_statement(self):
+        students = [Student.objects.create(name=f"Old {index}", **self.student_payload) for index in range(2)]
+        payload = [{"id": student.id, "name": f"New {student.id}"} for student in students]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(self.list_url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len([query for query in queries if query["sql"].startswith("UPDATE")]), 1)
+        self.assertEqual(
+            sorted(Student.objects.values_list("name", flat=True)),
+            sorted(f"New {student.id}" for student in students),
+        )
+
+    def test_bulk_delete_removes_listed_ids(self):
+        students = [Student.objects.create(name=f"Gone {index}", **self.student_payload) for index in range(3)]
+        ids = [student.id for student in students[:2]]
+        response = self.client.delete(self.list_url, {"ids": ids}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["deleted"], 2)
+        self.assertEqual(list(Student.objects.values_list("id", flat=True)), [students[2].id])
+
+    def test_bulk_delete_with_unknown_id_deletes_nothing(self):
+        student = Student.objects.create(name="Kept", **self.student_payload)
+        response = self.client.delete(self.list_url, {"ids": [student.id, student.id + 100]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data["errors"][0]["index"], 1)
+        self.assertTrue(Student.objects.filter(id=student.id).exists())
+
+
+class EffectiveRoleCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="role_user", password="pass12345")
+        self.register = Registers.objects.create(
+            user=self.user, first_name="Role", Last_name="User", email_address="role@example.com", role="student"
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_role_is_resolved_once_then_served_from_cache(self):
+        first = self.client.get("/api/me/")
+        self.assertEqual(first.data["role"], "student")
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get("/api/me/")
+        self.assertEqual(second.data["role"], "student")
+        self.assertEqual(len(queries), 0)
+
+    def test_cached_role_is_invalidated_when_registers_changes(self):
+        self.client.get("/api/me/")
+        self.register.role = "hostel_owner"
+        self.register.save()
+        response = self.client.get("/api/me/")
+        self.assertEqual(response.data["role"], "hostel_owner")
+
+    def test_cached_role_is_invalidated_when_profile_is_deleted(self):
+        self.register.role = ""
+        self.register.save()
+        owner = Hostel_owner.objects.create(user=self.user, name="Role User", address="A", phone="1", location="L")
+        self.assertEqual(self.client.get("/api/me/").data["role"], "hostel_owner")
+        owner.delete()
+        self.assertEqual(self.client.get("/api/me/").data["role"], "")
+
+    @override_settings(CACHE_SHARED=False)
+    def test_roles_are_not_cached_in_a_per_process_cache(self):
+        self.assertEqual(self.client.get("/api/me/").data["role"], "student")
+        self.assertIsNone(cache.get(role_cache_key(self.user.id)))
+        # Simulates a revocation made by another worker, which cannot clear this one's cache.
+        Registers.objects.filter(pk=self.register.pk).update(role="")
+        self.assertEqual(self.client.get("/api/me/").data["role"], "")
+
+
+class HostelAvailabilityTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = Hostel_owner.objects.create(name="Owner", address="Town", phone="1", location="Town")
+        self.room = Hostel.objects.create(name="F-1", hostel_owner=self.owner)
+        self.student = Student.objects.create(name="Avail", age=20, address="Campus", duration=6, gender="Male")
+
+    def test_booking_save_and_delete_maintain_availability(self):
+        self.assertTrue(Hostel.objects.get(pk=self.room.pk).is_available)
+        booking = Booking.objects.create(room=self.room, name=self.student)
+        self.assertFalse(Hostel.objects.get(pk=self.room.pk).is_available)
+        booking.delete()
+        self.assertTrue(Hostel.objects.get(pk=self.room.pk).is_available)
+
+    def test_moving_a_booking_frees_the_old_room(self):
+        other_room = Hostel.objects.create(name="F-2", hostel_owner=self.owner)
+        booking = Booking.objects.create(room=self.room, name=self.student)
+        booking = Booking.objects.get(pk=booking.pk)
+        booking.room = other_room
+        booking.save()
+        self.assertTrue(Hostel.objects.get(pk=self.room.pk).is_available)
+        self.assertFalse(Hostel.objects.get(pk=other_room.pk).is_available)
+
+    def test_student_can_page_through_available_rooms(self):
+        for index in range(3):
+            Hostel.objects.create(name=f"G-{index}", hostel_owner=self.owner)
+        user = User.objects.create_user(username="avail_student", password="pass12345")
+        Registers.objects.create(user=user, first_name="A", Last_name="S", email_address="a@example.com", role="student")
+        Student.objects.create(user=user, name="A S", age=20, address="Campus", duration=6, gender="Male")
+        self.client.force_authenticate(user)
+
+        names = []
+        response = self.client.get("/api/student/bookings/", {"page_size": 3})
+        names.extend(room["name"] for room in response.data["hostels"])
+        response = self.client.get(response.data["hostels_next"])
+        names.extend(room["name"] for room in response.data["hostels"])
+        self.assertEqual(names, ["F-1", "G-0", "G-1", "G-2"])
+        self.assertIsNone(response.data["hostels_next"])
+
+
+class BookingConstraintTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = Hostel_owner.objects.create(name="Owner", address="Town", phone="1", location="Town")
+        self.room = Hostel.objects.create(name="H-1", hostel_owner=self.owner)
+
+    def _student_user(self, username):
+        user = User.objects.create_user(username=username, password="pass12345")
+        Registers.objects.create(user=user, first_name="B", Last_name="S", email_address="b@example.com", role="student")
+        student = Student.objects.create(user=user, name=username, age=20, address="Campus", duration=6, gender="Male")
+        return user, student
+
+    def test_booking_insert_checks_overlaps_only_without_exclusion_constraints(self):
+        user, _ = self._student_user("constraint_one")
+        self.client.force_authenticate(user)
+        self.client.get("/api/me/")  # warm the role cache
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post("/api/student/bookings/", {"hostel_id": self.room.id}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        booking_selects = [
+            query["sql"] for query in queries
+            if query["sql"].startswith("SELECT") and 'FROM "management_booking"' in query["sql"]
+        ]
+        if connection.vendor == "postgresql":
+            self.assertEqual(booking_selects, [])
+        else:
+            # One indexed range probe for the student and one for the room.
+            self.assertEqual(len(booking_selects), 2)
+            self.assertTrue(all('"end_date" >' in sql for sql in booking_selects))
+
+    def test_conflicts_map_to_existing_messages(self):
+        first_user, _ = self._student_user("constraint_first")
+        second_user, _ = self._student_user("constraint_second")
+        other_room = Hostel.objects.create(name="H-2", hostel_owner=self.owner)
+
+        self.client.force_authenticate(first_user)
+        self.client.post("/api/student/bookings/", {"hostel_id": self.room.id}, format="json")
+        again = self.client.post("/api/student/bookings/", {"hostel_id": other_room.id}, format="json")
+        self.assertEqual(again.data["message"], "You already have a booking")
+
+        self.client.force_authenticate(second_user)
+        taken = self.client.post("/api/student/bookings/", {"hostel_id": self.room.id}, format="json")
+        self.assertEqual(taken.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(taken.data["message"], "This room is already booked")
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_model_validation_reports_constraint_messages(self):
+        _, student = self._student_user("constraint_model")
+        _, other = self._student_user("constraint_model_other")
+        Booking.objects.create(room=self.room, name=student)
+        with self.assertRaisesMessage(ValidationError, "This room is already booked."):
+            Booking.objects.create(room=self.room, name=other)
+
+
+class BookingPeriodTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = Hostel_owner.objects.create(name="Owner", address="Town", phone="1", location="Town")
+        self.room = Hostel.objects.create(name="P-1", hostel_owner=self.owner)
+        self.other_room = Hostel.objects.create(name="P-2", hostel_owner=self.owner)
+        self.user = User.objects.create_user(username="period_student", password="pass12345")
+        Registers.objects.create(
+            user=self.user, first_name="P", Last_name="S", email_address="p@example.com", role="student"
+        )
+        self.student = Student.objects.create(
+            user=self.user, name="Period", age=20, address="Campus", duration=6, gender="Male"
+        )
+        self.rival = Student.objects.create(name="Rival", age=21, address="Campus", duration=3, gender="Female")
+        self.today = date.today()
+
+    def test_months_after_clamps_to_month_end(self):
+        self.assertEqual(months_after(date(2026, 8, 31), 6), date(2027, 2, 28))
+        self.assertEqual(months_after(date(2026, 1, 15), 12), date(2027, 1, 15))
+
+    def test_end_date_defaults_to_student_duration(self):
+        booking = Booking.objects.create(room=self.room, name=self.student)
+        self.assertEqual(booking.start_date, self.today)
+        self.assertEqual(booking.end_date, months_after(self.today, 6))
+
+    def test_room_can_be_booked_again_after_a_stay_ends(self):
+        first = Booking.objects.create(room=self.room, name=self.rival)
+        follow_on = Booking.objects.create(room=self.room, name=self.student, start_date=first.end_date)
+        self.assertEqual(Booking.objects.filter(room=self.room).count(), 2)
+        with self.assertRaisesMessage(ValidationError, "This room is already booked."):
+            Booking.objects.create(
+                room=self.room,
+                name=self.student,
+                start_date=follow_on.start_date - timedelta(days=1),
+                end_date=follow_on.start_date,
+            )
+        with self.assertRaisesMessage(ValidationError, "A student can only make one booking at a time."):
+            Booking.objects.create(room=self.other_room, name=self.student, start_date=follow_on.end_date - timedelta(days=1))
+
+    def test_api_books_a_later_term_and_rejects_overlaps(self):
+        self.client.force_authenticate(self.user)
+        later = self.today + timedelta(days=200)
+        booked = self.client.post(
+            "/api/student/bookings/", {"hostel_id": self.room.id, "start_date": later.isoformat()}, format="json"
+        )
+        self.assertEqual(booked.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(booked.data["booking"]["end_date"], months_after(later, 6))
+
+        now = self.client.post(
+            "/api/student/bookings/",
+            {"hostel_id": self.room.id, "end_date": (later - timedelta(days=1)).isoformat()},
+            format="json",
+        )
+        self.assertEqual(now.status_code, status.HTTP_201_CREATED)
+        clash = self.client.post(
+            "/api/student/bookings/",
+            {"hostel_id": self.other_room.id, "start_date": later.isoformat()},
+            format="json",
+        )
+        self.assertEqual(clash.data["message"], "You already have a booking")
+        past = self.client.post(
+            "/api/student/bookings/",
+            {"hostel_id": self.other_room.id, "start_date": "2000-01-01"},
+            format="json",
+        )
+        self.assertEqual(past.data["message"], "start_date cannot be in the past")
+
+    def test_generic_booking_writes_are_locked_and_checked_for_overlaps(self):
+        stay = {"start_date": self.today.isoformat(), "end_date": (self.today + timedelta(days=30)).isoformat()}
+        with mock.patch.object(Booking, "lock_for_write", wraps=Booking.lock_for_write) as lock:
+            created = self.client.post("/api/bookings/", {"room": self.room.id, "name": self.student.id, **stay}, format="json")
+            clash = self.client.post("/api/bookings/", {"room": self.room.id, "name": self.rival.id, **stay}, format="json")
+        self.assertEqual(created.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(clash.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(clash.data["non_field_errors"], ["This room is already booked."])
+        self.assertEqual(lock.call_count, 2)
+
+        moved = self.client.patch(f"/api/bookings/{created.data['id']}/", {"room": self.other_room.id}, format="json")
+        self.assertEqual(moved.status_code, status.HTTP_200_OK)
+        self.assertEqual(Booking.objects.get().room, self.other_room)
+
+    def test_bulk_booking_create_rejects_overlaps_within_the_batch(self):
+        stay = {"start_date": self.today.isoformat(), "end_date": (self.today + timedelta(days=30)).isoformat()}
+        later = {"start_date": stay["end_date"], "end_date": (self.today + timedelta(days=60)).isoformat()}
+        payload = [
+            {"room": self.room.id, "name": self.student.id, **stay},
+            {"room": self.room.id, "name": self.rival.id, **later},
+            {"room": self.other_room.id, "name": self.student.id, **stay},
+        ]
+        self.client.force_authenticate(User.objects.create_user(username="period_staff", password="x", is_staff=True))
+        response = self.client.post("/api/bookings/", payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["errors"],
+            [{"index": 2, "errors": {"non_field_errors": ["A student can only make one booking at a time."]}}],
+        )
+        self.assertFalse(Booking.objects.exists())
+
+        created = self.client.post("/api/bookings/", payload[:2], format="json")
+        self.assertEqual(created.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Booking.objects.count(), 2)
+
+    def test_free_between_dates(self):
+        Booking.objects.create(
+            room=self.room, name=self.rival, start_date=self.today + timedelta(days=10), end_date=self.today + timedelta(days=20)
+        )
+        self.client.force_authenticate(self.user)
+
+        def free(start, end):
+            response = self.client.get(
+                "/api/hostels/free/", {"start_date": start.isoformat(), "end_date": end.isoformat()}
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return [row["id"] for row in response.data["results"]]
+
+        self.assertEqual(free(self.today, self.today + timedelta(days=10)), [self.room.id, self.other_room.id])
+        self.assertEqual(free(self.today + timedelta(days=19), self.today + timedelta(days=30)), [self.other_room.id])
+        missing = self.client.get("/api/hostels/free/", {"start_date": self.today.isoformat()})
+        self.assertEqual(missing.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_ended_bookings_release_rooms(self):
+        Booking.objects.create(room=self.room, name=self.rival)
+        self.room.refresh_from_db()
+        self.assertFalse(self.room.is_available)
+
+        out = StringIO()
+        call_command("refresh_availability", "--date", months_after(self.today, 3).isoformat(), stdout=out)
+        self.assertIn("Released 1 room(s).", out.getvalue())
+        self.room.refresh_from_db()
+        self.assertTrue(self.room.is_available)
+
+    def test_first_request_of_a_day_releases_ended_stays(self):
+        Booking.objects.create(
+            room=self.room, name=self.rival, start_date=self.today - timedelta(days=30), end_date=self.today
+        )
+        # As left by a stay that ended overnight, without any write.
+        Hostel.objects.filter(pk=self.room.pk).update(is_available=False)
+        with mock.patch.object(availability, "_released_on", None):
+            self.client.get("/api/hostels/")
+            self.assertTrue(Hostel.objects.get(pk=self.room.pk).is_available)
+
+            Hostel.objects.filter(pk=self.room.pk).update(is_available=False)
+            self.client.get("/api/hostels/")
+            # Released once per day only.
+            self.assertFalse(Hostel.objects.get(pk=self.room.pk).is_available)
+
+
+class AsyncEndpointTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner_user = User.objects.create_user(username="async_owner", password="pass12345")
+        Registers.objects.create(
+            user=self.owner_user, first_name="A", Last_name="O", email_address="ao@example.com", role="hostel_owner"
+        )
+        self.owner = Hostel_owner.objects.create(user=self.owner_user, name="A O", address="T", phone="1", location="T")
+        self.room = Hostel.objects.create(name="Async-1", hostel_owner=self.owner)
+        self.student_user = User.objects.create_user(username="async_student", password="pass12345")
+        Registers.objects.create(
+            user=self.student_user, first_name="A", Last_name="S", email_address="as@example.com", role="student"
+        )
+        Student.objects.create(user=self.student_user, name="A S", age=20, address="Campus", duration=6, gender="Male")
+
+    def test_async_student_payload_matches_sync_view(self):
+        self.client.force_authenticate(self.student_user)
+        sync_response = self.client.get("/api/student/bookings/", HTTP_ACCEPT="application/json")
+        self.client.force_authenticate(None)
+        self.client.force_login(self.student_user)
+        async_response = self.client.get("/api/async/student/bookings/")
+        self.assertEqual(async_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(async_response.content, sync_response.content)
+
+        cached = self.client.get("/api/async/student/bookings/", HTTP_IF_NONE_MATCH=async_response["ETag"])
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_async_booking_and_owner_listing(self):
+        self.client.force_login(self.student_user)
+        booked = self.client.post("/api/async/student/bookings/", {"hostel_id": self.room.id}, format="json")
+        self.assertEqual(booked.status_code, status.HTTP_201_CREATED)
+        again = self.client.post("/api/async/student/bookings/", {"hostel_id": self.room.id}, format="json")
+        self.assertEqual(again.json()["message"], "You already have a booking")
+
+        self.client.force_login(self.owner_user)
+        listing = self.client.get("/api/async/owner/rooms/").json()
+        self.assertEqual([room["name"] for room in listing["rooms"]], ["Async-1"])
+        self.assertEqual(listing["bookings"][0]["student_name"], "A S")
+
+    def test_async_endpoints_accept_bearer_tokens_and_gate_roles(self):
+        token = AccessToken.for_user(self.owner_user)
+        me = self.client.get("/api/async/me/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(me.json()["role"], "hostel_owner")
+        forbidden = self.client.get("/api/async/student/bookings/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(forbidden.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.client.get("/api/async/me/", HTTP_AUTHORIZATION="Bearer nope").status_code, 401)
+        self.assertEqual(self.client.get("/api/async/me/").status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class RequestTimingMiddlewareTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        Student.objects.create(name="Timed", age=20, address="Campus", duration=6, gender="Male")
+
+    def test_server_timing_header_and_log_line_are_tagged_by_model(self):
+        with self.assertLogs("BackEnd.management.middleware", level="INFO") as logs:
+            response = self.client.get("/api/students/")
+        self.assertRegex(response["Server-Timing"], r'^db;dur=[\d.]+;desc="1 queries", view;dur=[\d.]+, render;dur=')
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(record["view"], "generic_api:student")
+        self.assertEqual(record["queries"], 1)
+        self.assertEqual(record["status"], 200)
+        self.assertGreater(record["render_ms"], 0)
+
+    @override_settings(REQUEST_TIMING_SLOW_MS=0)
+    def test_slow_requests_are_logged_with_their_sql(self):
+        with self.assertLogs("BackEnd.management.middleware", level="WARNING") as logs:
+            self.client.get("/api/students/")
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertIn("management_student", record["sql"][0]["sql"])
+
+    def test_api_view_functions_are_tagged_with_their_own_name(self):
+        for url, tag in (
+            ("/api/me/", "BackEnd.management.views.current_user"),
+            ("/api/async/me/", "BackEnd.management.async_views.current_user"),
+        ):
+            with self.assertLogs("BackEnd.management.middleware", level="INFO") as logs:
+                self.client.get(url)
+            self.assertEqual(json.loads(logs.records[-1].getMessage())["view"], tag)
+
+
+class SyntheticDataCommandTests(APITestCase):
+    def generate(self, **options):
+        call_command("generate_synthetic_data", stdout=StringIO(), **options)
+
+    def test_generates_consistent_rows(self):
+        self.generate(students=30, owners=4, rooms=20, bookings=12, batch_size=7)
+        self.assertEqual(Student.objects.filter(user__registers__role="student").count(), 30)
+        self.assertEqual(Hostel_owner.objects.filter(user__registers__role="hostel_owner").count(), 4)
+        self.assertEqual(Hostel.objects.count(), 20)
+        self.assertEqual(Booking.objects.count(), 12)
+        self.assertEqual(Hostel.objects.filter(is_available=False, booking__isnull=False).count(), 12)
+        self.assertEqual(Hostel.objects.filter(is_available=True, booking__isnull=True).count(), 8)
+        self.assertTrue(User.objects.get(username="synthetic_student_0").check_password("synthetic-pass"))
+
+    def test_same_seed_gives_the_same_bookings(self):
+        self.generate(students=10, owners=2, rooms=10, seed=7)
+        first = list(Booking.objects.order_by("room__name").values_list("name__name", "room__name"))
+        Booking.objects.all().delete()
+        Hostel.objects.all().delete()
+        self.generate(students=10, owners=2, rooms=10, seed=7, prefix="again")
+        second = list(
+            Booking.objects.filter(name__user__username__startswith="again_")
+            .order_by("room__name")
+            .values_list("name__name", "room__name")
+        )
+        self.assertEqual(first, second)
+
+    def test_rejects_reused_prefix_and_impossible_bookings(self):
+        self.generate(students=2, owners=1, rooms=2)
+        with self.assertRaises(CommandError):
+            self.generate(students=2, owners=1, rooms=2)
+        with self.assertRaises(CommandError):
+            self.generate(students=2, owners=1, rooms=5, bookings=3, prefix="other")
+
+
+class RowMapperTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        owner = Hostel_owner.objects.create(name="Owner", address="Town", phone="1", location="Town")
+        student = Student.objects.create(name="Reader", age=21, address="Campus", duration=6, gender="Female")
+        self.room = Hostel.objects.create(name="Room A", hostel_owner=owner)
+        Hostel.objects.create(name="Room B", hostel_owner=owner)
+        Booking.objects.create(room=self.room, name=student)
+
+    def test_generic_lists_render_the_same_bytes_as_the_serializers(self):
+        renderer = JSONRenderer()
+        for url, model, serializer_class in (
+            ("/api/bookings/", Booking, BookingSerializer),
+            ("/api/hostels/", Hostel, HostelSerializer),
+            ("/api/students/", Student, StudentSerializer),
+        ):
+            response = self.client.get(url)
+            expected = serializer_class(model.objects.order_by("id"), many=True).data
+            self.assertEqual(renderer.render(response.data["results"]), renderer.render(expected))
+
+    def test_sparse_fieldsets_still_apply(self):
+        response = self.client.get("/api/bookings/?fields=booking_date,room")
+        self.assertEqual(
+            response.json()["results"],
+            [{"room": self.room.id, "booking_date": Booking.objects.get().booking_date.isoformat()}],
+        )
+
+
+class StreamingResponseTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(username="streamer", password="pass12345")
+        Registers.objects.create(user=user, first_name="S", Last_name="T", email_address="s@example.com", role="hostel_owner")
+        owner = Hostel_owner.objects.create(user=user, name="Streamer", address="Town", phone="1", location="Town")
+        student = Student.objects.create(name="Guest", age=20, address="Campus", duration=6, gender="Male")
+        rooms = Hostel.objects.bulk_create([Hostel(name=f"Room {index}", hostel_owner=owner) for index in range(7)])
+        Booking.objects.create(room=rooms[0], name=student)
+        self.client.force_authenticate(user)
+
+    @override_settings(API_STREAM_CHUNK_SIZE=3)
+    def test_generic_list_streams_every_row_in_chunks(self):
+        response = self.client.get("/api/hostels/?stream=1&fields=id,name")
+        self.assertTrue(response.streaming)
+        self.assertIn("ETag", response)
+        chunks = list(response.streaming_content)
+        self.assertGreater(len(chunks), 3)
+        rows = json.loads(b"".join(chunks))
+        self.assertEqual([row["name"] for row in rows], [f"Room {index}" for index in range(7)])
+        self.assertEqual(set(rows[0]), {"id", "name"})
+
+    @override_settings(API_STREAM_CHUNK_SIZE=2)
+    def test_streamed_owner_rooms_match_the_buffered_bytes(self):
+        buffered = self.client.get("/api/owner/rooms/")
+        streamed = self.client.get("/api/owner/rooms/?stream=1")
+        self.assertEqual(b"".join(streamed.streaming_content), buffered.content)
+        self.assertEqual(streamed["Cache-Control"], buffered["Cache-Control"])
+
+    @override_settings(API_STREAM_CHUNK_SIZE=2)
+    async def test_asgi_requests_get_an_async_stream(self):
+        response = await self.async_client.get("/api/hostels/?stream=1")
+        self.assertTrue(response.is_async)
+        body = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(len(json.loads(body)), 7)
+
+
+class AvailableHostelsCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        owner = Hostel_owner.objects.create(name="Owner", address="Town", phone="1", location="Town")
+        self.rooms = [Hostel.objects.create(name=f"Room {index}", hostel_owner=owner) for index in range(3)]
+        self.students = []
+        for index in range(2):
+            user = User.objects.create_user(username=f"cached_{index}", password="pass12345")
+            Registers.objects.create(user=user, first_name="C", Last_name="S", email_address="c@example.com", role="student")
+            self.students.append(
+                (user, Student.objects.create(user=user, name=f"Cached {index}", age=20, address="Campus", duration=6, gender="Male"))
+            )
+
+    def listing(self, user):
+        self.client.force_authenticate(user)
+        response = self.client.get("/api/student/bookings/")
+        return response, [hostel["name"] for hostel in response.json()["hostels"]]
+
+    def test_students_share_one_cached_listing(self):
+        first, names = self.listing(self.students[0][0])
+        self.assertIn('listing;desc="miss"', first["Server-Timing"])
+        with self.assertNumQueries(3):
+            second, second_names = self.listing(self.students[1][0])
+        self.assertRegex(second["Server-Timing"], r'listing;desc="hit age=[\d.]+s"')
+        self.assertEqual(names, second_names)
+        self.assertEqual(second.json()["student"]["name"], "Cached 1")
+
+    def test_writes_move_readers_to_a_new_version(self):
+        self.listing(self.students[0][0])
+        Booking.objects.create(room=self.rooms[0], name=self.students[0][1])
+        response, names = self.listing(self.students[1][0])
+        self.assertIn('listing;desc="miss"', response["Server-Timing"])
+        self.assertEqual(names, ["Room 1", "Room 2"])
+
+        Hostel.objects.filter(pk=self.rooms[1].pk).update(name="Renamed")
+        rows_changed(Hostel, [self.rooms[1]])
+        self.assertEqual(self.listing(self.students[1][0])[1], ["Renamed", "Room 2"])
+
+
+class OwnerDashboardTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="dashboard", password="pass12345")
+        Registers.objects.create(user=self.user, first_name="D", Last_name="O", email_address="d@example.com", role="hostel_owner")
+        owner = Hostel_owner.objects.create(user=self.user, name="Dash", address="Town", phone="1", location="Town")
+        self.rooms = [Hostel.objects.create(name=f"Dash {index}", hostel_owner=owner) for index in range(5)]
+        for index in range(2):
+            student = Student.objects.create(name=f"Tenant {index}", age=20, address="Campus", duration=6, gender="Male")
+            Booking.objects.create(room=self.rooms[index], name=student)
+        self.client.force_authenticate(self.user)
+
+    def test_summary_counts_rooms_and_term_bookings(self):
+        summary = self.client.get("/api/owner/rooms/").json()["summary"]
+        self.assertEqual(
+            {key: summary[key] for key in ("total_rooms", "occupied_rooms", "free_rooms", "term_bookings")},
+            {"total_rooms": 5, "occupied_rooms": 2, "free_rooms": 3, "term_bookings": 2},
+        )
+
+    def test_summary_only_skips_the_lists(self):
+        self.client.get("/api/owner/rooms/?summary_only=1")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/owner/rooms/?summary_only=1&poll=2")
+        self.assertEqual(set(response.json()), {"owner", "summary"})
+        sql = [query["sql"] for query in queries.captured_queries]
+        self.assertEqual(sum('FROM "management_hostel" ' in statement for statement in sql), 1)
+        self.assertFalse(any('FROM "management_booking"' in statement for statement in sql))
+
+    def test_rooms_and_bookings_page_independently(self):
+        first = self.client.get("/api/owner/rooms/?page_size=2").json()
+        self.assertEqual([room["name"] for room in first["rooms"]], ["Dash 4", "Dash 3"])
+        self.assertEqual(len(first["bookings"]), 2)
+        self.assertIsNone(first["bookings_next"])
+
+        second = self.client.get(first["rooms_next"]).json()
+        self.assertEqual([room["name"] for room in second["rooms"]], ["Dash 2", "Dash 1"])
+        self.assertEqual(second["summary"]["total_rooms"], 5)
+
+    def test_term_start_picks_the_latest_started_term(self):
+        import datetime
+
+        from .views import term_start
+
+        with override_settings(TERM_START_MONTHS=[1, 9]):
+            self.assertEqual(term_start(datetime.date(2026, 10, 18)), datetime.date(2026, 9, 1))
+            self.assertEqual(term_start(datetime.date(2026, 3, 2)), datetime.date(2026, 1, 1))
+        with override_settings(TERM_START_MONTHS=[9]):
+            self.assertEqual(term_start(datetime.date(2026, 3, 2)), datetime.date(2025, 9, 1))
+
+    def test_async_dashboard_matches_sync_view(self):
+        self.client.force_authenticate(None)
+        self.client.force_login(self.user)
+        for query in ("", "?summary_only=1", "?page_size=2"):
+            sync_response = self.client.get(f"/api/owner/rooms/{query}", HTTP_ACCEPT="application/json")
+            async_response = self.client.get(f"/api/async/owner/rooms/{query}")
+            self.assertEqual(
+                json.loads(async_response.content.replace(b"/async", b"")), json.loads(sync_response.content)
+            )
+
+
+class QueryPlanTests(APITestCase):
+    """Fail when a hot endpoint's query has to read a large table end to end."""
+
+    LARGE_TABLES = {
+        "auth_user",
+        "management_booking",
+        "management_hostel",
+        "management_hostel_owner",
+        "management_registers",
+        "management_student",
+    }
+
+    def setUp(self):
+        cache.clear()
+        self.owner_user = User.objects.create_user(username="plan_owner", email="po@example.com", password="pass12345")
+        Registers.objects.create(user=self.owner_user, first_name="P", Last_name="O", email_address="po@example.com", role="hostel_owner")
+        owner = Hostel_owner.objects.create(user=self.owner_user, name="Plan", address="Town", phone="1", location="Town")
+        rooms = [Hostel.objects.create(name=f"Plan {index}", hostel_owner=owner) for index in range(3)]
+        self.free_room = rooms[1]
+        self.students = []
+        for index in range(2):
+            user = User.objects.create_user(username=f"plan_student_{index}", email=f"ps{index}@example.com", password="pass12345")
+            Registers.objects.create(user=user, first_name="P", Last_name="S", email_address=user.email, role="student")
+            self.students.append(
+                (user, Student.objects.create(user=user, name=f"Plan {index}", age=20, address="Campus", duration=6, gender="Male"))
+            )
+        Booking.objects.create(room=rooms[0], name=self.students[0][1])
+
+    def _sequential_scans(self, sql):
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                # Test tables are tiny, so ask whether an index *could* serve
+                # the query rather than whether the planner prefers one.
+                cursor.execute("SET enable_seqscan = off")
+                try:
+                    cursor.execute(f"EXPLAIN {sql}")
+                    plan = [row[0] for row in cursor.fetchall()]
+                finally:
+                    cursor.execute("RESET enable_seqscan")
+                pattern = r"Seq Scan on (\w+)"
+            else:
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                plan = [row[-1] for row in cursor.fetchall()]
+                pattern = r"^SCAN (?:TABLE )?(\w+)$"
+        return [match.group(1) for line in plan if (match := re.search(pattern, line.strip()))]
+
+    def test_hot_queries_use_indexes(self):
+        with CaptureQueriesContext(connection) as queries:
+            for user, _ in self.students:
+                self.client.force_authenticate(user)
+                self.client.get("/api/student/bookings/")
+                self.client.get("/api/student/bookings/?page_size=2")
+            self.client.post("/api/student/bookings/", {"hostel_id": self.free_room.id}, format="json")
+            self.client.force_authenticate(self.owner_user)
+            for query in ("", "?summary_only=1", "?page_size=2"):
+                self.client.get(f"/api/owner/rooms/{query}")
+            self.client.force_authenticate(None)
+            self.client.post(
+                "/api/register/",
+                {
+                    "first_name": "New",
+                    "last_name": "Student",
+                    "email": "plan_new@example.com",
+                    "username": "plan_new",
+                    "role": "student",
+                    "password": "pass12345",
+                    "confirm_password": "pass12345",
+                },
+                format="json",
+            )
+            self.client.post("/api/login/", {"username": "plan_new", "password": "pass12345"}, format="json")
+
+        selects = [query["sql"] for query in queries.captured_queries if query["sql"].startswith("SELECT")]
+        self.assertGreater(len(selects), 10)
+        for sql in selects:
+            scanned = self.LARGE_TABLES.intersection(self._sequential_scans(sql))
+            self.assertFalse(scanned, f"sequential scan on {sorted(scanned)}: {sql}")
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"], USER_IMPORT_WORKERS=0)
+class UserImportTests(APITestCase):
+    CSV = (
+        "first_name,last_name,email,username,role,password,age,duration,phone\n"
+        "Ada,One,ada@example.com,ada,student,pass12345,20,6,\n"
+        "Bob,Two,bob@example.com,bob,hostel_owner,pass12345,,,0711\n"
+        "Cy,Three,not-an-email,cy,student,pass12345,20,6,\n"
+        "Di,Four,ada@example.com,di,student,pass12345,20,6,\n"
+    )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_command_imports_valid_rows_and_reports_the_rest(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as handle:
+            handle.write(self.CSV)
+        self.addCleanup(os.remove, handle.name)
+        out = StringIO()
+        call_command("import_users", handle.name, "--batch-size", "2", "--workers", "2", stdout=out, stderr=StringIO())
+        report = json.loads(out.getvalue())
+
+        self.assertEqual((report["created"], report["failed"]), (2, 2))
+        self.assertEqual(
+            report["errors"],
+            [
+                {"row": 3, "errors": {"email": "Invalid email address"}},
+                {"row": 4, "errors": {"email": "Email already registered"}},
+            ],
+        )
+        ada = User.objects.get(username="ada")
+        self.assertTrue(ada.check_password("pass12345"))
+        self.assertEqual((ada.registers.role, ada.student.duration), ("student", 6))
+        self.assertEqual(User.objects.get(username="bob").hostel_owner.phone, "0711")
+        self.assertTrue(self.client.login(username="bob", password="pass12345"))
+
+    def test_endpoint_is_admin_only_and_streams_ndjson(self):
+        body = "\n".join(
+            [
+                json.dumps({"first_name": "Eve", "last_name": "Five", "email": "eve@example.com", "username": "eve", "role": "student", "password": "pw"}),
+                "not json",
+            ]
+        )
+        self.client.force_authenticate(User.objects.create_user(username="clerk", password="x"))
+        denied = self.client.post("/api/admin/import-users/", body, content_type="application/x-ndjson")
+        self.assertEqual(denied.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(User.objects.create_user(username="registrar", password="x", is_staff=True))
+        response = self.client.post("/api/admin/import-users/", body, content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(response.data["errors"], [{"row": 2, "errors": {"row": "Invalid JSON"}}])
+        self.assertEqual(Student.objects.get(user__username="eve").name, "Eve Five")
+
+        unsupported = self.client.post("/api/admin/import-users/", body, content_type="text/plain")
+        self.assertEqual(unsupported.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+    def test_database_without_bulk_insert_ids_is_refused_up_front(self):
+        self.client.force_authenticate(User.objects.create_user(username="registrar", password="x", is_staff=True))
+        with mock.patch.object(type(connection.features), "can_return_rows_from_bulk_insert", False):
+            response = self.client.post("/api/admin/import-users/", self.CSV, content_type="text/csv")
+            with self.assertRaisesMessage(CommandError, "not supported"):
+                call_command("import_users", "-", "--format", "csv", stdout=StringIO())
+        self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+        self.assertIn("not supported", response.data["message"])
+        self.assertFalse(User.objects.filter(username="ada").exists())
+
+
+class TokenClaimsTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="claims_user", password="pass12345", email="claims@example.com")
+        self.register = Registers.objects.create(
+            user=self.user, first_name="Claims", Last_name="User", email_address="claims@example.com", role="student"
+        )
+        Student.objects.create(user=self.user, name="Claims User", age=20, address="Campus", duration=6, gender="Male")
+        login = self.client.post("/api/login/", {"username": "claims_user", "password": "pass12345"}, format="json")
+        self.access, self.refresh = login.data["access"], login.data["refresh"]
+        self.client.logout()
+        cache.clear()
+
+    def test_me_is_answered_from_the_access_token(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/me/", HTTP_AUTHORIZATION=f"Bearer {self.access}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data["username"], response.data["role"]), ("claims_user", "student"))
+        self.assertEqual(response.data["email"], "claims@example.com")
+        self.assertEqual(len(queries), 0)
+
+        async_me = self.client.get("/api/async/me/", HTTP_AUTHORIZATION=f"Bearer {self.access}")
+        self.assertEqual(async_me.json(), dict(response.data))
+
+    def test_role_gate_skips_user_and_role_lookups(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/student/bookings/", HTTP_AUTHORIZATION=f"Bearer {self.access}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        tables = " ".join(query["sql"] for query in queries.captured_queries)
+        self.assertNotIn('"auth_user"', tables)
+        self.assertNotIn('"management_registers"', tables)
+
+    def test_refresh_reissues_claims_from_the_database(self):
+        self.register.role = "hostel_owner"
+        self.register.save()
+        response = self.client.post("/api/token/refresh/", {"refresh": self.refresh}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(AccessToken(response.data["access"])["role"], "hostel_owner")
+
+        bad = self.client.post("/api/token/refresh/", {"refresh": self.access}, format="json")
+        self.assertEqual(bad.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(bad.data["message"], "Invalid or expired refresh token")
+
+
+class RevokedTokenTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="revoked_user", password="pass12345")
+        Registers.objects.create(user=self.user, first_name="Revoked", Last_name="User", role="student")
+        login = self.client.post("/api/login/", {"username": "revoked_user", "password": "pass12345"}, format="json")
+        self.auth = f"Bearer {login.data['access']}"
+        self.client.logout()
+
+    def assertTokenRejected(self):
+        for path in ("/api/me/", "/api/async/me/"):
+            response = self.client.get(path, HTTP_AUTHORIZATION=self.auth)
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED, path)
+
+    def test_deactivated_user_token_is_rejected(self):
+        self.assertEqual(self.client.get("/api/me/", HTTP_AUTHORIZATION=self.auth).status_code, status.HTTP_200_OK)
+        self.user.is_active = False
+        self.user.save()
+        self.assertTokenRejected()
+
+    def test_deleted_user_token_is_rejected(self):
+        self.user.delete()
+        self.assertTokenRejected()
+
+    def test_unshared_cache_checks_the_database(self):
+        # A revocation recorded by another worker would not be seen here.
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        with self.settings(CACHE_SHARED=False):
+            self.assertTokenRejected()
+            User.objects.filter(pk=self.user.pk).delete()
+            self.assertTokenRejected()
+
+    def test_async_views_read_revocations_from_a_database_cache(self):
+        database_cache = {"default": {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "test_cache"}}
+        with self.settings(CACHES=database_cache):
+            call_command("createcachetable", verbosity=0)
+            response = self.client.get("/api/async/me/", HTTP_AUTHORIZATION=self.auth)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.user.is_active = False
+            self.user.save()
+            self.assertTokenRejected()
+
+
+@override_settings(SESSION_ENGINE="django.contrib.sessions.backends.cached_db")
+class SessionAuthenticationCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="session_user", password="pass12345")
+        Registers.objects.create(
+            user=self.user, first_name="Ses", Last_name="Sion", email_address="ses@example.com", role="student"
+        )
+        self.client.force_login(self.user)
+
+    def test_session_request_runs_no_queries_once_cached(self):
+        self.client.get("/api/me/")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/me/")
+        self.assertEqual(response.data["username"], "session_user")
+        self.assertEqual(len(queries), 0)
+
+    def test_cached_user_is_dropped_when_the_user_changes(self):
+        self.client.get("/api/me/")
+        self.user.first_name = "Renamed"
+        self.user.save()
+        self.assertEqual(self.client.get("/api/me/").data["first_name"], "Renamed")
+
+        self.user.set_password("changed-pass")
+        self.user.save()
+        # The session auth hash no longer matches, so the session is dropped.
+        self.assertEqual(self.client.get("/api/me/").status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_unshared_cache_loads_users_from_the_database(self):
+        self.client.get("/api/me/")
+        with self.settings(CACHE_SHARED=False), CaptureQueriesContext(connection) as queries:
+            self.client.get("/api/me/")
+        self.assertIn('"auth_user"', " ".join(query["sql"] for query in queries.captured_queries))
+
+    def test_sessions_started_with_model_backend_stay_logged_in(self):
+        self.client.force_login(self.user, backend="django.contrib.auth.backends.ModelBackend")
+        self.assertEqual(self.client.get("/api/me/").data["username"], "session_user")
+
+    def test_cache_sessions_need_a_shared_cache(self):
+        self.assertEqual(default_session_engine(True), "django.contrib.sessions.backends.cached_db")
+        self.assertEqual(default_session_engine(False), "django.contrib.sessions.backends.db")
+        check_session_engine("django.contrib.sessions.backends.db", shared=False)
+        check_session_engine("django.contrib.sessions.backends.cached_db", shared=True)
+        for engine in ("django.contrib.sessions.backends.cache", "django.contrib.sessions.backends.cached_db"):
+            with self.assertRaises(ImproperlyConfigured):
+                check_session_engine(engine, shared=False)
+
+
+class PurgeSessionsCommandTests(APITestCase):
+    def test_expired_sessions_are_deleted_in_batches(self):
+        now = timezone.now()
+        Session.objects.bulk_create(
+            [Session(session_key=f"expired{index}", session_data="", expire_date=now - timedelta(days=1)) for index in range(5)]
+            + [Session(session_key="live", session_data="", expire_date=now + timedelta(days=1))]
+        )
+        out = StringIO()
+        with override_settings(SESSION_ENGINE="django.contrib.sessions.backends.db"):
+            call_command("purge_sessions", "--batch-size", "2", stdout=out)
+        self.assertIn("Deleted 5 expired session(s) in 3 batch(es)", out.getvalue())
+        self.assertEqual(list(Session.objects.values_list("session_key", flat=True)), ["live"])
+
+
+class DatabaseConfigurationTests(APITestCase):
+    def test_persistent_connections_and_health_checks_come_from_the_environment(self):
+        with mock.patch.dict(os.environ, {"DB_CONN_HEALTH_CHECKS": "0", "DB_POOL": "1"}):
+            database = configure_database({"ENGINE": "django.db.backends.sqlite3"}, 600)
+        # The pool is PostgreSQL-only; other engines keep persistent connections.
+        self.assertEqual(
+            database,
+            {
+                "ENGINE": "django.db.backends.sqlite3",
+                "CONN_MAX_AGE": 600,
+                "CONN_HEALTH_CHECKS": False,
+                "OPTIONS": {"transaction_mode": "IMMEDIATE"},
+            },
+        )
+
+    def test_sqlite_needs_immediate_transactions(self):
+        check_transaction_modes({"default": configure_database({"ENGINE": "django.db.backends.sqlite3"})})
+        check_transaction_modes({"default": {"ENGINE": "django.db.backends.postgresql"}})
+        with self.assertRaisesMessage(ImproperlyConfigured, "IMMEDIATE"):
+            check_transaction_modes({"default": {"ENGINE": "django.db.backends.sqlite3"}})
+
+    def test_pool_replaces_persistent_connections(self):
+        try:
+            import psycopg_pool  # noqa: F401
+        except ImportError:
+            self.skipTest("psycopg-pool is not installed")
+        env = {"DB_POOL": "1", "DB_POOL_MAX_SIZE": "7", "DB_POOL_TIMEOUT": "2.5"}
+        with mock.patch.dict(os.environ, env):
+            database = configure_database({"ENGINE": "django.db.backends.postgresql"}, 600)
+        self.assertEqual(database["CONN_MAX_AGE"], 0)
+        self.assertEqual((database["OPTIONS"]["pool"]["max_size"], database["OPTIONS"]["pool"]["timeout"]), (7, 2.5))
+        self.assertTrue(database["CONN_HEALTH_CHECKS"])
+
+
+@override_settings(DATABASE_REPLICAS=["replica_0"], REPLICA_STICKY_SECONDS=30)
+class ReplicaRoutingTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.user = User.objects.create_user(username="replica_user", password="x")
+
+    def _serve(self, request, write=False):
+        def view(request):
+            if write:
+                router.db_for_write(Booking)
+            return JsonResponse({"read": router.db_for_read(Hostel)})
+
+        response = ReplicaRoutingMiddleware(view)(request)
+        return response, json.loads(response.content)["read"]
+
+    def test_safe_requests_read_from_the_replica_and_writes_from_the_primary(self):
+        self.assertEqual(self._serve(self.factory.get("/api/hostel/"))[1], "replica_0")
+        self.assertEqual(self._serve(self.factory.post("/api/hostel/"))[1], "default")
+        self.assertEqual(router.db_for_read(Hostel), "default")
+
+    def test_reads_after_a_write_stick_to_the_primary(self):
+        response, read = self._serve(self.factory.get("/api/hostel/"), write=True)
+        self.assertEqual(read, "default")
+        self.assertEqual(response.cookies[STICKY_COOKIE]["max-age"], 30)
+
+        request = self.factory.get("/api/hostel/")
+        request.COOKIES[STICKY_COOKIE] = "1"
+        self.assertEqual(self._serve(request)[1], "default")
+
+    def test_authenticated_writer_sticks_without_the_cookie(self):
+        writer = self.factory.post("/api/student/bookings/")
+        writer.user = self.user
+        self._serve(writer, write=True)
+
+        reader = self.factory.get("/api/student/bookings/")
+        reader.user = self.user
+        self.assertEqual(self._serve(reader)[1], "default")
+        other = self.factory.get("/api/student/bookings/")
+        other.user = User.objects.create_user(username="replica_other", password="x")
+        self.assertEqual(self._serve(other)[1], "replica_0")
+
+    def test_async_writer_sticks_without_the_cookie(self):
+        async def view(request):
+            router.db_for_write(Booking)
+            return JsonResponse({})
+
+        writer = self.factory.post("/api/async/student/bookings/")
+        writer.user = self.user
+        with mock.patch.object(cache, "aset", wraps=cache.aset) as aset:
+            async_to_sync(ReplicaRoutingMiddleware(view))(writer)
+        self.assertEqual(aset.call_args.args[0], sticky_key(self.user.id))
+        self.assertGreater(cache.get(sticky_key(self.user.id)), timezone.now().timestamp())
+
+
+@override_settings(
+    DATABASE_REPLICAS=["replica_test"],
+    REPLICA_STICKY_SECONDS=30,
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "replica_test_cache"}},
+)
+class ReplicaDatabaseTests(APITestCase):
+    """Requests against the test database plus a second SQLite file standing in for a lagging replica."""
+
+    ALIAS = "replica_test"
+
+    def setUp(self):
+        with tempfile.NamedTemporaryFile(suffix=".sqlite3", delete=False) as handle:
+            path = handle.name
+        self.addCleanup(os.remove, path)
+        connections.settings[self.ALIAS] = connections.configure_settings(
+            {DEFAULT_DB_ALIAS: {}, self.ALIAS: {"ENGINE": "django.db.backends.sqlite3", "NAME": path}}
+        )[self.ALIAS]
+        self.addCleanup(self._drop_replica)
+        # The alias did not exist when the class was set up; allow queries to it.
+        databases = mock.patch.object(type(self), "databases", {DEFAULT_DB_ALIAS, self.ALIAS})
+        databases.start()
+        self.addCleanup(databases.stop)
+        with connections[self.ALIAS].schema_editor() as editor:
+            editor.create_model(Hostel_owner)
+            editor.create_model(Hostel)
+        # Only the primary has the cache table, so a cache query sent to
+        # the replica would fail.
+        call_command("createcachetable", verbosity=0)
+        self.owner = Hostel_owner.objects.create(name="Owner", address="A", phone="1", location="Town")
+        Hostel.objects.create(name="Not replicated yet", hostel_owner=self.owner)
+
+    def _drop_replica(self):
+        connections[self.ALIAS].close()
+        del connections[self.ALIAS]
+        del connections.settings[self.ALIAS]
+
+    def _names(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [row["name"] for row in response.data["results"]]
+
+    def test_reads_come_from_the_replica_until_the_client_writes(self):
+        first = self.client.get("/api/hostels/")
+        self.assertEqual(self._names(first), [])
+        # Cache writes made while serving the GET do not make it sticky.
+        self.assertNotIn(STICKY_COOKIE, first.cookies)
+
+        created = self.client.post("/api/hostels/", {"name": "Mine", "hostel_owner": self.owner.id}, format="json")
+        self.assertEqual(created.status_code, status.HTTP_201_CREATED)
+        self.assertIn(STICKY_COOKIE, created.cookies)
+        self.assertEqual(self._names(self.client.get("/api/hostels/")), ["Not replicated yet", "Mine"])
+
+
+class HostelSearchTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        arusha = Hostel_owner.objects.create(name="Baraka Lodges", address="A", phone="1", location="Arusha")
+        dodoma = Hostel_owner.objects.create(name="Upendo Homes", address="D", phone="2", location="Dodoma")
+        self.exact = Hostel.objects.create(name="Kilimanjaro", hostel_owner=dodoma)
+        self.prefix = Hostel.objects.create(name="Kilimanjaro Annex", hostel_owner=dodoma)
+        self.inner = Hostel.objects.create(name="Block Kilimanjaro", hostel_owner=dodoma)
+        self.by_location = Hostel.objects.create(name="Room 1", hostel_owner=arusha)
+        self.booked = Hostel.objects.create(name="Room 2", hostel_owner=arusha)
+        self.booked.is_available = False
+        self.booked.save()
+        self.client.force_authenticate(User.objects.create_user(username="searcher", password="x"))
+
+    def _ids(self, response):
+        return [row["id"] for row in response.data["results"]]
+
+    def test_matches_are_ranked_exact_then_prefix_then_substring(self):
+        response = self.client.get("/api/hostels/search/", {"q": "kilimanjaro"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._ids(response), [self.exact.id, self.prefix.id, self.inner.id])
+        self.assertEqual(
+            response.data["results"][0],
+            {
+                "id": self.exact.id,
+                "name": "Kilimanjaro",
+                "owner_id": self.exact.hostel_owner_id,
+                "owner_name": "Upendo Homes",
+                "location": "Dodoma",
+                "is_available": True,
+            },
+        )
+
+    def test_owner_name_and_location_match_and_available_filter(self):
+        by_location = self.client.get("/api/hostels/search/", {"q": "arush"})
+        self.assertEqual(self._ids(by_location), [self.by_location.id, self.booked.id])
+        available = self.client.get("/api/hostels/search/", {"q": "arush", "available": "1"})
+        self.assertEqual(self._ids(available), [self.by_location.id])
+        by_owner = self.client.get("/api/hostels/search/", {"q": "lodges"})
+        self.assertEqual(self._ids(by_owner), [self.by_location.id, self.booked.id])
+
+    def test_pages_without_counting_and_rejects_short_terms(self):
+        first = self.client.get("/api/hostels/search/", {"q": "kilimanjaro", "page_size": 2})
+        self.assertEqual(len(first.data["results"]), 2)
+        self.assertIsNone(first.data["previous"])
+        second = self.client.get(first.data["next"])
+        self.assertEqual(self._ids(second), [self.inner.id])
+        self.assertIsNone(second.data["next"])
+
+        short = self.client.get("/api/hostels/search/", {"q": " ki "})
+        self.assertEqual(short.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(short.data["message"], "Search term must be at least 3 characters")
+
+    def test_owner_matches_are_a_subquery(self):
+        Hostel_owner.objects.bulk_create(
+            [Hostel_owner(name=f"Owner {index}", address="A", phone="1", location="Not provided") for index in range(1200)]
+        )
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/hostels/search/", {"q": "provided"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # One query with the owners as a subquery, not an id list of every owner.
+        self.assertEqual(len(queries), 1)
+        self.assertIn("IN (SELECT", queries[0]["sql"])
+
+
+class NearbyHostelsTests(APITestCase):
+    CAMPUS = (-6.163, 35.752)
+
+    def setUp(self):
+        cache.clear()
+        self.near = Hostel_owner.objects.create(
+            name="Near", address="A", phone="1", location="Dodoma", latitude=-6.170, longitude=35.760
+        )
+        self.nearer = Hostel_owner.objects.create(
+            name="Nearer", address="A", phone="1", location="Dodoma", latitude=-6.164, longitude=35.753
+        )
+        self.far = Hostel_owner.objects.create(
+            name="Far", address="A", phone="1", location="Arusha", latitude=-3.387, longitude=36.683
+        )
+        self.near_room = Hostel.objects.create(name="N1", hostel_owner=self.near)
+        self.nearer_rooms = [Hostel.objects.create(name=f"R{index}", hostel_owner=self.nearer) for index in range(2)]
+        Hostel.objects.create(name="F1", hostel_owner=self.far)
+        self.nearer_rooms[1].is_available = False
+        self.nearer_rooms[1].save()
+        self.client.force_authenticate(User.objects.create_user(username="mapper", password="x"))
+
+    def test_covering_ranges_contain_every_point_in_the_circle(self):
+        rng = random.Random(7)
+        for _ in range(200):
+            latitude, longitude = rng.uniform(-85, 85), rng.uniform(-180, 180)
+            radius_km = rng.choice([0.5, 5, 40])
+            ranges = covering_ranges(latitude, longitude, radius_km)
+            for _ in range(10):
+                point = (latitude + rng.uniform(-1, 1) * radius_km / 111, longitude + rng.uniform(-1, 1) * radius_km / 50)
+                if -90 <= point[0] <= 90 and -180 <= point[1] < 180 and distance_km(latitude, longitude, *point) <= radius_km:
+                    key = geocell(*point)
+                    self.assertTrue(any(low <= key < high for low, high in ranges), (latitude, longitude, radius_km, point))
+
+    def test_geocell_follows_coordinates(self):
+        self.assertEqual(self.near.geocell, geocell(-6.170, 35.760))
+        Hostel_owner.objects.filter(pk=self.near.pk).update(latitude=None)
+        self.near.refresh_from_db()
+        self.near.longitude = None
+        self.near.save(update_fields=["longitude"])
+        self.near.refresh_from_db()
+        self.assertIsNone(self.near.geocell)
+
+    def test_nearest_available_rooms_are_sorted_by_distance(self):
+        response = self.client.get("/api/hostels/nearby/", {"lat": self.CAMPUS[0], "lon": self.CAMPUS[1], "radius_km": 10})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([room["id"] for room in response.data["results"]], [self.nearer_rooms[0].id, self.near_room.id])
+        self.assertEqual(response.data["results"][1]["owner_name"], "Near")
+        self.assertLess(response.data["results"][0]["distance_km"], response.data["results"][1]["distance_km"])
+
+        limited = self.client.get("/api/hostels/nearby/", {"lat": self.CAMPUS[0], "lon": self.CAMPUS[1], "limit": 1})
+        self.assertEqual([room["id"] for room in limited.data["results"]], [self.nearer_rooms[0].id])
+        bad = self.client.get("/api/hostels/nearby/", {"lat": 95, "lon": 0})
+        self.assertEqual(bad.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_owner_registration_accepts_coordinates(self):
+        payload = {
+            "first_name": "Map",
+            "last_name": "Owner",
+            "email": "map@example.com",
+            "username": "map_owner",
+            "role": "hostel_owner",
+            "password": "pass12345",
+            "confirm_password": "pass12345",
+            "latitude": "-6.2",
+            "longitude": "35.8",
+        }
+        self.assertEqual(self.client.post("/api/register/", payload, format="json").status_code, status.HTTP_201_CREATED)
+        owner = Hostel_owner.objects.get(user__username="map_owner")
+        self.assertEqual(owner.geocell, geocell(-6.2, 35.8))
+
+        payload.update(username="map_owner_2", email="map2@example.com", longitude="")
+        response = self.client.post("/api/register/", payload, format="json")
+        self.assertEqual(response.data["errors"]["location"], "Give both latitude and longitude, or neither")
+
+
+@override_settings(EVENT_STREAM_HEARTBEAT_SECONDS=0.2)
+class RoomEventsTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = Hostel_owner.objects.create(name="Live", address="Town", phone="1", location="Town")
+        self.other_owner = Hostel_owner.objects.create(name="Quiet", address="Town", phone="2", location="Town")
+        self.room = Hostel.objects.create(name="Live-1", hostel_owner=self.owner)
+        self.user = User.objects.create_user(username="live_student", password="pass12345")
+        self.student = Student.objects.create(
+            user=self.user, name="Live", age=20, address="Campus", duration=6, gender="Male"
+        )
+
+    async def _next_event(self, stream):
+        while True:
+            chunk = (await asyncio.wait_for(anext(stream), 5)).decode()
+            if not chunk.startswith(":"):
+                event = re.search(r"^event: (\w+)$", chunk, re.MULTILINE).group(1)
+                return event, json.loads(re.search(r"^data: (.*)$", chunk, re.MULTILINE).group(1))
+
+    async def _disconnect(self, stream):
+        # The ASGI handler cancels the response task when the client goes away.
+        reader = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        reader.cancel()
+        with contextlib.suppress(asyncio.CancelledError, StopAsyncIteration):
+            await reader
+
+    def _book(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Booking.objects.create(room=self.room, name=self.student)
+
+    async def test_booking_reaches_rooms_and_owner_subscribers_only(self):
+        await self.async_client.aforce_login(self.user)
+        responses = [
+            await self.async_client.get(url)
+            for url in (
+                "/api/async/events/",
+                f"/api/async/events/?owner_id={self.owner.id}",
+                f"/api/async/events/?owner_id={self.other_owner.id}",
+            )
+        ]
+        self.assertEqual(responses[0]["Content-Type"], "text/event-stream")
+        everyone, owner, other = streams = [aiter(response.streaming_content) for response in responses]
+        try:
+            for stream in streams:
+                self.assertEqual((await self._next_event(stream))[0], "ready")
+
+            booking = await sync_to_async(self._book)()
+            for stream in (everyone, owner):
+                event, data = await self._next_event(stream)
+                self.assertEqual((event, data["id"], data["end_date"]), ("booking", booking.id, booking.end_date.isoformat()))
+                self.assertNotIn("name_id", data)
+                self.assertEqual(
+                    await self._next_event(stream), ("availability", availability_event(self.room.id, self.owner.id, False))
+                )
+            # Only keep-alives reach the other owner's subscriber.
+            self.assertTrue((await asyncio.wait_for(anext(other), 5)).startswith(b":"))
+        finally:
+            for stream in streams:
+                await self._disconnect(stream)
+        self.assertEqual(get_broker().subscriber_count(), 0)
+
+    async def test_requires_authentication_and_known_owner(self):
+        response = await self.async_client.get("/api/async/events/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get("/api/async/events/?owner_id=999999")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_local_broker_resyncs_slow_subscribers(self):
+        broker = LocalBroker(queue_size=2)
+        subscription = broker.subscribe("rooms")
+        for room_id in range(3):
+            broker.publish("rooms", availability_event(room_id, 1, True))
+        await asyncio.sleep(0)
+        self.assertEqual(await subscription.get(1), RESYNC)
+        self.assertIsNone(await subscription.get(0.01))
+        subscription.close()
+        self.assertEqual(broker.subscriber_count(), 0)
+
+    def test_brokers_must_implement_the_interface(self):
+        class PublishOnly(Broker):
+            def publish(self, channel, event):
+                pass
+
+        with self.assertRaises(TypeError):
+            PublishOnly()
+        with self.assertRaises(TypeError):
+            Subscription()
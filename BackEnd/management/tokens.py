@@ -0,0 +1,118 @@
+"""JWTs that carry what the API needs to know about the caller.
+
+``login_user`` issues an access/refresh pair whose claims hold the user's
+id, username, email, names and effective role. Requests authenticated with
+such an access token (see ``StatelessTokenAuthentication``) get a
+``TokenUser`` built from the claims, so ``/api/me`` and the role gates need
+no session, ``auth_user`` or role lookup. Claims are refreshed from the
+database whenever a new access token is minted from the refresh token, so a
+role change shows up within ACCESS_TOKEN_LIFETIME.
+
+A deactivated or deleted user must not keep using an access token until it
+expires, so the signal handlers record a revocation (``revoke_tokens``) that
+rejects every token issued before it. That record lives in the default
+cache; when the cache is not shared between workers the user is loaded from
+``auth_user`` and checked instead.
+"""
+
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication, JWTStatelessUserAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .roles import effective_role_for_user
+
+PROFILE_CLAIMS = ("username", "email", "first_name", "last_name", "role")
+
+
+def _set_claims(token, user, role):
+    token["username"] = user.username
+    token["email"] = user.email
+    token["first_name"] = user.first_name
+    token["last_name"] = user.last_name
+    token["role"] = role
+    token["is_staff"] = user.is_staff
+
+
+def tokens_for_user(user, role):
+    """Return ``{"access": ..., "refresh": ...}`` for a freshly authenticated user."""
+    refresh = RefreshToken.for_user(user)
+    _set_claims(refresh, user, role)
+    return {"access": str(refresh.access_token), "refresh": str(refresh)}
+
+
+def access_token_for(refresh, user, role):
+    """Mint an access token from ``refresh`` with claims re-read from ``user``."""
+    access = refresh.access_token
+    _set_claims(access, user, role)
+    return str(access)
+
+
+def refresh_user_id(refresh):
+    return refresh.get(api_settings.USER_ID_CLAIM)
+
+
+def has_profile_claims(token):
+    """True when ``token`` (``request.auth``) can answer /api/me on its own."""
+    return token is not None and hasattr(token, "get") and all(claim in token for claim in PROFILE_CLAIMS)
+
+
+def request_role(request):
+    """The caller's effective role, read from the access token when it carries one."""
+    if has_profile_claims(request.auth):
+        return request.auth["role"]
+    return effective_role_for_user(request.user)
+
+
+def revoked_key(user_id):
+    return f"tokens_revoked:{user_id}"
+
+
+def revoke_tokens(user_id):
+    """Reject the access tokens issued to ``user_id`` so far."""
+    # Tokens issued earlier have expired once the record does.
+    timeout = int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()) + 1
+    cache.set(revoked_key(user_id), int(time.time()), timeout)
+
+
+class StatelessTokenAuthentication(JWTStatelessUserAuthentication):
+    """``JWTStatelessUserAuthentication`` that rejects revoked users' tokens.
+
+    The async views use ``aauthenticate``, which reads the revocation with
+    the async cache API instead of blocking the event loop.
+    """
+
+    def get_user(self, validated_token):
+        if not settings.CACHE_SHARED:
+            # Another worker's revocation is invisible; check auth_user.
+            return JWTAuthentication.get_user(self, validated_token)
+        user = super().get_user(validated_token)
+        return _unless_revoked(user, validated_token, cache.get(revoked_key(user.id)))
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        if not settings.CACHE_SHARED:
+            return await sync_to_async(JWTAuthentication.get_user)(self, validated_token)
+        user = super().get_user(validated_token)
+        return _unless_revoked(user, validated_token, await cache.aget(revoked_key(user.id)))
+
+
+def _unless_revoked(user, validated_token, revoked_at):
+    # iat has whole seconds, so a token issued in the revoking second is rejected too.
+    if revoked_at is not None and validated_token.get("iat", 0) <= revoked_at:
+        raise AuthenticationFailed("User is inactive", code="user_inactive")
+    return user
@@ -1,16 +1,27 @@
 from django.urls import path
-from BackEnd.management import views
+from BackEnd.management import async_views, views
 
 urlpatterns = [
     path('csrf/', views.csrf_token),
     path('register/', views.register_user),
     path('login/', views.login_user),
+    path('token/refresh/', views.refresh_token),
     
     path('logout/', views.logout_user),
     path('me/', views.current_user),
+    path('admin/import-users/', views.import_users),
 
     path('student/bookings/', views.student_bookings_api),
     path('owner/rooms/', views.owner_rooms_api),
+    path('hostels/search/', views.search_hostels),
+    path('hostels/nearby/', views.nearby_hostels),
+    path('hostels/free/', views.free_hostels),
+
+    # Native async variants for ASGI deployments (see BackEnd/asgi.py).
+    path('async/me/', async_views.current_user),
+    path('async/student/bookings/', async_views.student_bookings_api),
+    path('async/owner/rooms/', async_views.owner_rooms_api),
+    path('async/events/', async_views.room_events),
 
     path('students/', views.manage_student),
     path('students/<int:id>/', views.manage_student),
@@ -1,20 +1,40 @@
+import datetime
+import hashlib
 import logging
 import os
 
 from django.shortcuts import redirect, render
+from django.conf import settings
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
-from django.core.exceptions import ValidationError
-from django.core.validators import validate_email
-from django.db import DataError, IntegrityError, transaction
-from django.db.models import Exists, OuterRef
+from django.core.exceptions import NON_FIELD_ERRORS, ImproperlyConfigured, ValidationError
+from django.db import DataError, IntegrityError, connection, transaction
+from django.db.models import Count, Q
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
 from django.views.decorators.csrf import ensure_csrf_cookie
 from rest_framework import status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.tokens import RefreshToken
 
+from .importer import format_for, import_accounts
+from .listings import AVAILABLE_HOSTEL_ROWS, available_hostels, available_hostels_queryset, free_hostels_queryset
+from .markers import get_markers, owner_scope, table_scope
 from .models import Administrator, Booking, Hostel, Hostel_owner, Registers, Role, Student
+from .nearby import DEFAULT_LIMIT, DEFAULT_RADIUS_KM, MAX_LIMIT, MAX_RADIUS_KM, nearest_available_rooms
+from .pagination import IdCursorPagination, OwnerBookingsPagination, OwnerRoomsPagination, RankedPagination
+from .registration import clean_registration, create_account, taken_errors
+from .roles import effective_role_for_user
+from .rows import RowMapper
+from .search import SEARCH_ROWS, clean_term, search_hostels_queryset
+from .signals import rows_changed
+from .streaming import Rows, stream_json, wants_stream
+from .tokens import access_token_for, has_profile_claims, refresh_user_id, request_role, tokens_for_user
 from .serializer import (
     AdministratorSerializer,
     BookingSerializer,
@@ -29,25 +49,45 @@ logger = logging.getLogger(__name__)
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173").rstrip("/")
 
 
-def _normalized_role(value):
-    role = str(value or "").strip().lower()
-    if role in {"hostel owner", "owner"}:
-        return "hostel_owner"
-    if role in {"student"}:
-        return "student"
-    return role
+def _validators(request, scopes, *extra):
+    """Build an ``(etag, last_modified)`` pair from the change markers of ``scopes``.
 
+    ``extra`` carries anything else the payload depends on, such as the id of
+    the requesting user.
+    """
+    return _validators_from_markers(request, get_markers(scopes), scopes, extra)
 
-def _effective_role_for_user(user):
-    register = Registers.objects.filter(user=user).first()
-    role = _normalized_role(register.role if register else "")
-    if role in {"student", "hostel_owner"}:
-        return role
-    if Hostel_owner.objects.filter(user=user).exists():
-        return "hostel_owner"
-    if Student.objects.filter(user=user).exists():
-        return "student"
-    return ""
+
+def _validators_from_markers(request, markers, scopes, extra):
+    fingerprint = "|".join(
+        [f"{scope}={markers[scope]!r}" for scope in scopes]
+        + [request.get_full_path(), request.META.get("HTTP_ACCEPT", "")]
+        + [str(value) for value in extra]
+    )
+    etag = quote_etag(hashlib.sha1(fingerprint.encode()).hexdigest())
+    return etag, int(max(markers.values()))
+
+
+def _set_validators(response, etag, last_modified, private=False):
+    # Markers bumped in another worker's private cache never reach this one,
+    # so validators are only sent when the cache is shared.
+    if settings.CACHE_SHARED:
+        response.headers["ETag"] = etag
+        response.headers["Last-Modified"] = http_date(last_modified)
+    # Clients may keep the body but must revalidate it before reuse.
+    patch_cache_control(response, no_cache=True, private=private)
+    patch_vary_headers(response, ("Accept", "Authorization", "Cookie") if private else ("Accept",))
+    return response
+
+
+def _not_modified(request, etag, last_modified, private=False):
+    """Return a 304 when the client's validators still match, otherwise None."""
+    if not settings.CACHE_SHARED:
+        return None
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        _set_validators(response, etag, last_modified, private=private)
+    return response
 
 
 def home(request):
@@ -82,7 +122,7 @@ def about_page(request):
 
 @login_required(login_url="/login")
 def dashboard_page(request):
-    role = _effective_role_for_user(request.user)
+    role = effective_role_for_user(request.user)
     return render(request, "dashboard_page.html", {"role": role, "user": request.user})
 
 
@@ -107,9 +147,8 @@ def student_booking_page(request):
         if hostel_id:
             hostel = Hostel.objects.filter(id=hostel_id).first()
             if hostel:
-                try:
-                    Booking.objects.create(room=hostel, name=student)
-                except ValidationError:
+                _, error = _book_room(student, hostel)
+                if error:
                     return render(
                         request,
                         "message_page.html",
@@ -144,37 +183,304 @@ def owner_rooms_page(request):
     return render(request, "owner_rooms_page.html", {"rooms": rooms, "owner": owner})
 
 
+def _sparse_fieldset(request, serializer_class):
+    """Parse ``?fields=a,b`` into serializer field names and model columns.
+
+    Returns ``(field_names, columns, error)``; ``field_names`` is None when the
+    client did not ask for a sparse fieldset.
+    """
+    raw = request.query_params.get("fields")
+    if raw is None:
+        return None, None, None
+
+    declared = serializer_class().fields
+    field_names = [name.strip() for name in raw.split(",") if name.strip()]
+    unknown = [name for name in field_names if name not in declared]
+    if not field_names or unknown:
+        return None, None, f"Unknown fields: {', '.join(unknown) or raw}"
+    columns = [declared[name].source for name in field_names if declared[name].source != "*"]
+    return field_names, columns, None
+
+
+def _bulk_permission_error(request):
+    """Bulk writes can touch hundreds of rows at once, so only staff may make them."""
+    if not request.user.is_authenticated:
+        return Response({"message": "Authentication required"}, status=status.HTTP_401_UNAUTHORIZED)
+    if not IsAdminUser().has_permission(request, None):
+        return Response({"message": "Only staff can make bulk changes"}, status=status.HTTP_403_FORBIDDEN)
+    return None
+
+
+def _bulk_size_error(items):
+    max_items = settings.API_BULK_MAX_ITEMS
+    if not items:
+        return Response({"message": "At least one item is required"}, status=status.HTTP_400_BAD_REQUEST)
+    if len(items) > max_items:
+        return Response(
+            {"message": f"A bulk request can contain at most {max_items} items"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    return None
+
+
+def _validation_error_detail(exc):
+    if not hasattr(exc, "error_dict"):
+        return {"non_field_errors": exc.messages}
+    detail = exc.message_dict
+    # full_clean() files clean()'s errors under "__all__"; answer like DRF.
+    if NON_FIELD_ERRORS in detail:
+        detail["non_field_errors"] = detail.pop(NON_FIELD_ERRORS)
+    return detail
+
+
+def _write_errors(model_class, indexed):
+    """Check the model-level rules of ``(index, instance)`` pairs about to be written.
+
+    Runs inside the write's transaction: a model with ``lock_for_write``
+    (bookings) first waits for concurrent writes of the same rows, so nothing
+    can break the rules between this check and the write, and its
+    ``batch_conflicts`` catches items of one request that clash with each
+    other. bulk_create() and bulk_update() skip save(), so this is where
+    clean() runs for them.
+    """
+    instances = [instance for _, instance in indexed]
+    lock_for_write = getattr(model_class, "lock_for_write", None)
+    if lock_for_write is not None:
+        lock_for_write(instances)
+    errors = {}
+    for index, instance in indexed:
+        try:
+            instance.clean()
+        except ValidationError as exc:
+            errors[index] = _validation_error_detail(exc)
+    batch_conflicts = getattr(model_class, "batch_conflicts", None)
+    if batch_conflicts is not None and not errors:
+        for position, message in batch_conflicts(instances).items():
+            errors[indexed[position][0]] = {"non_field_errors": [message]}
+    return [{"index": index, "errors": detail} for index, detail in errors.items()]
+
+
+def _save(model_class, serializer):
+    """``serializer.save()``; return an error Response or None.
+
+    A model with ``lock_for_write`` (bookings) is saved under the same lock as
+    ``_book_room``, so its own overlap check in save() cannot race another write.
+    """
+    lock_for_write = getattr(model_class, "lock_for_write", None)
+    if lock_for_write is None:
+        serializer.save()
+        return None
+    if serializer.instance is None:
+        pending = model_class(**serializer.validated_data)
+    else:
+        pending = serializer.instance
+        for attr, value in serializer.validated_data.items():
+            setattr(pending, attr, value)
+    try:
+        with transaction.atomic():
+            lock_for_write([pending])
+            serializer.save()
+    except ValidationError as exc:
+        return Response(_validation_error_detail(exc), status=status.HTTP_400_BAD_REQUEST)
+    except IntegrityError:
+        return Response({"message": "Item conflicts with existing data"}, status=status.HTTP_400_BAD_REQUEST)
+    return None
+
+
+def _bulk_create(model_class, serializer_class, items):
+    error = _bulk_size_error(items)
+    if error:
+        return error
+
+    instances = []
+    errors = []
+    for index, item in enumerate(items):
+        serializer = serializer_class(data=item)
+        if not serializer.is_valid():
+            errors.append({"index": index, "errors": serializer.errors})
+            continue
+        instances.append((index, model_class(**serializer.validated_data)))
+
+    if errors:
+        return Response({"message": "Validation failed", "errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        with transaction.atomic():
+            errors = _write_errors(model_class, instances)
+            if errors:
+                return Response({"message": "Validation failed", "errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+            created = model_class.objects.bulk_create([instance for _, instance in instances])
+    except IntegrityError:
+        return Response({"message": "Items conflict with existing data"}, status=status.HTTP_400_BAD_REQUEST)
+    rows_changed(model_class, created)
+    return Response(serializer_class(created, many=True).data, status=status.HTTP_201_CREATED)
+
+
+def _bulk_update(model_class, serializer_class, items, partial):
+    error = _bulk_size_error(items)
+    if error:
+        return error
+
+    ids = []
+    for item in items:
+        try:
+            ids.append(int(item["id"]))
+        except (KeyError, TypeError, ValueError):
+            ids.append(None)
+    instances = model_class.objects.in_bulk([item_id for item_id in ids if item_id is not None])
+
+    updated = []
+    fields = set()
+    seen = set()
+    errors = []
+    for index, (item_id, item) in enumerate(zip(ids, items)):
+        if item_id is None:
+            errors.append({"index": index, "errors": {"id": ["A valid id is required"]}})
+            continue
+        if item_id in seen:
+            errors.append({"index": index, "errors": {"id": ["Duplicate id in request"]}})
+            continue
+        seen.add(item_id)
+        instance = instances.get(item_id)
+        if instance is None:
+            errors.append({"index": index, "errors": {"id": ["Object not found"]}})
+            continue
+        serializer = serializer_class(instance, data=item, partial=partial)
+        if not serializer.is_valid():
+            errors.append({"index": index, "errors": serializer.errors})
+            continue
+        for attr, value in serializer.validated_data.items():
+            setattr(instance, attr, value)
+            fields.add(attr)
+        updated.append((index, instance))
+
+    if errors:
+        return Response({"message": "Validation failed", "errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+    derived = getattr(model_class, "DERIVED_FIELDS", {})
+    fields.update(derived[name] for name in list(fields) if name in derived)
+    instances = [instance for _, instance in updated]
+    if fields:
+        try:
+            with transaction.atomic():
+                errors = _write_errors(model_class, updated)
+                if errors:
+                    return Response(
+                        {"message": "Validation failed", "errors": errors}, status=status.HTTP_400_BAD_REQUEST
+                    )
+                model_class.objects.bulk_update(instances, sorted(fields))
+        except IntegrityError:
+            return Response({"message": "Items conflict with existing data"}, status=status.HTTP_400_BAD_REQUEST)
+        rows_changed(model_class, instances)
+    return Response(serializer_class(instances, many=True).data, status=status.HTTP_200_OK)
+
+
+def _bulk_delete_ids(request):
+    """Return the ids of a bulk DELETE (body ``{"ids": [...]}`` or ``?ids=1,2``), or None."""
+    ids = request.data.get("ids") if hasattr(request.data, "get") else None
+    if ids is None and "ids" in request.query_params:
+        ids = [value for value in request.query_params["ids"].split(",") if value.strip()]
+    return ids
+
+
+def _bulk_delete(model_class, ids):
+    if not isinstance(ids, list):
+        return Response({"message": "ids must be a list"}, status=status.HTTP_400_BAD_REQUEST)
+    error = _bulk_size_error(ids)
+    if error:
+        return error
+
+    errors = []
+    clean_ids = []
+    for index, value in enumerate(ids):
+        try:
+            clean_ids.append(int(value))
+        except (TypeError, ValueError):
+            errors.append({"index": index, "errors": {"id": ["A valid id is required"]}})
+    if errors:
+        return Response({"message": "Validation failed", "errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+    with transaction.atomic():
+        queryset = model_class.objects.filter(id__in=clean_ids)
+        found = set(queryset.values_list("id", flat=True))
+        missing = [index for index, item_id in enumerate(clean_ids) if item_id not in found]
+        if missing:
+            return Response(
+                {
+                    "message": "Object not found",
+                    "errors": [{"index": index, "errors": {"id": ["Object not found"]}} for index in missing],
+                },
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        queryset.delete()
+    return Response({"message": "Deleted successfully", "deleted": len(found)}, status=status.HTTP_200_OK)
+
+
 def generic_api(model_class, serializer_class):
-    @api_view(["GET", "POST", "PUT", "DELETE"])
+    @api_view(["GET", "POST", "PUT", "PATCH", "DELETE"])
     def api(request, id=None):
         if request.method == "GET":
+            field_names, columns, error = _sparse_fieldset(request, serializer_class)
+            if error:
+                return Response({"message": error}, status=status.HTTP_400_BAD_REQUEST)
+            etag, last_modified = _validators(request, [table_scope(model_class)])
+            not_modified = _not_modified(request, etag, last_modified)
+            if not_modified is not None:
+                return not_modified
+            queryset = model_class.objects.all()
+
             if id:
+                if columns is not None:
+                    # Only load the columns the client asked for.
+                    queryset = queryset.only(*columns)
                 try:
-                    instance = model_class.objects.get(id=id)
-                    serializer = serializer_class(instance)
-                    return Response(serializer.data)
+                    instance = queryset.get(id=id)
+                    serializer = serializer_class(instance, fields=field_names)
+                    return _set_validators(Response(serializer.data), etag, last_modified)
                 except model_class.DoesNotExist:
                     return Response({"message": "Object not found"}, status=status.HTTP_404_NOT_FOUND)
 
-            instance = model_class.objects.all()
-            serializer = serializer_class(instance, many=True)
-            return Response(serializer.data)
+            # Rows skip model instances and serializer fields entirely; the
+            # id column is always read because the cursor is built from it.
+            mapper = RowMapper.for_serializer(serializer_class, field_names)
+            if wants_stream(request):
+                # Exports opt out of pagination: the response is the whole
+                # table, O(table) in DB time and payload, but streamed in
+                # chunks so server memory stays bounded.
+                rows = Rows(mapper.values(queryset.order_by("id")), mapper)
+                return _set_validators(stream_json(request, rows), etag, last_modified)
+            # Everything else is paginated on the primary key, so a page
+            # costs the same however large the table grows.
+            paginator = IdCursorPagination()
+            page = paginator.paginate_queryset(mapper.values(queryset, "id"), request)
+            return _set_validators(paginator.get_paginated_response(mapper.rows(page)), etag, last_modified)
 
         if request.method == "POST":
+            if isinstance(request.data, list):
+                return _bulk_permission_error(request) or _bulk_create(model_class, serializer_class, request.data)
             serializer = serializer_class(data=request.data)
             if serializer.is_valid():
-                serializer.save()
+                error = _save(model_class, serializer)
+                if error:
+                    return error
                 return Response(serializer.data, status=status.HTTP_201_CREATED)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        if request.method == "PUT":
+        if request.method in ("PUT", "PATCH"):
+            partial = request.method == "PATCH"
+            if not id and isinstance(request.data, list):
+                return _bulk_permission_error(request) or _bulk_update(
+                    model_class, serializer_class, request.data, partial
+                )
             if not id:
                 return Response({"message": "ID is required for update"}, status=status.HTTP_400_BAD_REQUEST)
             try:
                 instance = model_class.objects.get(id=id)
-                serializer = serializer_class(instance, data=request.data)
+                serializer = serializer_class(instance, data=request.data, partial=partial)
                 if serializer.is_valid():
-                    serializer.save()
+                    error = _save(model_class, serializer)
+                    if error:
+                        return error
                     return Response(serializer.data, status=status.HTTP_200_OK)
                 return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
             except model_class.DoesNotExist:
@@ -182,6 +488,9 @@ def generic_api(model_class, serializer_class):
 
         if request.method == "DELETE":
             if not id:
+                ids = _bulk_delete_ids(request)
+                if ids is not None:
+                    return _bulk_permission_error(request) or _bulk_delete(model_class, ids)
                 return Response({"message": "ID is required for delete"}, status=status.HTTP_400_BAD_REQUEST)
             try:
                 instance = model_class.objects.get(id=id)
@@ -192,6 +501,8 @@ def generic_api(model_class, serializer_class):
 
         return Response({"message": "Method not allowed"}, status=status.HTTP_405_METHOD_NOT_ALLOWED)
 
+    # Lets the timing middleware tell the generic endpoints apart.
+    api.timing_tag = f"generic_api:{model_class._meta.model_name}"
     return api
 
 
@@ -204,23 +515,242 @@ manage_Administrator = generic_api(Administrator, AdministratorSerializer)
 manage_Registers = generic_api(Registers, RegistersSerializer)
 
 
+STUDENT_BOOKINGS_SCOPES = [table_scope(Hostel), table_scope(Booking), table_scope(Hostel_owner), table_scope(Student)]
+
+
+def _owner_rooms_scopes(owner):
+    return [owner_scope(owner.id), table_scope(Hostel_owner), table_scope(Student)]
+
+
+def _user_payload(user, role):
+    return {
+        "user_id": user.id,
+        "username": user.username,
+        "email": user.email,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "role": role,
+    }
+
+
+STUDENT_BOOKING_ROWS = RowMapper(
+    {
+        "id": "id",
+        "room_id": "room_id",
+        "room_name": "room__name",
+        "booking_date": "booking_date",
+        "start_date": "start_date",
+        "end_date": "end_date",
+    }
+)
+OWNER_ROOM_ROWS = RowMapper({"id": "id", "name": "name"})
+OWNER_BOOKING_ROWS = RowMapper(
+    {
+        "id": "id",
+        "student_id": "name_id",
+        "student_name": "name__name",
+        "room_id": "room_id",
+        "room_name": "room__name",
+        "booking_date": "booking_date",
+        "start_date": "start_date",
+        "end_date": "end_date",
+    }
+)
+
+
+def _student_booking_payload(booking):
+    return {
+        "id": booking.id,
+        "room_id": booking.room.id,
+        "room_name": booking.room.name,
+        "booking_date": booking.booking_date,
+        "start_date": booking.start_date,
+        "end_date": booking.end_date,
+    }
+
+
+def term_start(today=None):
+    """Return the first day of the current academic term (see TERM_START_MONTHS)."""
+    today = today or datetime.date.today()
+    months = sorted(settings.TERM_START_MONTHS)
+    started = [month for month in months if month <= today.month]
+    if started:
+        return today.replace(month=started[-1], day=1)
+    return today.replace(year=today.year - 1, month=months[-1], day=1)
+
+
+def _owner_summary_aggregates(start):
+    # A room joins one row per booking it has had, so every count is distinct.
+    return {
+        "total_rooms": Count("id", distinct=True),
+        "free_rooms": Count("id", filter=Q(is_available=True), distinct=True),
+        "term_bookings": Count("booking", filter=Q(booking__booking_date__gte=start), distinct=True),
+    }
+
+
+def _owner_summary_payload(totals, start):
+    return {
+        "total_rooms": totals["total_rooms"],
+        "occupied_rooms": totals["total_rooms"] - totals["free_rooms"],
+        "free_rooms": totals["free_rooms"],
+        "term_bookings": totals["term_bookings"],
+        "term_start": start,
+    }
+
+
+def _holds_booking(booking_rows, today):
+    """Whether any of a student's booking rows is running or still to start."""
+    return any(row["end_date"] > today for row in booking_rows)
+
+
+def _owner_summary(owner):
+    """Room and booking counts for ``owner`` in one aggregate query."""
+    start = term_start()
+    totals = Hostel.objects.filter(hostel_owner=owner).aggregate(**_owner_summary_aggregates(start))
+    return _owner_summary_payload(totals, start)
+
+
+def _owner_rooms_queryset(owner):
+    return OWNER_ROOM_ROWS.values(Hostel.objects.filter(hostel_owner=owner).order_by("-id"))
+
+
+def _owner_bookings_queryset(owner):
+    return OWNER_BOOKING_ROWS.values(Booking.objects.filter(room__hostel_owner=owner).order_by("-id"))
+
+
+def _wants_summary_only(request):
+    return request.GET.get("summary_only", "").lower() in ("1", "true", "yes")
+
+
+def _wants_owner_pages(request):
+    return any(param in request.GET for param in ("page_size", "rooms_cursor", "bookings_cursor"))
+
+
+def _owner_pages(request, owner):
+    """Return one page of the owner's rooms and bookings with their next links."""
+    rooms = OwnerRoomsPagination()
+    bookings = OwnerBookingsPagination()
+    return {
+        "rooms": OWNER_ROOM_ROWS.rows(rooms.paginate_queryset(_owner_rooms_queryset(owner), request)),
+        "bookings": OWNER_BOOKING_ROWS.rows(bookings.paginate_queryset(_owner_bookings_queryset(owner), request)),
+        "rooms_next": rooms.get_next_link(),
+        "bookings_next": bookings.get_next_link(),
+    }
+
+
+def _parse_hostel_id(value):
+    """Return ``(hostel_id, error_message)`` for a booking request's hostel_id."""
+    if not value:
+        return None, "hostel_id is required"
+    try:
+        return int(value), None
+    except (TypeError, ValueError):
+        return None, "hostel_id must be a valid number"
+
+
+def _parse_nearby(params):
+    """Return ``((lat, lon, radius_km, limit), error_message)`` for a nearby-rooms query."""
+    try:
+        latitude = float(params["lat"])
+        longitude = float(params["lon"])
+    except KeyError:
+        return None, "lat and lon are required"
+    except ValueError:
+        return None, "lat and lon must be numbers"
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return None, "lat must be between -90 and 90 and lon between -180 and 180"
+    try:
+        radius_km = float(params.get("radius_km", DEFAULT_RADIUS_KM))
+        limit = int(params.get("limit", DEFAULT_LIMIT))
+    except ValueError:
+        return None, "radius_km and limit must be numbers"
+    if not 0 < radius_km <= MAX_RADIUS_KM:
+        return None, f"radius_km must be greater than 0 and at most {MAX_RADIUS_KM:g}"
+    if not 0 < limit <= MAX_LIMIT:
+        return None, f"limit must be between 1 and {MAX_LIMIT}"
+    return (latitude, longitude, radius_km, limit), None
+
+
+def _parse_booking_dates(data):
+    """Return ``((start_date, end_date), error_message)`` for a booking request.
+
+    Both are optional: the stay starts today and lasts the student's duration.
+    """
+    dates = []
+    for name in ("start_date", "end_date"):
+        value = data.get(name)
+        if value in (None, ""):
+            dates.append(None)
+            continue
+        try:
+            dates.append(datetime.date.fromisoformat(str(value)))
+        except ValueError:
+            return None, f"{name} must be a date (YYYY-MM-DD)"
+    start_date, end_date = dates
+    if start_date is not None and start_date < datetime.date.today():
+        return None, "start_date cannot be in the past"
+    if start_date is not None and end_date is not None and end_date <= start_date:
+        return None, "end_date must be after start_date"
+    return (start_date, end_date), None
+
+
+def _booking_error(booking):
+    """Map an overlapping booking to the API's message, or None."""
+    others = Booking.objects.overlapping(booking.start_date, booking.end_date)
+    if others.filter(name_id=booking.name_id).exists():
+        return "You already have a booking"
+    if others.filter(room_id=booking.room_id).exists():
+        # One room can only be occupied by one student at a time.
+        return "This room is already booked"
+    return None
+
+
+def _book_room(student, hostel, start_date=None, end_date=None):
+    """Insert a booking, returning ``(booking, None)`` or ``(None, error_message)``."""
+    booking = Booking(room=hostel, name=student, start_date=start_date, end_date=end_date)
+    booking.fill_period()
+    if booking.end_date <= booking.start_date:
+        return None, "end_date must be after start_date"
+    try:
+        with transaction.atomic():
+            if connection.vendor != "postgresql":
+                # Without the exclusion constraints of migration 0017, wait for
+                # concurrent bookings of the student or room (row locks, or
+                # SQLite's IMMEDIATE write lock), then check for overlaps on
+                # the (room|name, end_date) indexes.
+                Booking.lock_for_write([booking])
+                error = _booking_error(booking)
+                if error:
+                    return None, error
+            booking.save(validate=False)
+    except IntegrityError:
+        # On PostgreSQL the exclusion constraints decide who wins, so there
+        # is no check-then-insert window for a concurrent request.
+        return None, _booking_error(booking) or "This room is already booked"
+    return booking, None
+
+
+def _room_name_error(room_name):
+    if not room_name:
+        return "room_name is required"
+    if len(room_name) > 200:
+        return "room_name must be 200 characters or fewer"
+    return None
+
+
 @api_view(["GET"])
 def current_user(request):
     if not request.user.is_authenticated:
         return Response({"message": "Authentication required"}, status=status.HTTP_401_UNAUTHORIZED)
 
-    role = _effective_role_for_user(request.user)
-    return Response(
-        {
-            "user_id": request.user.id,
-            "username": request.user.username,
-            "email": request.user.email,
-            "first_name": request.user.first_name,
-            "last_name": request.user.last_name,
-            "role": role,
-        },
-        status=status.HTTP_200_OK,
-    )
+    if has_profile_claims(request.auth):
+        # Everything /me returns is in the access token.
+        return Response(_user_payload(request.user, request.auth["role"]), status=status.HTTP_200_OK)
+    user = request.user
+    if isinstance(user, TokenUser):
+        # A token minted without profile claims only identifies the user.
+        user = User.objects.get(pk=user.id)
+    return Response(_user_payload(user, effective_role_for_user(user)), status=status.HTTP_200_OK)
 
 
 @api_view(["POST"])
@@ -237,96 +767,115 @@ def student_bookings_api(request):
     if not request.user.is_authenticated:
         return Response({"message": "Authentication required"}, status=status.HTTP_401_UNAUTHORIZED)
 
-    role = _effective_role_for_user(request.user)
+    role = request_role(request)
     if role != "student":
         return Response({"message": "Only students can access this endpoint"}, status=status.HTTP_403_FORBIDDEN)
 
-    student = Student.objects.filter(user=request.user).first()
+    student = Student.objects.filter(user_id=request.user.id).first()
     if not student:
         return Response({"message": "Student profile not found"}, status=status.HTTP_404_NOT_FOUND)
 
     if request.method == "GET":
-        booked_rooms = Booking.objects.filter(room=OuterRef("pk"))
+        markers = get_markers(STUDENT_BOOKINGS_SCOPES)
+        today = datetime.date.today()
+        # Bookings end by date alone, so the day is part of the validator.
+        etag, last_modified = _validators_from_markers(
+            request, markers, STUDENT_BOOKINGS_SCOPES, [student.id, today]
+        )
+        not_modified = _not_modified(request, etag, last_modified, private=True)
+        if not_modified is not None:
+            return not_modified
+
         # Show only available rooms to students: once booked, room disappears from options.
-        bookings = Booking.objects.filter(name=student).select_related("room").order_by("-id")
-        if bookings.exists():
+        bookings = list(STUDENT_BOOKING_ROWS.values(Booking.objects.filter(name=student).order_by("-id")))
+        hostels = []
+        paginator = None
+        if not _holds_booking(bookings, today):
             # Student is allowed only one booking at a time.
-            hostels = Hostel.objects.none()
-        else:
-            hostels = (
-                Hostel.objects.select_related("hostel_owner")
-                .annotate(is_booked=Exists(booked_rooms))
-                .filter(is_booked=False)
-                .order_by("id")
-            )
+            if "page_size" in request.query_params or "cursor" in request.query_params:
+                paginator = IdCursorPagination()
+                hostels = AVAILABLE_HOSTEL_ROWS.rows(paginator.paginate_queryset(available_hostels_queryset(), request))
+            else:
+                # The full list is the same for every student; only their
+                # own bookings are per request.
+                hostels = available_hostels(markers)
+
+        payload = {
+            "student": {"id": student.id, "name": student.name},
+            "hostels": hostels,
+            "bookings": STUDENT_BOOKING_ROWS.rows(bookings),
+        }
+        if paginator is not None:
+            payload["hostels_next"] = paginator.get_next_link()
+        response = Response(payload, status=status.HTTP_200_OK)
+        return _set_validators(response, etag, last_modified, private=True)
+
+    hostel_id, error = _parse_hostel_id(request.data.get("hostel_id"))
+    if error:
+        return Response({"message": error}, status=status.HTTP_400_BAD_REQUEST)
+
+    dates, error = _parse_booking_dates(request.data)
+    if error:
+        return Response({"message": error}, status=status.HTTP_400_BAD_REQUEST)
+
+    hostel = Hostel.objects.filter(id=hostel_id).only("id", "name").first()
+    if not hostel:
+        return Response({"message": "Hostel not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        hostels_payload = [
-            {
-                "id": hostel.id,
-                "name": hostel.name,
-                "owner_name": hostel.hostel_owner.name,
-                "owner_id": hostel.hostel_owner.id,
-            }
-            for hostel in hostels
-        ]
-        bookings_payload = [
-            {
-                "id": booking.id,
-                "room_id": booking.room.id,
-                "room_name": booking.room.name,
-                "booking_date": booking.booking_date,
-            }
-            for booking in bookings
-        ]
+    booking, error = _book_room(student, hostel, *dates)
+    if error:
+        return Response({"message": error}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(
+        {"message": "Booking created successfully", "booking": _student_booking_payload(booking)},
+        status=status.HTTP_201_CREATED,
+    )
 
-        return Response(
-            {
-                "student": {"id": student.id, "name": student.name},
-                "hostels": hostels_payload,
-                "bookings": bookings_payload,
-            },
-            status=status.HTTP_200_OK,
-        )
 
-    hostel_id = request.data.get("hostel_id")
-    if not hostel_id:
-        return Response({"message": "hostel_id is required"}, status=status.HTTP_400_BAD_REQUEST)
+@api_view(["GET"])
+def search_hostels(request):
+    """Ranked, paginated room search: ``?q=<term>[&available=1][&page=2]``."""
+    if not request.user.is_authenticated:
+        return Response({"message": "Authentication required"}, status=status.HTTP_401_UNAUTHORIZED)
 
-    if Booking.objects.filter(name=student).exists():
-        return Response({"message": "You already have a booking"}, status=status.HTTP_400_BAD_REQUEST)
+    term, error = clean_term(request.query_params.get("q"))
+    if error:
+        return Response({"message": error}, status=status.HTTP_400_BAD_REQUEST)
+    available_only = request.query_params.get("available", "").lower() in ("1", "true", "yes")
 
-    try:
-        hostel_id = int(hostel_id)
-    except (TypeError, ValueError):
-        return Response({"message": "hostel_id must be a valid number"}, status=status.HTTP_400_BAD_REQUEST)
+    paginator = RankedPagination()
+    rows = paginator.paginate_queryset(search_hostels_queryset(term, available_only), request)
+    return paginator.get_paginated_response(SEARCH_ROWS.rows(rows))
 
-    hostel = Hostel.objects.filter(id=hostel_id).first()
-    if not hostel:
-        return Response({"message": "Hostel not found"}, status=status.HTTP_404_NOT_FOUND)
 
-    if Booking.objects.filter(room=hostel, name=student).exists():
-        return Response({"message": "You already booked this room"}, status=status.HTTP_400_BAD_REQUEST)
+@api_view(["GET"])
+def nearby_hostels(request):
+    """Nearest available rooms: ``?lat=<deg>&lon=<deg>[&radius_km=5][&limit=20]``."""
+    if not request.user.is_authenticated:
+        return Response({"message": "Authentication required"}, status=status.HTTP_401_UNAUTHORIZED)
 
-    # One room can only be occupied by one student at a time.
-    if Booking.objects.filter(room=hostel).exists():
-        return Response({"message": "This room is already booked"}, status=status.HTTP_400_BAD_REQUEST)
+    params, error = _parse_nearby(request.query_params)
+    if error:
+        return Response({"message": error}, status=status.HTTP_400_BAD_REQUEST)
+    latitude, longitude, radius_km, limit = params
+    rooms = nearest_available_rooms(latitude, longitude, radius_km, limit)
+    return Response({"radius_km": radius_km, "results": rooms}, status=status.HTTP_200_OK)
 
-    try:
-        booking = Booking.objects.create(room=hostel, name=student)
-    except ValidationError as exc:
-        return Response({"message": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
-    return Response(
-        {
-            "message": "Booking created successfully",
-            "booking": {
-                "id": booking.id,
-                "room_id": booking.room.id,
-                "room_name": booking.room.name,
-                "booking_date": booking.booking_date,
-            },
-        },
-        status=status.HTTP_201_CREATED,
-    )
+
+@api_view(["GET"])
+def free_hostels(request):
+    """Rooms with no booking between two dates: ``?start_date=<YYYY-MM-DD>&end_date=<YYYY-MM-DD>``."""
+    if not request.user.is_authenticated:
+        return Response({"message": "Authentication required"}, status=status.HTTP_401_UNAUTHORIZED)
+
+    dates, error = _parse_booking_dates(request.query_params)
+    if not error and None in dates:
+        error = "start_date and end_date are required"
+    if error:
+        return Response({"message": error}, status=status.HTTP_400_BAD_REQUEST)
+
+    paginator = IdCursorPagination()
+    rows = paginator.paginate_queryset(free_hostels_queryset(*dates), request)
+    return paginator.get_paginated_response(AVAILABLE_HOSTEL_ROWS.rows(rows))
 
 
 @api_view(["GET", "POST"])
@@ -334,41 +883,40 @@ def owner_rooms_api(request):
     if not request.user.is_authenticated:
         return Response({"message": "Authentication required"}, status=status.HTTP_401_UNAUTHORIZED)
 
-    role = _effective_role_for_user(request.user)
+    role = request_role(request)
     if role != "hostel_owner":
         return Response({"message": "Only hostel owners can access this endpoint"}, status=status.HTTP_403_FORBIDDEN)
 
-    owner = Hostel_owner.objects.filter(user=request.user).first()
+    owner = Hostel_owner.objects.filter(user_id=request.user.id).first()
     if not owner:
         return Response({"message": "Hostel owner profile not found"}, status=status.HTTP_404_NOT_FOUND)
 
     if request.method == "GET":
-        rooms = Hostel.objects.filter(hostel_owner=owner).order_by("-id")
-        bookings = Booking.objects.filter(room__hostel_owner=owner).select_related("name", "room").order_by("-id")
-        return Response(
-            {
-                "owner": {"id": owner.id, "name": owner.name},
-                "rooms": [{"id": room.id, "name": room.name} for room in rooms],
-                "bookings": [
-                    {
-                        "id": booking.id,
-                        "student_id": booking.name.id,
-                        "student_name": booking.name.name,
-                        "room_id": booking.room.id,
-                        "room_name": booking.room.name,
-                        "booking_date": booking.booking_date,
-                    }
-                    for booking in bookings
-                ],
-            },
-            status=status.HTTP_200_OK,
-        )
+        # The term start is part of the validator so term_bookings resets at a term boundary.
+        etag, last_modified = _validators(request, _owner_rooms_scopes(owner), owner.id, term_start())
+        not_modified = _not_modified(request, etag, last_modified, private=True)
+        if not_modified is not None:
+            return not_modified
+
+        payload = {"owner": {"id": owner.id, "name": owner.name}, "summary": _owner_summary(owner)}
+        # With ?summary_only=1 (the common dashboard poll) the lists are skipped.
+        if not _wants_summary_only(request):
+            if wants_stream(request):
+                payload["rooms"] = Rows(_owner_rooms_queryset(owner), OWNER_ROOM_ROWS)
+                payload["bookings"] = Rows(_owner_bookings_queryset(owner), OWNER_BOOKING_ROWS)
+                return _set_validators(stream_json(request, payload), etag, last_modified, private=True)
+            if _wants_owner_pages(request):
+                payload.update(_owner_pages(request, owner))
+            else:
+                payload["rooms"] = OWNER_ROOM_ROWS.rows(_owner_rooms_queryset(owner))
+                payload["bookings"] = OWNER_BOOKING_ROWS.rows(_owner_bookings_queryset(owner))
+        response = Response(payload, status=status.HTTP_200_OK)
+        return _set_validators(response, etag, last_modified, private=True)
 
     room_name = str(request.data.get("room_name", "")).strip()
-    if not room_name:
-        return Response({"message": "room_name is required"}, status=status.HTTP_400_BAD_REQUEST)
-    if len(room_name) > 200:
-        return Response({"message": "room_name must be 200 characters or fewer"}, status=status.HTTP_400_BAD_REQUEST)
+    error = _room_name_error(room_name)
+    if error:
+        return Response({"message": error}, status=status.HTTP_400_BAD_REQUEST)
 
     room = Hostel.objects.create(name=room_name, hostel_owner=owner)
     return Response(
@@ -390,61 +938,9 @@ def register_user(request):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        first_name = str(data.get("first_name", "")).strip()
-        last_name = str(data.get("last_name", "")).strip()
-        email = str(data.get("email", "")).strip()
-        username = str(data.get("username", "")).strip()
-        role = str(data.get("role", "")).strip()
-        password = str(data.get("password", ""))
-        confirm_password = str(data.get("confirm_password", ""))
-        full_name = f"{first_name} {last_name}".strip()
-
-        errors = {}
-
-        if not first_name:
-            errors["firstName"] = "First name is required"
-        if not last_name:
-            errors["lastName"] = "Last name is required"
-        if not email:
-            errors["email"] = "Email is required"
-        else:
-            try:
-                validate_email(email)
-            except ValidationError:
-                errors["email"] = "Invalid email address"
-        if not username:
-            errors["username"] = "Username is required"
-        if not role:
-            errors["role"] = "Please select a role"
-        elif role not in ["student", "hostel_owner"]:
-            errors["role"] = "Role must be student or hostel_owner"
-        if not password:
-            errors["password"] = "Password is required"
-        if password != confirm_password:
-            errors["confirmPassword"] = "Passwords do not match"
-        if User.objects.filter(username=username).exists():
-            errors["username"] = "Username already exists"
-        if User.objects.filter(email=email).exists():
-            errors["email"] = "Email already registered"
-
-        if role == "student":
-            if len(full_name) > 30:
-                errors["firstName"] = "First and last name are too long for a student profile"
-            gender = str(data.get("gender", "Not set")).strip() or "Not set"
-            if len(gender) > 10:
-                errors["gender"] = "Gender must be 10 characters or fewer"
-            try:
-                age = int(data.get("age", 18) or 18)
-                if age < 1:
-                    raise ValueError
-            except (TypeError, ValueError):
-                errors["age"] = "Age must be a positive number"
-            try:
-                duration = int(data.get("duration", 1) or 1)
-                if duration < 1:
-                    raise ValueError
-            except (TypeError, ValueError):
-                errors["duration"] = "Duration must be a positive number"
+        account, errors = clean_registration(data)
+        # Uniqueness is checked after the field rules so it takes precedence.
+        errors.update(taken_errors(account))
 
         if errors:
             return Response(
@@ -453,40 +949,7 @@ def register_user(request):
             )
 
         with transaction.atomic():
-            user = User.objects.create_user(
-                username=username,
-                email=email,
-                password=password,
-                first_name=first_name,
-                last_name=last_name,
-            )
-
-            Registers.objects.create(
-                user=user,
-                first_name=first_name,
-                Last_name=last_name,
-                email_address=email,
-                role=role,
-            )
-
-            if role == "student":
-                Student.objects.create(
-                    user=user,
-                    name=full_name,
-                    age=int(data.get("age", 18) or 18),
-                    address=str(data.get("address", "Not provided")).strip() or "Not provided",
-                    duration=int(data.get("duration", 1) or 1),
-                    # Student.gender has max_length=10.
-                    gender=str(data.get("gender", "Not set")).strip() or "Not set",
-                )
-            if role == "hostel_owner":
-                Hostel_owner.objects.create(
-                    user=user,
-                    name=f"{first_name} {last_name}".strip(),
-                    address=str(data.get("address", "Not provided")).strip() or "Not provided",
-                    phone=str(data.get("phone", "Not provided")).strip() or "Not provided",
-                    location=str(data.get("location", "Not provided")).strip() or "Not provided",
-                )
+            user = create_account(account)
     except (ValueError, DataError, IntegrityError):
         return Response(
             {"message": "Invalid registration details"},
@@ -510,6 +973,32 @@ def register_user(request):
     )
 
 
+@api_view(["POST"])
+@permission_classes([IsAdminUser])
+def import_users(request):
+    """Bulk-create accounts from a CSV/NDJSON body or a multipart ``file`` upload."""
+    content_type = request.content_type.split(";")[0].strip()
+    if content_type.startswith("multipart/"):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"message": "file is required"}, status=status.HTTP_400_BAD_REQUEST)
+        lines, fmt = upload, format_for(name=upload.name, content_type=upload.content_type)
+    else:
+        # Read the raw body line by line instead of letting DRF parse it.
+        lines, fmt = request.stream or [], format_for(content_type=content_type)
+    if fmt is None:
+        return Response(
+            {"message": "Send text/csv or application/x-ndjson, or upload a .csv/.ndjson file"},
+            status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        )
+    try:
+        # Threads, not processes: this runs inside a web worker.
+        report = import_accounts(lines, fmt, threads=True)
+    except ImproperlyConfigured as exc:
+        return Response({"message": str(exc)}, status=status.HTTP_501_NOT_IMPLEMENTED)
+    return Response({"message": "Import finished", **report}, status=status.HTTP_200_OK)
+
+
 @api_view(["POST"])
 def login_user(request):
     data = request.data
@@ -536,7 +1025,7 @@ def login_user(request):
         )
 
     login(request, user)
-    role = _effective_role_for_user(user)
+    role = effective_role_for_user(user)
     return Response(
         {
             "message": "Login successful",
@@ -546,6 +1035,24 @@ def login_user(request):
             "first_name": user.first_name,
             "last_name": user.last_name,
             "role": role,
+            # Send "Authorization: Bearer <access>" to skip the session and
+            # user lookups on later requests.
+            **tokens_for_user(user, role),
         },
         status=status.HTTP_200_OK,
     )
+
+
+@api_view(["POST"])
+@authentication_classes([])
+def refresh_token(request):
+    """Exchange a refresh token for an access token with up-to-date claims."""
+    try:
+        refresh = RefreshToken(str(request.data.get("refresh", "")))
+    except TokenError:
+        return Response({"message": "Invalid or expired refresh token"}, status=status.HTTP_401_UNAUTHORIZED)
+
+    user = User.objects.filter(pk=refresh_user_id(refresh), is_active=True).first()
+    if not user:
+        return Response({"message": "Invalid or expired refresh token"}, status=status.HTTP_401_UNAUTHORIZED)
+    return Response({"access": access_token_for(refresh, user, effective_role_for_user(user))}, status=status.HTTP_200_OK)
@@ -7,6 +7,9 @@ Generated by 'django-admin startproject' using Django 6.0.2.
 from pathlib import Path
 import os
 
+from .dbpool import add_replicas, configure_database
+from .sharedcache import cache_is_shared, default_session_engine
+
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -32,6 +35,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'BackEnd.management.middleware.RequestTimingMiddleware',
+    # Before replica routing, so the daily release writes outside any request's routing.
+    'BackEnd.management.availability.DailyReleaseMiddleware',
+    'BackEnd.management.replicas.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -70,7 +77,52 @@ DATABASES = {
         'PORT': '5432',
     }
 }
+# DB_POOL=1 turns on connection pooling; see dbpool.py for the other DB_*
+# variables.
+configure_database(DATABASES['default'], int(os.getenv('DB_CONN_MAX_AGE', '0')))
+
+# Read replicas (DB_REPLICA_URLS); safe-method requests read from them, see
+# management/replicas.py. A client that wrote reads from the primary for
+# REPLICA_STICKY_SECONDS afterwards.
+DATABASE_REPLICAS = add_replicas(DATABASES, int(os.getenv('DB_CONN_MAX_AGE', '0')))
+DATABASE_ROUTERS = ['BackEnd.management.replicas.ReplicaRouter']
+REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', '10'))
+
+
+# Backs the API's change markers. The local-memory default is per process, so
+# multi-worker deployments should point these at a shared Redis or Memcached
+# server to keep every worker's validators in step.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+# Without a shared cache, ETag validation, the cached available-rooms
+# listing, cached roles and cached sessions are turned off (see
+# sharedcache.py). manage.py sets CACHE_SINGLE_PROCESS for runserver and test.
+CACHE_SHARED = cache_is_shared(CACHES, os.getenv('CACHE_SINGLE_PROCESS', '').lower() in ('1', 'true', 'yes'))
+
+
+# Sessions default to the cache with a database fallback (no django_session
+# SELECT per request once cached) when the cache is shared, and to the
+# database otherwise. Set SESSION_ENGINE to "...signed_cookies" to keep
+# sessions out of the database entirely, or "...db" for the old behaviour;
+# cache-based engines refuse to start without a shared cache.
+SESSION_ENGINE = os.getenv('SESSION_ENGINE') or default_session_engine(CACHE_SHARED)
+
+# Session-authenticated users are loaded from the cache, not auth_user, on
+# every request when the cache is shared; saves and deletes of the user drop
+# the cached copy. ModelBackend stays listed so sessions started before
+# CachedModelBackend (which record ModelBackend) stay logged in.
+AUTHENTICATION_BACKENDS = [
+    'BackEnd.management.auth_backends.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+AUTH_USER_CACHE_SECONDS = int(os.getenv('AUTH_USER_CACHE_SECONDS', '3600'))
 
+# Expired rows removed per DELETE by manage.py purge_sessions.
+SESSION_PURGE_BATCH_SIZE = int(os.getenv('SESSION_PURGE_BATCH_SIZE', '5000'))
 
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -144,13 +196,72 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # Builds request.user from the access token's claims instead of
+        # loading it from auth_user; see management/tokens.py for how
+        # deactivated and deleted users are shut out.
+        'BackEnd.management.tokens.StatelessTokenAuthentication',
+        # login_user starts a Django session and the frontend sends that
+        # cookie rather than a bearer token, so the API accepts it too.
+        # Session-authenticated POST/PUT/PATCH/DELETE must then carry the
+        # X-CSRFToken header (the cookie comes from /api/csrf/); requests
+        # that authenticate with a bearer token are not CSRF-checked.
+        'rest_framework.authentication.SessionAuthentication',
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
 CORS_ALLOW_ALL_ORIGINS = True  # for testing with Postman
 
+# Requests slower than this are logged with their SQL by RequestTimingMiddleware.
+REQUEST_TIMING_SLOW_MS = float(os.getenv('REQUEST_TIMING_SLOW_MS', '500'))
+
+# Per-request timing lines are logged at INFO; slow requests at WARNING.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'BackEnd.management.middleware': {
+            'handlers': ['console'],
+            'level': os.getenv('REQUEST_TIMING_LOG_LEVEL', 'WARNING'),
+            'propagate': False,
+        },
+    },
+}
+
+# Largest number of items accepted by one bulk create/update/delete request.
+API_BULK_MAX_ITEMS = int(os.getenv('API_BULK_MAX_ITEMS', '500'))
+
+# Lifetime of one version of the cached available-rooms listing. Writes move
+# readers to a new version straight away; this only bounds how long
+# superseded versions linger in the cache.
+AVAILABLE_HOSTELS_CACHE_SECONDS = int(os.getenv('AVAILABLE_HOSTELS_CACHE_SECONDS', '300'))
+
+# Months in which an academic term starts; the owner dashboard counts
+# "bookings this term" from the first day of the latest one.
+TERM_START_MONTHS = [int(month) for month in os.getenv('TERM_START_MONTHS', '1,9').split(',')]
+
+# Bulk account import (manage.py import_users, POST /api/admin/import-users/):
+# rows inserted per transaction, processes hashing passwords in the command
+# and threads hashing them in the endpoint's web worker (0 hashes inline).
+USER_IMPORT_BATCH_SIZE = int(os.getenv('USER_IMPORT_BATCH_SIZE', '500'))
+USER_IMPORT_WORKERS = int(os.getenv('USER_IMPORT_WORKERS', str(os.cpu_count() or 1)))
+USER_IMPORT_THREADS = int(os.getenv('USER_IMPORT_THREADS', '2'))
+
+# Rows fetched and rendered per chunk by ``?stream=1`` list responses.
+API_STREAM_CHUNK_SIZE = int(os.getenv('API_STREAM_CHUNK_SIZE', '2000'))
+
+# Live room events (GET /api/async/events/, see management/events.py). The
+# default broker only reaches clients of the worker that made the change;
+# with several workers, point EVENT_BROKER at a cross-process Broker. A
+# subscriber more than EVENT_QUEUE_SIZE events behind gets "resync" instead.
+EVENT_BROKER = os.getenv('EVENT_BROKER', 'BackEnd.management.events.LocalBroker')
+EVENT_QUEUE_SIZE = int(os.getenv('EVENT_QUEUE_SIZE', '100'))
+EVENT_STREAM_HEARTBEAT_SECONDS = float(os.getenv('EVENT_STREAM_HEARTBEAT_SECONDS', '15'))
+EVENT_STREAM_MAX_SECONDS = float(os.getenv('EVENT_STREAM_MAX_SECONDS', '600'))
+
 STATIC_ROOT = BASE_DIR/'staticfiles'
 
 
@@ -0,0 +1,54 @@
+"""Whether the default cache is shared by every process serving requests.
+
+Change markers, cached roles and cached sessions and users are invalidated
+by writing to the default cache. A worker only sees the invalidation if it
+reads the same cache, so with a per-process backend (LocMemCache) and more
+than one worker those caches would keep serving stale validators, roles and
+logged-out sessions. ``CACHE_SHARED`` records whether they can be trusted;
+the code that relies on cross-worker invalidation checks it.
+
+Sessions are the dangerous case: a worker with its own cached copy of a
+session would keep accepting it after the user logged out elsewhere. The
+session engine therefore only defaults to ``cached_db`` on a shared cache,
+and ``check_session_engine`` refuses to start with a cache-based engine on
+a per-process one.
+"""
+
+from django.core.exceptions import ImproperlyConfigured
+
+# Backends whose entries are only visible to the process that wrote them.
+PROCESS_LOCAL_BACKENDS = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+def cache_is_shared(caches, single_process=False):
+    """Return whether ``caches['default']`` is seen by every serving process.
+
+    A process-local cache only counts as shared when ``single_process`` says
+    one process serves everything (``runserver``, ``manage.py test``).
+    """
+    return single_process or caches['default']['BACKEND'] not in PROCESS_LOCAL_BACKENDS
+
+
+# Session engines that serve sessions from the default cache.
+CACHE_SESSION_ENGINES = {
+    'django.contrib.sessions.backends.cache',
+    'django.contrib.sessions.backends.cached_db',
+}
+
+
+def default_session_engine(shared):
+    if shared:
+        return 'django.contrib.sessions.backends.cached_db'
+    return 'django.contrib.sessions.backends.db'
+
+
+def check_session_engine(session_engine, shared):
+    """Raise ImproperlyConfigured if ``session_engine`` needs a shared cache that is missing."""
+    if session_engine in CACHE_SESSION_ENGINES and not shared:
+        raise ImproperlyConfigured(
+            f"SESSION_ENGINE {session_engine!r} needs a cache shared by every worker; "
+            "configure CACHE_BACKEND or use django.contrib.sessions.backends.db."
+        )
@@ -0,0 +1,139 @@
+"""Multi-threaded booking contention benchmark.
+
+Fires concurrent ``POST /api/student/bookings/`` requests from many students
+at a small set of hot rooms and checks that overlapping stays never both
+commit: no room and no student ever ends up with more than one booking, and
+each hot room is won exactly once. On PostgreSQL the exclusion constraints
+from migration 0017 enforce this; on SQLite the booking view's overlap check
+runs inside an IMMEDIATE transaction (see BackEnd.dbpool) after
+``Booking.lock_for_write``, so concurrent writers are serialized.
+
+    python -m benchmarks.booking_contention --threads 16 --students 800 --rooms 4
+
+Prints a JSON document with the successful bookings per second and the
+conflict count. Set BENCH_DATABASE_URL to run against PostgreSQL.
+"""
+
+import argparse
+import random
+import threading
+import time
+
+from benchmarks.common import benchmark_database, emit, percentiles, setup_django
+
+
+def _create_students(count):
+    from django.contrib.auth.models import User
+
+    from BackEnd.management.models import Registers, Student
+
+    users = User.objects.bulk_create(
+        [User(username=f"bench_student_{index}", password="!") for index in range(count)]
+    )
+    Registers.objects.bulk_create(
+        [
+            Registers(user=user, first_name="Bench", Last_name=str(index), email_address="bench@example.com", role="student")
+            for index, user in enumerate(users)
+        ]
+    )
+    Student.objects.bulk_create(
+        [
+            Student(user=user, name=user.username, age=20, address="Campus", duration=6, gender="Male")
+            for user in users
+        ]
+    )
+    return users
+
+
+def _create_rooms(count):
+    from BackEnd.management.models import Hostel, Hostel_owner
+
+    owner = Hostel_owner.objects.create(name="Bench Owner", address="Town", phone="0", location="Town")
+    return Hostel.objects.bulk_create([Hostel(name=f"Hot {index}", hostel_owner=owner) for index in range(count)])
+
+
+def run(threads, students, rooms, seed):
+    from django.db import connections
+    from rest_framework.test import APIClient
+
+    from BackEnd.management.models import Booking
+
+    users = _create_students(students)
+    room_ids = [room.id for room in _create_rooms(rooms)]
+    rng = random.Random(seed)
+    plan = [(user, rng.choice(room_ids)) for user in users]
+
+    barrier = threading.Barrier(threads)
+    lock = threading.Lock()
+    outcomes = {"created": 0, "conflict": 0, "error": 0}
+    latencies = []
+
+    def worker(slice_index):
+        client = APIClient()
+        local_latencies = []
+        local = {"created": 0, "conflict": 0, "error": 0}
+        try:
+            barrier.wait()
+            for user, room_id in plan[slice_index::threads]:
+                client.force_authenticate(user)
+                started = time.perf_counter()
+                response = client.post("/api/student/bookings/", {"hostel_id": room_id}, format="json")
+                local_latencies.append((time.perf_counter() - started) * 1000)
+                if response.status_code == 201:
+                    local["created"] += 1
+                elif response.status_code == 400:
+                    local["conflict"] += 1
+                else:
+                    local["error"] += 1
+        finally:
+            connections.close_all()
+        with lock:
+            latencies.extend(local_latencies)
+            for key, value in local.items():
+                outcomes[key] += value
+
+    workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    per_room = Booking.objects.values("room_id").distinct().count()
+    total = Booking.objects.count()
+    hot_rooms_won = len(set(Booking.objects.values_list("room_id", flat=True)) & set(room_ids))
+    return {
+        "benchmark": "booking_contention",
+        "database": connections["default"].vendor,
+        "threads": threads,
+        "students": students,
+        "hot_rooms": rooms,
+        "elapsed_s": round(elapsed, 3),
+        "attempts_per_s": round(students / elapsed, 1),
+        "bookings_per_s": round(outcomes["created"] / elapsed, 1),
+        "outcomes": outcomes,
+        "latency_ms": percentiles(latencies),
+        "correct": total == per_room == hot_rooms_won == outcomes["created"] == min(rooms, students)
+        and outcomes["error"] == 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--students", type=int, default=400)
+    parser.add_argument("--rooms", type=int, default=1, help="number of hot rooms every student competes for")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    setup_django()
+    with benchmark_database():
+        result = run(args.threads, args.students, args.rooms, args.seed)
+    emit(result)
+    if not result["correct"]:
+        raise SystemExit("booking invariants violated")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import contextlib
+import json
+import os
+import statistics
+import sys
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+    import django
+
+    django.setup()
+
+
+@contextlib.contextmanager
+def benchmark_database(verbosity=0):
+    """Create a fresh, migrated test database and destroy it afterwards."""
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    # Change markers and cached roles from an earlier run would not match the
+    # freshly created database.
+    cache.clear()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=verbosity, autoclobber=True, serialize=False)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+        teardown_test_environment()
+
+
+def percentiles(samples_ms):
+    """Return p50/p95/p99 (milliseconds) for a list of latencies."""
+    if not samples_ms:
+        return {"p50": None, "p95": None, "p99": None}
+    if len(samples_ms) == 1:
+        value = round(samples_ms[0], 3)
+        return {"p50": value, "p95": value, "p99": value}
+    cuts = statistics.quantiles(samples_ms, n=100, method="inclusive")
+    return {"p50": round(cuts[49], 3), "p95": round(cuts[94], 3), "p99": round(cuts[98], 3)}
+
+
+def emit(result):
+    """Write a benchmark result as one JSON document on stdout."""
+    json.dump(result, sys.stdout, indent=2, sort_keys=True, default=str)
+    sys.stdout.write("\n")
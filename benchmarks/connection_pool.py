@@ -0,0 +1,81 @@
+"""Connection-per-request vs persistent vs pooled PostgreSQL connections.
+
+Serves the student polling endpoint with gunicorn three times against the
+same seeded database, changing only how Django gets its connections:
+
+* ``per_request``: ``DB_CONN_MAX_AGE=0``, a new connection for every request;
+* ``persistent``: ``DB_CONN_MAX_AGE=600`` with health checks, one connection
+  per gunicorn thread;
+* ``pooled``: ``DB_POOL=1``, the psycopg 3 pool (``DB_POOL_MAX_SIZE`` per
+  worker).
+
+Prints throughput and latency percentiles per mode, plus the number of
+server connections the benchmark database had open at the end of the run::
+
+    BENCH_DATABASE_URL=postgres://... python -m benchmarks.connection_pool \\
+        --clients 200 --duration 15 --workers 2 --threads 16
+"""
+
+import argparse
+import asyncio
+
+from benchmarks.common import benchmark_database, emit, setup_django
+from benchmarks.httpload import server_process
+from benchmarks.wsgi_vs_asgi import TARGETS, measure, seed
+
+MODES = {
+    "per_request": {"DB_POOL": "0", "DB_CONN_MAX_AGE": "0"},
+    "persistent": {"DB_POOL": "0", "DB_CONN_MAX_AGE": "600", "DB_CONN_HEALTH_CHECKS": "1"},
+    "pooled": {"DB_POOL": "1"},
+}
+
+
+def open_connections(connection, database_name):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT count(*) FROM pg_stat_activity WHERE datname = %s", [database_name])
+        # Leave out the benchmark's own connection.
+        return cursor.fetchone()[0] - 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=8, help="gunicorn threads per worker")
+    parser.add_argument("--pool-size", type=int, default=4, help="DB_POOL_MAX_SIZE for the pooled mode")
+    parser.add_argument("--rooms", type=int, default=200)
+    parser.add_argument("--mode", choices=MODES, action="append", help="run only these modes")
+    args = parser.parse_args()
+
+    setup_django()
+    results = {}
+    with benchmark_database() as connection:
+        if connection.vendor != "postgresql":
+            raise SystemExit("Set BENCH_DATABASE_URL to a PostgreSQL server; pooling is PostgreSQL-only.")
+        tokens = seed(args.rooms, args.clients)
+        database_name = connection.settings_dict["NAME"]
+        connection.close()
+        path = TARGETS["gunicorn"]
+        for mode in args.mode or MODES:
+            env = dict(MODES[mode], DB_POOL_MAX_SIZE=str(args.pool_size), DB_POOL_MIN_SIZE="1")
+            with server_process("gunicorn", database_name, args.workers, args.threads, extra_env=env) as port:
+                results[mode] = asyncio.run(measure(port, path, tokens, args.clients, args.duration, False))
+                results[mode]["open_connections"] = open_connections(connection, database_name)
+            connection.close()
+
+    emit(
+        {
+            "benchmark": "connection_pool",
+            "clients": args.clients,
+            "duration_s": args.duration,
+            "workers": args.workers,
+            "gunicorn_threads": args.threads,
+            "pool_size": args.pool_size,
+            "results": results,
+        }
+    )
+
+
+if __name__ == "__main__":
+    main()
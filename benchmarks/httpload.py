@@ -0,0 +1,231 @@
+"""Minimal asyncio HTTP/1.1 load tooling shared by the HTTP benchmarks.
+
+Standard library only: a keep-alive client connection, a fixed-duration load
+loop, and a helper that starts a WSGI or ASGI server process against the
+benchmark database.
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.common import percentiles
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def _ensure_open(self):
+        if self.writer is None or self.writer.is_closing():
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, method, path, headers=None, body=b""):
+        """Send a request and return ``(status, headers, body)``; header names are lower-cased."""
+        await self._ensure_open()
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}", f"Content-Length: {len(body)}"]
+        lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            self.writer = None
+            raise ConnectionError("server closed the connection")
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers.setdefault(name.strip().lower(), []).append(value.strip())
+
+        if response_headers.get("transfer-encoding", [""])[-1].lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+            payload = b"".join(chunks)
+        else:
+            payload = await self.reader.readexactly(int(response_headers.get("content-length", ["0"])[-1]))
+
+        if response_headers.get("connection", [""])[-1].lower() == "close":
+            self.close()
+        return status, response_headers, payload
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+class Session:
+    """A :class:`Connection` that keeps cookies and records every call it makes.
+
+    Mirrors what a browser does for the session-authenticated API: cookies
+    are replayed and unsafe requests carry the CSRF token.
+    """
+
+    def __init__(self, host, port, results):
+        self.connection = Connection(host, port)
+        self.cookies = {}
+        self.results = results
+
+    async def call(self, label, method, path, payload=None, headers=None):
+        """Send a JSON request, record its latency under ``label`` and return ``(status, json_body)``."""
+        body = json.dumps(payload).encode() if payload is not None else b""
+        request_headers = {"Accept": "application/json", **(headers or {})}
+        if payload is not None:
+            request_headers["Content-Type"] = "application/json"
+        if self.cookies:
+            request_headers["Cookie"] = "; ".join(f"{name}={value}" for name, value in self.cookies.items())
+        if method not in ("GET", "HEAD") and "csrftoken" in self.cookies:
+            request_headers["X-CSRFToken"] = self.cookies["csrftoken"]
+
+        bucket = self.results.setdefault(label, {"statuses": {}, "latencies_ms": []})
+        started = time.perf_counter()
+        try:
+            status, response_headers, response_body = await self.connection.request(
+                method, path, request_headers, body
+            )
+        except (ConnectionError, asyncio.IncompleteReadError, OSError):
+            self.connection.close()
+            status, response_headers, response_body = "connection_error", {}, b""
+        bucket["latencies_ms"].append((time.perf_counter() - started) * 1000)
+        bucket["statuses"][str(status)] = bucket["statuses"].get(str(status), 0) + 1
+
+        for cookie in response_headers.get("set-cookie", []):
+            name, _, value = cookie.split(";", 1)[0].partition("=")
+            self.cookies[name.strip()] = value.strip()
+        try:
+            data = json.loads(response_body) if response_body else None
+        except ValueError:
+            data = None
+        return status, data
+
+    def close(self):
+        self.connection.close()
+
+
+async def run_load(host, port, clients, duration, next_request):
+    """Drive ``clients`` concurrent connections for ``duration`` seconds.
+
+    ``next_request(client_index)`` returns ``(label, method, path, headers, body)``
+    for the client's next call. Returns ``{label: {"statuses": {...}, "latencies_ms": [...]}}``.
+    """
+    results = {}
+    deadline = time.perf_counter() + duration
+
+    async def client(index):
+        connection = Connection(host, port)
+        try:
+            while time.perf_counter() < deadline:
+                label, method, path, headers, body = next_request(index)
+                bucket = results.setdefault(label, {"statuses": {}, "latencies_ms": []})
+                started = time.perf_counter()
+                try:
+                    status, _, _ = await connection.request(method, path, headers, body)
+                except (ConnectionError, asyncio.IncompleteReadError, OSError):
+                    connection.close()
+                    status = "connection_error"
+                bucket["latencies_ms"].append((time.perf_counter() - started) * 1000)
+                bucket["statuses"][str(status)] = bucket["statuses"].get(str(status), 0) + 1
+        finally:
+            connection.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(index) for index in range(clients)))
+    elapsed = time.perf_counter() - started
+    for bucket in results.values():
+        bucket["elapsed_s"] = round(elapsed, 3)
+    return results
+
+
+def summarize(results, elapsed_s=None):
+    """Turn recorded calls into throughput and latency percentiles per label.
+
+    ``elapsed_s`` is the wall-clock time of the run; it defaults to the one
+    :func:`run_load` stored with each label.
+    """
+    summary = {}
+    for label, bucket in sorted(results.items()):
+        count = len(bucket["latencies_ms"])
+        elapsed = elapsed_s or bucket["elapsed_s"]
+        summary[label] = {
+            "requests": count,
+            "throughput_rps": round(count / elapsed, 1) if elapsed else None,
+            "latency_ms": percentiles(bucket["latencies_ms"]),
+            "statuses": bucket["statuses"],
+        }
+    return summary
+
+
+def free_port():
+    with contextlib.closing(socket.socket(socket.AF_INET, socket.SOCK_STREAM)) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+SERVER_COMMANDS = {
+    "gunicorn": lambda port, workers, threads: [
+        sys.executable, "-m", "gunicorn", "BackEnd.wsgi:application",
+        "--bind", f"127.0.0.1:{port}", "--workers", str(workers), "--threads", str(threads),
+        "--log-level", "warning",
+    ],
+    "uvicorn": lambda port, workers, threads: [
+        sys.executable, "-m", "uvicorn", "BackEnd.asgi:application",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers),
+        "--lifespan", "off", "--no-access-log", "--log-level", "warning",
+    ],
+    "runserver": lambda port, workers, threads: [
+        sys.executable, "manage.py", "runserver", f"127.0.0.1:{port}", "--noreload",
+    ],
+}
+
+
+@contextlib.contextmanager
+def server_process(kind, database_name, workers=2, threads=1, extra_env=None):
+    """Start a ``gunicorn``, ``uvicorn`` or ``runserver`` process on a free port; yield the port."""
+    port = free_port()
+    env = dict(
+        os.environ,
+        DJANGO_SETTINGS_MODULE="benchmarks.settings",
+        BENCH_DATABASE_NAME=database_name,
+        **(extra_env or {}),
+    )
+    process = subprocess.Popen(SERVER_COMMANDS[kind](port, workers, threads), cwd=REPO_ROOT, env=env)
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"{kind} exited with status {process.returncode}")
+            with contextlib.suppress(OSError), socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                break
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"{kind} did not start listening on port {port}")
+            time.sleep(0.1)
+        yield port
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
@@ -0,0 +1,178 @@
+"""Reproducible HTTP load benchmark for the API.
+
+Starts the project under uvicorn, gunicorn or the Django development server
+against a fresh benchmark database, then replays the intake-week scenarios
+with concurrent virtual users:
+
+* students: fetch the CSRF cookie, register, log in, poll
+  ``/api/student/bookings/``, book one of the rooms they were offered and
+  keep polling;
+* owners: register, log in, poll ``/api/owner/rooms/`` and post rooms.
+
+Every call is recorded under its endpoint label, and the run prints (and
+with ``--output`` writes) one JSON document with throughput and
+p50/p95/p99 latency per endpoint, ready to diff between releases::
+
+    python -m benchmarks.loadtest --server uvicorn --students 200 --owners 10
+    python -m benchmarks.loadtest --output before.json
+    python -m benchmarks.loadtest --output after.json && diff before.json after.json
+
+Runs are deterministic for a given ``--seed`` apart from timing. Set
+``BENCH_DATABASE_URL`` for PostgreSQL and ``BENCH_FAST_PASSWORD_HASHING=1``
+to take PBKDF2 out of the register and login numbers.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+
+from benchmarks.common import benchmark_database, emit, setup_django
+from benchmarks.httpload import REPO_ROOT, Session, server_process, summarize
+
+PASSWORD = "bench-pass-12345"
+
+
+def seed(rooms):
+    from BackEnd.management.models import Hostel, Hostel_owner
+
+    owner = Hostel_owner.objects.create(name="Seed Owner", address="Town", phone="0", location="Town")
+    Hostel.objects.bulk_create([Hostel(name=f"Seed {index}", hostel_owner=owner) for index in range(rooms)])
+
+
+async def _register_and_login(session, username, role, extra):
+    await session.call("GET /api/csrf/", "GET", "/api/csrf/")
+    payload = {
+        "first_name": "Load",
+        "last_name": username[-20:],
+        "email": f"{username}@example.com",
+        "username": username,
+        "role": role,
+        "password": PASSWORD,
+        "confirm_password": PASSWORD,
+        **extra,
+    }
+    status, _ = await session.call("POST /api/register/", "POST", "/api/register/", payload)
+    if status != 201:
+        return False
+    status, _ = await session.call(
+        "POST /api/login/", "POST", "/api/login/", {"username": username, "password": PASSWORD}
+    )
+    # Login rotates the CSRF token along with the session.
+    await session.call("GET /api/csrf/", "GET", "/api/csrf/")
+    return status == 200
+
+
+async def student_scenario(host, port, results, index, polls, think_s, rng):
+    session = Session(host, port, results)
+    try:
+        username = f"load_student_{index}"
+        if not await _register_and_login(session, username, "student", {"age": 20, "duration": 6, "gender": "Male"}):
+            return
+        booked = False
+        for poll in range(polls):
+            status, data = await session.call("GET /api/student/bookings/", "GET", "/api/student/bookings/")
+            if not booked and poll == polls // 2 and status == 200 and data["hostels"]:
+                room = rng.choice(data["hostels"][:20])
+                await session.call(
+                    "POST /api/student/bookings/", "POST", "/api/student/bookings/", {"hostel_id": room["id"]}
+                )
+                booked = True
+            await asyncio.sleep(think_s * rng.random())
+    finally:
+        session.close()
+
+
+async def owner_scenario(host, port, results, index, polls, think_s, rng):
+    session = Session(host, port, results)
+    try:
+        username = f"load_owner_{index}"
+        if not await _register_and_login(session, username, "hostel_owner", {"phone": "0700", "location": "Town"}):
+            return
+        for poll in range(polls):
+            if poll % 5 == 0:
+                await session.call(
+                    "POST /api/owner/rooms/", "POST", "/api/owner/rooms/", {"room_name": f"{username}-{poll}"}
+                )
+            await session.call("GET /api/owner/rooms/", "GET", "/api/owner/rooms/")
+            await asyncio.sleep(think_s * rng.random())
+    finally:
+        session.close()
+
+
+async def run_scenarios(port, args):
+    results = {}
+    rng = random.Random(args.seed)
+    users = [("student", index) for index in range(args.students)] + [("owner", index) for index in range(args.owners)]
+    rng.shuffle(users)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def virtual_user(kind, index):
+        user_rng = random.Random(f"{args.seed}-{kind}-{index}")
+        scenario = student_scenario if kind == "student" else owner_scenario
+        async with semaphore:
+            await scenario("127.0.0.1", port, results, index, args.polls, args.think_ms / 1000, user_rng)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(virtual_user(kind, index) for kind, index in users))
+    return results, time.perf_counter() - started
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--server", choices=["uvicorn", "gunicorn", "runserver"], default="uvicorn")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=8, help="gunicorn threads per worker")
+    parser.add_argument("--students", type=int, default=100)
+    parser.add_argument("--owners", type=int, default=5)
+    parser.add_argument("--rooms", type=int, default=500, help="rooms seeded before the run")
+    parser.add_argument("--polls", type=int, default=10, help="polls per virtual user")
+    parser.add_argument("--concurrency", type=int, default=50, help="virtual users running at once")
+    parser.add_argument("--think-ms", type=float, default=50, help="max random pause between polls")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="also write the JSON result to this file")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection as db_connection
+
+    with benchmark_database():
+        seed(args.rooms)
+        database_name = db_connection.settings_dict["NAME"]
+        vendor = db_connection.vendor
+        db_connection.close()
+        with server_process(args.server, database_name, workers=args.workers, threads=args.threads) as port:
+            results, elapsed = asyncio.run(run_scenarios(port, args))
+
+    report = {
+        "benchmark": "loadtest",
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "database": vendor,
+        "fast_password_hashing": bool(os.getenv("BENCH_FAST_PASSWORD_HASHING")),
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "elapsed_s": round(elapsed, 3),
+        "endpoints": summarize(results, elapsed),
+    }
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(report, handle, indent=2, sort_keys=True)
+            handle.write("\n")
+    emit(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Nearest available rooms: geocell index vs brute-force scan.
+
+Loads synthetic owners spread around ten towns, then times
+``nearest_available_rooms`` against a brute-force version that reads every
+owner with coordinates, computes the distance to each and loads the rooms
+of all owners in range. Both must return the same rooms in the same order::
+
+    python -m benchmarks.nearby --rooms 200000 --owners 10000
+"""
+
+import argparse
+import time
+from io import StringIO
+
+from benchmarks.common import benchmark_database, emit, percentiles, setup_django
+
+# Town centres, a point between towns and one with nothing near it.
+POINTS = {
+    "dodoma": (-6.163, 35.752),
+    "arusha": (-3.387, 36.683),
+    "moshi_outskirts": (-3.30, 37.40),
+    "empty": (-10.5, 31.0),
+}
+
+
+def brute_force(latitude, longitude, radius_km, limit):
+    from BackEnd.management.geo import distance_km
+    from BackEnd.management.models import Hostel, Hostel_owner
+
+    owners = []
+    for owner in Hostel_owner.objects.filter(latitude__isnull=False).values(
+        "id", "name", "location", "latitude", "longitude"
+    ):
+        distance = distance_km(latitude, longitude, owner["latitude"], owner["longitude"])
+        if distance <= radius_km:
+            owners.append((distance, owner))
+    by_id = {owner["id"]: (distance, owner) for distance, owner in owners}
+    rooms = []
+    for room in Hostel.objects.filter(is_available=True, hostel_owner_id__in=list(by_id)).values(
+        "id", "name", "hostel_owner_id"
+    ):
+        distance, owner = by_id[room["hostel_owner_id"]]
+        rooms.append(
+            {
+                "id": room["id"],
+                "name": room["name"],
+                "owner_id": owner["id"],
+                "owner_name": owner["name"],
+                "location": owner["location"],
+                "distance_km": round(distance, 3),
+                "_order": (distance, owner["id"], room["id"]),
+            }
+        )
+    rooms.sort(key=lambda room: room.pop("_order"))
+    return rooms[:limit]
+
+
+def _timed(build, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = build()
+        samples.append((time.perf_counter() - started) * 1000)
+    return percentiles(samples), rows
+
+
+def run(rooms, owners, radius_km, limit, repeat, seed):
+    from django.core.management import call_command
+    from django.db import connection
+
+    from BackEnd.management.nearby import nearest_available_rooms
+
+    call_command(
+        "generate_synthetic_data",
+        students=max(1, rooms // 10),
+        owners=owners,
+        rooms=rooms,
+        bookings=rooms // 20,
+        seed=seed,
+        stdout=StringIO(),
+    )
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    results = {}
+    for name, (latitude, longitude) in POINTS.items():
+        indexed_ms, indexed = _timed(lambda: nearest_available_rooms(latitude, longitude, radius_km, limit), repeat)
+        brute_ms, brute = _timed(lambda: brute_force(latitude, longitude, radius_km, limit), repeat)
+        results[name] = {
+            "rooms": len(indexed),
+            "identical_output": indexed == brute,
+            "geocell_ms": indexed_ms,
+            "brute_force_ms": brute_ms,
+            "speedup_p50": round(brute_ms["p50"] / indexed_ms["p50"], 1) if indexed_ms["p50"] else None,
+        }
+    return {
+        "benchmark": "nearby",
+        "database": connection.vendor,
+        "rooms": rooms,
+        "owners": owners,
+        "radius_km": radius_km,
+        "limit": limit,
+        "points": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=200000)
+    parser.add_argument("--owners", type=int, default=10000)
+    parser.add_argument("--radius-km", type=float, default=5.0)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=10, help="timed runs per point and method")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    setup_django()
+    with benchmark_database():
+        result = run(args.rooms, args.owners, args.radius_km, args.limit, args.repeat, args.seed)
+    emit(result)
+    if not all(point["identical_output"] for point in result["points"].values()):
+        raise SystemExit("geocell search differs from the brute-force scan")
+
+
+if __name__ == "__main__":
+    main()
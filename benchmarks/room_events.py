@@ -0,0 +1,95 @@
+"""Fan-out latency of live room events through the local broker.
+
+Opens ``--subscribers`` subscriptions on one event loop (the room channel,
+or spread over ``--owners`` owner channels), publishes ``--events`` events
+from another thread the way request threads do, and reports the time from
+``publish()`` to each subscriber receiving the event::
+
+    python -m benchmarks.room_events --subscribers 2000 --events 200
+
+For scale: a dashboard polling every 2 seconds makes 1,800 requests an hour
+whether or not anything changed; a subscriber costs one queued event per
+change.
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+
+from benchmarks.common import emit, percentiles, setup_django
+
+
+async def _run(subscribers, owners, events, interval_ms):
+    from BackEnd.management.events import LocalBroker, availability_event, owner_channel
+
+    broker = LocalBroker(queue_size=events + 1)
+    channels = [owner_channel(index % owners + 1) for index in range(subscribers)] if owners else ["rooms"] * subscribers
+    subscriptions = [broker.subscribe(channel) for channel in channels]
+    # Events go to the rooms channel and owner 1's; other owners get none.
+    wanted = {"rooms": events, owner_channel(1): events}
+    expected = sum(wanted.get(channel, 0) for channel in channels)
+    latencies = []
+
+    async def consume(subscription, count):
+        for _ in range(count):
+            event = await subscription.get(5)
+            if event is None:
+                return
+            latencies.append((time.perf_counter() - event["published_at"]) * 1000)
+
+    def publish():
+        for room_id in range(events):
+            event = availability_event(room_id, 1, room_id % 2 == 0)
+            event["published_at"] = time.perf_counter()
+            broker.publish("rooms", event)
+            broker.publish(owner_channel(1), event)
+            time.sleep(interval_ms / 1000)
+
+    consumers = [
+        asyncio.ensure_future(consume(subscription, wanted.get(subscription.channel, 0)))
+        for subscription in subscriptions
+    ]
+    started = time.perf_counter()
+    publisher = threading.Thread(target=publish)
+    publisher.start()
+    await asyncio.wait(consumers, timeout=60)
+    elapsed = time.perf_counter() - started
+    publisher.join()
+    for consumer in consumers:
+        consumer.cancel()
+    for subscription in subscriptions:
+        subscription.close()
+    return {
+        "delivered": len(latencies),
+        "expected": expected,
+        "deliveries_per_second": round(len(latencies) / elapsed),
+        "latency_ms": percentiles(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subscribers", type=int, default=2000)
+    parser.add_argument("--owners", type=int, default=0, help="spread subscribers over this many owner channels")
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--interval-ms", type=float, default=5, help="pause between published events")
+    args = parser.parse_args()
+
+    setup_django()
+    result = asyncio.run(_run(args.subscribers, args.owners, args.events, args.interval_ms))
+    emit(
+        {
+            "benchmark": "room_events",
+            "subscribers": args.subscribers,
+            "owners": args.owners,
+            "events": args.events,
+            **result,
+        }
+    )
+    if result["delivered"] != result["expected"]:
+        raise SystemExit("some subscribers missed events")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Room search latency vs shipping the whole available-room list.
+
+Loads synthetic rooms, then times ``search_hostels_queryset`` for a few
+typical terms (first page of 20, query and row mapping included) against
+building the full available-room payload students used to filter on the
+client::
+
+    BENCH_DATABASE_URL=postgres://... python -m benchmarks.search --rooms 200000
+
+On PostgreSQL the trigram indexes from migration 0015 serve the searches;
+on SQLite the same queries scan the tables.
+"""
+
+import argparse
+import time
+from io import StringIO
+
+from benchmarks.common import benchmark_database, emit, percentiles, setup_django
+
+TERMS = ["room 1999", "room 12", "dodoma", "owner 42", "zanzib"]
+PAGE_SIZE = 20
+
+
+def _timed(build, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = build()
+        samples.append((time.perf_counter() - started) * 1000)
+    return percentiles(samples), len(rows)
+
+
+def run(rooms, repeat, seed):
+    from django.core.management import call_command
+    from django.db import connection
+
+    from BackEnd.management.listings import AVAILABLE_HOSTEL_ROWS, available_hostels_queryset
+    from BackEnd.management.search import SEARCH_ROWS, search_hostels_queryset
+
+    call_command(
+        "generate_synthetic_data",
+        students=max(1, rooms // 10),
+        owners=max(1, rooms // 20),
+        rooms=rooms,
+        bookings=rooms // 20,
+        seed=seed,
+        stdout=StringIO(),
+    )
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    searches = {}
+    for term in TERMS:
+        for available_only in (False, True):
+            latency, count = _timed(
+                lambda: SEARCH_ROWS.rows(search_hostels_queryset(term, available_only)[:PAGE_SIZE]), repeat
+            )
+            searches[f"{term}{' (available)' if available_only else ''}"] = {"rows": count, "latency_ms": latency}
+
+    full_latency, full_rows = _timed(
+        lambda: AVAILABLE_HOSTEL_ROWS.rows(available_hostels_queryset().order_by("id")), max(1, repeat // 5)
+    )
+    return {
+        "benchmark": "search",
+        "database": connection.vendor,
+        "rooms": rooms,
+        "repeat": repeat,
+        "searches": searches,
+        "full_available_list": {"rows": full_rows, "latency_ms": full_latency},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per search")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    setup_django()
+    with benchmark_database():
+        result = run(args.rooms, args.repeat, args.seed)
+    emit(result)
+
+
+if __name__ == "__main__":
+    main()
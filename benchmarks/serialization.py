@@ -0,0 +1,131 @@
+"""Serialization microbenchmark: ModelSerializer vs values() row mappers.
+
+Loads synthetic data into a fresh benchmark database, then times building
+list payloads both ways, query included:
+
+* ``serializer``: model instances rendered through the DRF serializers (and,
+  for the custom payloads, the per-instance dict builders they replaced);
+* ``values``: ``values()`` rows through the precompiled ``RowMapper``s.
+
+Each case checks that both paths render to the same JSON bytes before it is
+timed, and reports rows per second for each path::
+
+    python -m benchmarks.serialization --rows 20000 --repeat 5
+"""
+
+import argparse
+import time
+from io import StringIO
+
+from benchmarks.common import benchmark_database, emit, setup_django
+
+
+def _cases():
+    from BackEnd.management.models import Booking, Hostel, Student
+    from BackEnd.management.rows import RowMapper
+    from BackEnd.management.serializer import BookingSerializer, HostelSerializer, StudentSerializer
+    from BackEnd.management.views import AVAILABLE_HOSTEL_ROWS, OWNER_BOOKING_ROWS
+
+    def generic(model, serializer_class):
+        mapper = RowMapper.for_serializer(serializer_class)
+        return (
+            lambda: serializer_class(model.objects.order_by("id"), many=True).data,
+            lambda: mapper.rows(mapper.values(model.objects.order_by("id"))),
+        )
+
+    def available_hostels_before():
+        return [
+            {"id": hostel.id, "name": hostel.name, "owner_name": hostel.hostel_owner.name, "owner_id": hostel.hostel_owner.id}
+            for hostel in Hostel.objects.select_related("hostel_owner").filter(is_available=True).order_by("id")
+        ]
+
+    def bookings_before():
+        return [
+            {
+                "id": booking.id,
+                "student_id": booking.name.id,
+                "student_name": booking.name.name,
+                "room_id": booking.room.id,
+                "room_name": booking.room.name,
+                "booking_date": booking.booking_date,
+                "start_date": booking.start_date,
+                "end_date": booking.end_date,
+            }
+            for booking in Booking.objects.select_related("name", "room").order_by("-id")
+        ]
+
+    return {
+        "students": generic(Student, StudentSerializer),
+        "hostels": generic(Hostel, HostelSerializer),
+        "bookings": generic(Booking, BookingSerializer),
+        "available_hostels": (
+            available_hostels_before,
+            lambda: AVAILABLE_HOSTEL_ROWS.rows(
+                AVAILABLE_HOSTEL_ROWS.values(Hostel.objects.filter(is_available=True).order_by("id"))
+            ),
+        ),
+        "owner_bookings": (
+            bookings_before,
+            lambda: OWNER_BOOKING_ROWS.rows(OWNER_BOOKING_ROWS.values(Booking.objects.order_by("-id"))),
+        ),
+    }
+
+
+def _best_of(build, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        payload = build()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(payload)
+
+
+def run(rows, repeat, seed):
+    from django.core.management import call_command
+    from django.db import connection
+    from rest_framework.renderers import JSONRenderer
+
+    call_command(
+        "generate_synthetic_data",
+        students=rows,
+        owners=max(1, rows // 20),
+        rooms=rows,
+        bookings=rows // 2,
+        seed=seed,
+        stdout=StringIO(),
+    )
+
+    renderer = JSONRenderer()
+    results = {}
+    for name, (before, after) in _cases().items():
+        identical = renderer.render(before()) == renderer.render(after())
+        before_s, count = _best_of(before, repeat)
+        after_s, _ = _best_of(after, repeat)
+        results[name] = {
+            "rows": count,
+            "identical_output": identical,
+            "serializer_rows_per_s": round(count / before_s),
+            "values_rows_per_s": round(count / after_s),
+            "speedup": round(before_s / after_s, 2),
+        }
+    return {"benchmark": "serialization", "database": connection.vendor, "repeat": repeat, "cases": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000, help="students and rooms to generate")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case; the best one is reported")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    setup_django()
+    with benchmark_database():
+        result = run(args.rows, args.repeat, args.seed)
+    emit(result)
+    if not all(case["identical_output"] for case in result["cases"].values()):
+        raise SystemExit("values() output differs from the serializer output")
+
+
+if __name__ == "__main__":
+    main()
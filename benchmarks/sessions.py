@@ -0,0 +1,88 @@
+"""Per-request cost of session authentication on ``/api/me/``.
+
+Logs one user in with each session engine, with and without the cached user
+backend, then calls ``/api/me/`` repeatedly and reports the SQL queries per
+request and latency percentiles::
+
+    python -m benchmarks.sessions --requests 2000
+
+The ``db`` + ``ModelBackend`` case is the old configuration: one
+``django_session`` and one ``auth_user`` SELECT per request.
+"""
+
+import argparse
+import time
+
+from benchmarks.common import benchmark_database, emit, percentiles, setup_django
+
+ENGINES = {
+    "db": "django.contrib.sessions.backends.db",
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "cache": "django.contrib.sessions.backends.cache",
+    "signed_cookies": "django.contrib.sessions.backends.signed_cookies",
+}
+BACKENDS = {
+    "model": "django.contrib.auth.backends.ModelBackend",
+    "cached": "BackEnd.management.auth_backends.CachedModelBackend",
+}
+
+
+def seed():
+    from django.contrib.auth.models import User
+
+    from BackEnd.management.models import Registers, Student
+
+    user = User.objects.create_user(username="session_bench", password="session-bench-pass")
+    Registers.objects.create(user=user, first_name="Ses", Last_name="Sion", email_address="s@example.com", role="student")
+    Student.objects.create(user=user, name="Ses Sion", age=20, address="Campus", duration=6, gender="Male")
+    return user
+
+
+def measure(user, engine, backend, requests):
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test import Client, override_settings
+    from django.test.utils import CaptureQueriesContext
+
+    with override_settings(SESSION_ENGINE=engine, AUTHENTICATION_BACKENDS=[backend]):
+        cache.clear()
+        client = Client()
+        client.force_login(user)
+        # Warm the role, session and user caches.
+        client.get("/api/me/")
+
+        samples = []
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(requests):
+                started = time.perf_counter()
+                response = client.get("/api/me/")
+                samples.append((time.perf_counter() - started) * 1000)
+                if response.status_code != 200:
+                    raise SystemExit(f"/api/me/ answered {response.status_code} with {engine}")
+    return {"queries_per_request": round(len(queries) / requests, 2), "latency_ms": percentiles(samples)}
+
+
+def run(requests):
+    from django.db import connection
+
+    user = seed()
+    cases = {}
+    for engine_name, engine in ENGINES.items():
+        for backend_name, backend in BACKENDS.items():
+            cases[f"{engine_name}+{backend_name}"] = measure(user, engine, backend, requests)
+    return {"benchmark": "sessions", "database": connection.vendor, "requests": requests, "cases": cases}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000, help="/api/me/ calls per case")
+    args = parser.parse_args()
+
+    setup_django()
+    with benchmark_database():
+        result = run(args.requests)
+    emit(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Settings for the scripts in ``benchmarks/``.
+
+Point ``BENCH_DATABASE_URL`` at a PostgreSQL server to benchmark the real
+engine; otherwise a throw-away SQLite file is used. Every script runs against
+Django's test database for that connection, which is created on start and
+destroyed on exit, so a benchmark never touches development data.
+"""
+
+import os
+import tempfile
+
+import dj_database_url
+
+from BackEnd.dbpool import configure_database
+from BackEnd.sharedcache import cache_is_shared
+from BackEnd.settings import *  # noqa: F401,F403
+
+DEBUG = False
+ALLOWED_HOSTS = ['*']
+
+_database_url = os.getenv('BENCH_DATABASE_URL')
+if _database_url:
+    DATABASES = {'default': dj_database_url.parse(_database_url)}
+    configure_database(DATABASES['default'], int(os.getenv('DB_CONN_MAX_AGE', '0')))
+else:
+    _sqlite_path = os.path.join(tempfile.gettempdir(), 'hostel_bench.sqlite3')
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': _sqlite_path,
+            # IMMEDIATE transactions make concurrent writers queue on the lock
+            # instead of failing with "database is locked".
+            'OPTIONS': {'timeout': 30, 'transaction_mode': 'IMMEDIATE'},
+            'TEST': {'NAME': _sqlite_path},
+        }
+    }
+
+# Benchmarks run against one database; DB_REPLICA_URLS is ignored.
+DATABASE_REPLICAS = []
+
+# Server processes run several workers; give them a cache they all share so
+# change markers and cached roles agree between workers.
+if not os.getenv('CACHE_BACKEND'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.path.join(tempfile.gettempdir(), 'hostel_bench_cache'),
+        }
+    }
+CACHE_SHARED = cache_is_shared(CACHES, os.getenv('CACHE_SINGLE_PROCESS', '').lower() in ('1', 'true', 'yes'))
+
+# Registration and login are dominated by PBKDF2; set this to measure the rest
+# of the request path instead.
+if os.getenv('BENCH_FAST_PASSWORD_HASHING'):
+    PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+# Server processes started by a benchmark are pointed at the benchmark's test
+# database through this variable.
+if os.getenv('BENCH_DATABASE_NAME'):
+    DATABASES['default']['NAME'] = os.environ['BENCH_DATABASE_NAME']
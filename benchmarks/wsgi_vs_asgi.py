@@ -0,0 +1,110 @@
+"""WSGI vs ASGI throughput for the student polling endpoint.
+
+Seeds a benchmark database with rooms and students, then points the same
+number of concurrent polling clients at:
+
+* gunicorn serving the DRF view ``/api/student/bookings/`` (threads per worker)
+* uvicorn serving the native async ``/api/async/student/bookings/``
+
+    python -m benchmarks.wsgi_vs_asgi --clients 200 --duration 15 --workers 2
+
+``--conditional`` makes clients resend the ETag they last saw, which is what
+the dashboards do; most polls then end in a 304. Prints throughput and
+latency percentiles per server as JSON.
+"""
+
+import argparse
+import asyncio
+
+from benchmarks.common import benchmark_database, emit, setup_django
+from benchmarks.httpload import Connection, run_load, server_process, summarize
+
+TARGETS = {
+    "gunicorn": "/api/student/bookings/",
+    "uvicorn": "/api/async/student/bookings/",
+}
+
+
+def seed(rooms, students):
+    from django.contrib.auth.models import User
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from BackEnd.management.models import Hostel, Hostel_owner, Registers, Student
+
+    owner = Hostel_owner.objects.create(name="Bench Owner", address="Town", phone="0", location="Town")
+    Hostel.objects.bulk_create([Hostel(name=f"Room {index}", hostel_owner=owner) for index in range(rooms)])
+    users = User.objects.bulk_create([User(username=f"poller_{index}", password="!") for index in range(students)])
+    Registers.objects.bulk_create(
+        [
+            Registers(user=user, first_name="Poll", Last_name="Er", email_address="poll@example.com", role="student")
+            for user in users
+        ]
+    )
+    Student.objects.bulk_create(
+        [Student(user=user, name=user.username, age=20, address="Campus", duration=6, gender="Male") for user in users]
+    )
+    return [str(AccessToken.for_user(user)) for user in users]
+
+
+def poll_requests(path, tokens, conditional):
+    etags = {}
+
+    def next_request(index):
+        headers = {"Authorization": f"Bearer {tokens[index % len(tokens)]}", "Accept": "application/json"}
+        if conditional and index in etags:
+            headers["If-None-Match"] = etags[index]
+        return "poll", "GET", path, headers, b""
+
+    return next_request, etags
+
+
+async def measure(port, path, tokens, clients, duration, conditional):
+    next_request, etags = poll_requests(path, tokens, conditional)
+    if conditional:
+        # Prime each client's ETag so the timed loop sends If-None-Match.
+        connection = Connection("127.0.0.1", port)
+        for index in range(clients):
+            _, _, _, headers, _ = next_request(index)
+            _, response_headers, _ = await connection.request("GET", path, headers)
+            etags[index] = response_headers["etag"][0]
+        connection.close()
+    return summarize(await run_load("127.0.0.1", port, clients, duration, next_request))["poll"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=8, help="gunicorn threads per worker")
+    parser.add_argument("--rooms", type=int, default=200)
+    parser.add_argument("--conditional", action="store_true")
+    args = parser.parse_args()
+
+    setup_django()
+    results = {}
+    with benchmark_database() as connection:
+        tokens = seed(args.rooms, args.clients)
+        database_name = connection.settings_dict["NAME"]
+        connection.close()
+        for kind, path in TARGETS.items():
+            with server_process(kind, database_name, workers=args.workers, threads=args.threads) as port:
+                results[kind] = asyncio.run(
+                    measure(port, path, tokens, args.clients, args.duration, args.conditional)
+                )
+
+    emit(
+        {
+            "benchmark": "wsgi_vs_asgi",
+            "clients": args.clients,
+            "duration_s": args.duration,
+            "workers": args.workers,
+            "gunicorn_threads": args.threads,
+            "conditional": args.conditional,
+            "results": results,
+        }
+    )
+
+
+if __name__ == "__main__":
+    main()
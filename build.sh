@@ -8,6 +8,9 @@ python manage.py makemigrations
 
 python manage.py migrate
 
+# Shared cache table for deployments without REDIS_URL (deployment_settings.py).
+python manage.py createcachetable
+
 # if [[$CREATE_SUPERUSER]];
 # then
 #     python manage.py createsuperuser --noinput
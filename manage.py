@@ -9,6 +9,9 @@ def main():
     # os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'BackEnd.settings')
     setting_module = 'BackEnd.deployment_settings' if 'RENDER_EXTERNAL_HOSTNAME' in os.environ else 'BackEnd.settings'
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', setting_module)
+    if sys.argv[1:2] in (['runserver'], ['test']):
+        # One process serves every request, so a local-memory cache is shared.
+        os.environ.setdefault('CACHE_SINGLE_PROCESS', '1')
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc: